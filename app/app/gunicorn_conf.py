@@ -0,0 +1,70 @@
+"""
+Gunicorn configuration for the production container.
+
+Run with:
+    gunicorn -c python:app.gunicorn_conf app.wsgi
+
+Every value can be overridden through a GUNICORN_* environment variable.
+Because the application is preloaded in the master, SIGHUP only restarts
+the workers with the code already in memory. Use
+``python manage.py reload_server`` to roll out new code without dropping
+connections (USR2 to start a new master, then TERM to the old one). The
+master must not be PID 1 for that, in the container serve.sh supervises
+the daemonized masters.
+"""
+
+import gc
+import multiprocessing
+import os
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+_cores = multiprocessing.cpu_count()
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+pidfile = os.environ.get('GUNICORN_PIDFILE', '/tmp/gunicorn.pid')
+
+# Workers are sized on CPUs, threads cover time spent waiting on Postgres
+# and SMTP without paying for a full process each
+worker_class = 'gthread'
+workers = _env_int(
+    'GUNICORN_WORKERS',
+    min(_cores * 2 + 1, _env_int('GUNICORN_MAX_WORKERS', 12))
+)
+threads = _env_int('GUNICORN_THREADS', 4)
+
+# Import Django once in the master so workers share the code pages
+# copy-on-write instead of each importing its own copy
+preload_app = True
+
+# Recycle workers to bound memory growth, the jitter keeps them from all
+# restarting at the same moment
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+timeout = _env_int('GUNICORN_TIMEOUT', 60)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+# X-Forwarded-* headers, the scheme included, are trusted only from these
+# addresses. The production compose file sets the nginx reverse proxy,
+# '*' trusts any client and must be opted into.
+forwarded_allow_ips = os.environ.get(
+    'GUNICORN_FORWARDED_ALLOW_IPS', '127.0.0.1')
+accesslog = os.environ.get('GUNICORN_ACCESSLOG', '-')
+errorlog = '-'
+
+
+def when_ready(server):
+    # Runs in the master after the preload and before any worker is
+    # forked. Drop connections opened while importing so no worker
+    # inherits a shared socket, and move the imported objects out of the
+    # collector so its passes do not touch (and copy) the shared pages.
+    from django.db import connections
+
+    connections.close_all()
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
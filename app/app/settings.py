@@ -4,6 +4,9 @@ if 'DJANGO_SETTINGS' in os.environ:
     if os.environ['DJANGO_SETTINGS'] == "dev":
         print ("DEV SERVER")
         from .settings_dev import *
+    elif os.environ['DJANGO_SETTINGS'] == "test":
+        print ("TEST SETTINGS")
+        from .settings_test import *
 else:
     print ("PROD SERVER")
     from .settings_prod import *
\ No newline at end of file
@@ -83,6 +83,8 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'app.wsgi.application'
 
+TEST_RUNNER = 'core.runner.FastTestRunner'
+
 
 # Database
 # https://docs.djangoproject.com/en/2.1/ref/settings/#databases
@@ -146,4 +148,60 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = '/vol/web/media'
 STATIC_ROOT = '/vol/web/static'
 
+# Internal nginx location that serves MEDIA_ROOT. When set, media views
+# answer with X-Accel-Redirect instead of streaming the file themselves
+MEDIA_ACCEL_REDIRECT = os.environ.get('MEDIA_ACCEL_REDIRECT', '')
+
+# Uploads are stored once per content digest, see core.storage
+DEFAULT_FILE_STORAGE = 'core.storage.ContentAddressedStorage'
+
+# Uploads are spooled to disk instead of memory and cut off once a file
+# passes UPLOAD_MAX_BYTES
+FILE_UPLOAD_HANDLERS = ['core.images.BoundedTemporaryFileUploadHandler']
+UPLOAD_MAX_BYTES = 40 * 1024 * 1024
+
+# Limits applied by core.images.ImageUploadField, keyed by model label
+IMAGE_UPLOAD_MAX_BYTES = {
+    'default': 10 * 1024 * 1024,
+    'core.page': 20 * 1024 * 1024,
+    'core.provider': 5 * 1024 * 1024,
+    'core.providerservice': 20 * 1024 * 1024,
+    'core.review': 40 * 1024 * 1024,
+}
+IMAGE_UPLOAD_MAX_PIXELS = 50 * 1000 * 1000
+IMAGE_UPLOAD_MAX_DIMENSION = 2560
+
+# Moderation scoring, see core.moderation. Items scoring below the
+# threshold are confirmed without an admin
+MODERATION_AUTO_CONFIRM_SCORE = 0.3
+MODERATION_BLOCKLIST = os.environ.get('MODERATION_BLOCKLIST', '').split()
+MODERATION_RATE_LIMIT = 5
+MODERATION_RATE_WINDOW = 60 * 60
+
+# Signed token scheme, see core.authentication. Access tokens are checked
+# without the database, so their lifetime bounds how long a deactivated
+# user or a changed flag keeps the old claims. Lifetimes in seconds.
+ACCESS_TOKEN_LIFETIME = 5 * 60
+REFRESH_TOKEN_LIFETIME = 14 * 24 * 60 * 60
+
+# Emailed confirmation links, see user.links. They are signed and expire
+# after the lifetime in seconds, nothing is stored per link.
+SITE_URL = os.environ.get('SITE_URL', 'http://localhost:8000')
+ACTIVATION_LINK_LIFETIME = 3 * 24 * 60 * 60
+
+# Tag autocomplete index, see review.autocomplete. Every process keeps the
+# most used tags in memory and reloads them after the age in seconds.
+TAG_INDEX_MAX_SIZE = 100000
+TAG_INDEX_MAX_AGE = 5 * 60
+
+# Review facet counts are cached per filter set and dropped at once when
+# reviews change, see core.cache. The timeout in seconds bounds the memory
+# they take.
+FACETS_CACHE_TIMEOUT = 60
+
+# Provider profiles are cached whole and dropped when the provider, a
+# service or a review changes. Vote and moderation counters are written
+# without signals, the timeout in seconds bounds how stale they get.
+PROVIDER_PROFILE_CACHE_TIMEOUT = 5 * 60
+
 AUTH_USER_MODEL = 'core.User'
@@ -0,0 +1,17 @@
+from .settings_dev import *  # noqa: F401,F403
+
+
+# Local test settings, SQLite keeps the suite independent of the Postgres
+# container. Combine with --schema-cache and --parallel for fast runs.
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),  # noqa: F405
+    }
+}
+
+# Password hashing dominates the API tests, use a cheap hasher
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
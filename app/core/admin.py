@@ -35,6 +35,11 @@ admin.site.register(models.ProviderService)
 admin.site.register(models.Ticket)
 admin.site.register(models.Review)
 admin.site.register(models.RatingLog)
+admin.site.register(models.CommentRatingLog)
 admin.site.register(models.ReviewCategory)
 admin.site.register(models.HashTag)
 admin.site.register(models.Comment)
+admin.site.register(models.Job)
+admin.site.register(models.StoredFile)
+admin.site.register(models.ModerationItem)
+admin.site.register(models.TicketCounter)
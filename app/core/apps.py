@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from core.signals import connect_image_signals, \
+            connect_moderation_signals, connect_usage_signals
+
+        connect_image_signals()
+        connect_moderation_signals()
+        connect_usage_signals()
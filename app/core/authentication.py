@@ -0,0 +1,112 @@
+import hashlib
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, \
+    get_authorization_header
+
+from core.models import RefreshToken, User
+
+
+ACCESS_SALT = 'core.authentication.access'
+KEYWORD = 'Bearer'
+
+# Claim name -> user field attname. Short names keep the tokens small.
+CLAIMS = {
+    'uid': 'id',
+    'stf': 'is_staff',
+    'cmp': 'is_company',
+    'prv': 'provider_id_id',
+}
+
+
+def access_token(user):
+    # Signed, timestamped token carrying the user id and flags
+    return signing.dumps(
+        {claim: getattr(user, field) for claim, field in CLAIMS.items()},
+        salt=ACCESS_SALT
+    )
+
+
+def read_access_token(token):
+    # Claims of a valid access token, checked with the HMAC and the token
+    # age only. Raises signing.BadSignature (or its SignatureExpired
+    # subclass) for anything else.
+    return signing.loads(
+        token, salt=ACCESS_SALT, max_age=settings.ACCESS_TOKEN_LIFETIME)
+
+
+def claims_user(claims):
+    # A User built from the claims without a query. The other fields are
+    # deferred and only loaded if a view reads them.
+    return User.from_db(
+        'default', list(CLAIMS.values()),
+        [claims[claim] for claim in CLAIMS]
+    )
+
+
+def _digest(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_tokens(user):
+    # New access and refresh token pair. Only the digest of the refresh
+    # token is stored, a leaked table can't be replayed.
+    refresh = secrets.token_urlsafe(32)
+    RefreshToken.objects.create(
+        user=user,
+        digest=_digest(refresh),
+        expires=timezone.now() + timedelta(
+            seconds=settings.REFRESH_TOKEN_LIFETIME)
+    )
+    return {
+        'access': access_token(user),
+        'refresh': refresh,
+        'expires_in': settings.ACCESS_TOKEN_LIFETIME,
+    }
+
+
+def refresh_tokens(refresh):
+    # Swap a refresh token for a new pair. The old refresh token is used
+    # up, and users deactivated since it was issued are refused.
+    with transaction.atomic():
+        token = RefreshToken.objects.select_for_update() \
+            .select_related('user') \
+            .filter(digest=_digest(refresh), expires__gt=timezone.now()) \
+            .first()
+        if token is None or not token.user.is_active:
+            raise exceptions.ValidationError(
+                {'refresh': ['Invalid or expired refresh token.']})
+        token.delete()
+        return issue_tokens(token.user)
+
+
+class SignedTokenAuthentication(BaseAuthentication):
+    # Authenticate "Authorization: Bearer <access token>" requests.
+    #
+    # The token is verified with its HMAC alone, request.user is built
+    # from the claims and request.auth holds them, so permission checks on
+    # is_staff, is_company or provider_id need no database access. Other
+    # Authorization schemes are left to the next authentication class.
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != KEYWORD.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(
+                'Invalid token header.')
+        try:
+            claims = read_access_token(auth[1].decode())
+        except (signing.BadSignature, UnicodeError):
+            raise exceptions.AuthenticationFailed(
+                'Invalid or expired token.')
+        return claims_user(claims), claims
+
+    def authenticate_header(self, request):
+        return KEYWORD
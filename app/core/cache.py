@@ -0,0 +1,56 @@
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from core.models import CacheGeneration
+
+
+# Cached results of a namespace are keyed by its generation, bumping the
+# generation drops all of them at once without tracking their keys. The
+# generations live in the database, shared by every worker, while the
+# results may sit in a per-process cache: a worker still holding results
+# of an older generation never looks them up again.
+
+
+def generation(namespace):
+    return CacheGeneration.objects.filter(namespace=namespace) \
+        .values_list('value', flat=True).first() or 0
+
+
+def invalidate(namespace):
+    # Bump once the caller's transaction commits, holding the generation
+    # row lock until then would serialize every writer of the namespace.
+    # A result computed from data older than the change is cached under a
+    # generation the bump then retires.
+    transaction.on_commit(lambda: _bump(namespace))
+
+
+def _bump(namespace):
+    bump = CacheGeneration.objects.filter(namespace=namespace)
+    if bump.update(value=F('value') + 1):
+        return
+    try:
+        with transaction.atomic():
+            CacheGeneration.objects.create(namespace=namespace, value=1)
+    except IntegrityError:
+        # Created concurrently
+        bump.update(value=F('value') + 1)
+
+
+def key_for(namespace, params):
+    # Cache key of a normalized parameter dict
+    digest = hashlib.sha1(
+        json.dumps(params, sort_keys=True).encode()).hexdigest()
+    return f'{namespace}:{generation(namespace)}:{digest}'
+
+
+def get_or_compute(namespace, params, compute, timeout):
+    key = key_for(namespace, params)
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        cache.set(key, result, timeout)
+    return result
@@ -0,0 +1,55 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    # List of related objects validated with one query for all of them
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return self.child_relation.to_internal_value_many(data)
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    # PrimaryKeyRelatedField that, with many=True, fetches every id with a
+    # single pk__in query instead of one get() per id, and reports all
+    # missing ids in one error
+
+    default_error_messages = {
+        'does_not_exist_many':
+            'Invalid pk values {pk_values} - objects do not exist.',
+    }
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+    def to_internal_value_many(self, data):
+        queryset = self.get_queryset()
+        pk = queryset.model._meta.pk
+        values = []
+        for item in data:
+            if self.pk_field is not None:
+                item = self.pk_field.to_internal_value(item)
+            if isinstance(item, bool):
+                self.fail('incorrect_type', data_type=type(item).__name__)
+            try:
+                values.append(pk.to_python(item))
+            except DjangoValidationError:
+                self.fail('incorrect_type', data_type=type(item).__name__)
+
+        objects = queryset.in_bulk(values) if values else {}
+        missing = [value for value in values if value not in objects]
+        if missing:
+            self.fail('does_not_exist_many', pk_values=missing)
+        # Same order and duplicates as the input, like the one by one
+        # lookup
+        return [objects[value] for value in values]
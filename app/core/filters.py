@@ -0,0 +1,128 @@
+from datetime import date
+
+from django.db.models import Exists, OuterRef
+from rest_framework.exceptions import ValidationError
+
+
+MATCH_ANY = 'any'
+MATCH_ALL = 'all'
+# Ids accepted per related filter, each one is an EXISTS probe with ?match=all
+MAX_IDS = 50
+
+
+def parse_ids(value):
+    # Comma separated ids, ValueError for anything else
+    ids = [int(str_id) for str_id in value.split(',') if str_id.strip()]
+    if len(ids) > MAX_IDS:
+        raise ValueError(f'At most {MAX_IDS} ids')
+    return ids
+
+
+def parse_date(value):
+    return date.fromisoformat(value)
+
+
+class RelatedFilter(object):
+    # ?<param>=1,2 keeps rows with a related row pointing at any of the ids,
+    # or at every one of them with ?match=all. Each condition is a
+    # correlated EXISTS, so rows aren't multiplied by a join and no
+    # DISTINCT is needed.
+
+    def __init__(self, param, model, outer, target):
+        self.param = param
+        self.model = model
+        self.outer = outer
+        self.target = target
+
+    def normalize(self, params):
+        if not params.get(self.param):
+            return {}
+        return {self.param: sorted(set(parse_ids(params[self.param])))}
+
+    def _exists(self, **lookups):
+        return Exists(self.model.objects.filter(
+            **{self.outer: OuterRef('pk')}, **lookups))
+
+    def apply(self, queryset, params, match):
+        if not params.get(self.param):
+            return queryset
+        ids = parse_ids(params[self.param])
+        if not ids:
+            return queryset
+        # Django 2.1 filters on an Exists only through an annotation
+        if match == MATCH_ANY:
+            groups = [{f'{self.target}__in': ids}]
+        else:
+            groups = [{self.target: pk} for pk in dict.fromkeys(ids)]
+        for i, lookups in enumerate(groups):
+            name = f'_{self.param}_{i}'
+            queryset = queryset.annotate(
+                **{name: self._exists(**lookups)}).filter(**{name: True})
+        return queryset
+
+
+class RangeFilter(object):
+    # ?<low>= and ?<high>= bound a field, both ends included
+
+    def __init__(self, field, low, high, parse=int):
+        self.field = field
+        self.low = low
+        self.high = high
+        self.parse = parse
+
+    def normalize(self, params):
+        return {
+            param: str(self.parse(params[param]))
+            for param in (self.low, self.high) if params.get(param)
+        }
+
+    def apply(self, queryset, params, match):
+        for param, lookup in ((self.low, 'gte'), (self.high, 'lte')):
+            if params.get(param):
+                queryset = queryset.filter(**{
+                    f'{self.field}__{lookup}': self.parse(params[param])})
+        return queryset
+
+
+class ExactFilter(object):
+    # ?<param>= matches a field exactly
+
+    def __init__(self, param, field, parse=int):
+        self.param = param
+        self.field = field
+        self.parse = parse
+
+    def normalize(self, params):
+        if not params.get(self.param):
+            return {}
+        return {self.param: str(self.parse(params[self.param]))}
+
+    def apply(self, queryset, params, match):
+        if params.get(self.param):
+            queryset = queryset.filter(
+                **{self.field: self.parse(params[self.param])})
+        return queryset
+
+
+def apply_filters(queryset, params, filters):
+    # Apply the filters for the query params, ?match=any|all picks how
+    # related filters combine their ids. Bad values are a 400.
+    match = params.get('match', MATCH_ANY)
+    if match not in (MATCH_ANY, MATCH_ALL):
+        raise ValidationError({'match': ['Expected "any" or "all".']})
+    try:
+        for query_filter in filters:
+            queryset = query_filter.apply(queryset, params, match)
+    except ValueError:
+        raise ValidationError('Invalid filter value.')
+    return queryset
+
+
+def normalized_params(params, filters):
+    # Canonical form of the filter params, equal for requests selecting
+    # the same rows however the ids are ordered or repeated. Call after
+    # apply_filters has validated the values.
+    normalized = {'match': params.get('match', MATCH_ANY)}
+    for query_filter in filters:
+        normalized.update(query_filter.normalize(params))
+    return normalized
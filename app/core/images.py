@@ -0,0 +1,119 @@
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import StopUpload, \
+    TemporaryFileUploadHandler
+from PIL import Image
+from rest_framework import serializers
+
+
+ALLOWED_FORMATS = {
+    'JPEG': 'image/jpeg',
+    'PNG': 'image/png',
+    'GIF': 'image/gif',
+    'WEBP': 'image/webp',
+}
+JPEG_QUALITY = 85
+
+
+class BoundedTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    # Upload handler that spools every file to disk chunk by chunk and
+    # stops reading the request once a file grows past UPLOAD_MAX_BYTES
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.UPLOAD_MAX_BYTES:
+            self.file.close()
+            raise StopUpload(connection_reset=True)
+        return super().receive_data_chunk(raw_data, start)
+
+
+def _open_upload(data):
+    # Open by path when the upload was spooled to disk so Pillow reads
+    # just the header and nothing is copied into memory
+    if hasattr(data, 'temporary_file_path'):
+        return Image.open(data.temporary_file_path())
+    data.seek(0)
+    return Image.open(data)
+
+
+def _downscale(image, data, max_dimension):
+    # Shrink the image to fit max_dimension. thumbnail() first calls
+    # draft(), so JPEGs are decoded at a reduced scale and the full size
+    # bitmap is never held in memory.
+    image_format = image.format
+    image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    resized = TemporaryUploadedFile(
+        data.name, ALLOWED_FORMATS[image_format], 0, None)
+    options = {'quality': JPEG_QUALITY} if image_format == 'JPEG' else {}
+    image.save(resized, format=image_format, optimize=True, **options)
+    resized.size = resized.tell()
+    resized.seek(0)
+    return resized
+
+
+class ImageUploadField(serializers.ImageField):
+    # Image field for upload endpoints.
+    #
+    # The byte limit comes from IMAGE_UPLOAD_MAX_BYTES for the model of
+    # the parent serializer. Dimensions are read from the image header to
+    # reject decompression bombs before anything is decoded, and images
+    # larger than IMAGE_UPLOAD_MAX_DIMENSION are downscaled.
+
+    default_error_messages = {
+        'too_large': 'Image file too large, the limit is {max_bytes} bytes.',
+        'too_many_pixels': 'Image dimensions too large.',
+        'unsupported_format': 'Unsupported image format.',
+    }
+
+    def __init__(self, *args, max_bytes=None, **kwargs):
+        self.max_bytes = max_bytes
+        super().__init__(*args, **kwargs)
+
+    def bind(self, field_name, parent):
+        super().bind(field_name, parent)
+        if self.max_bytes is None:
+            limits = settings.IMAGE_UPLOAD_MAX_BYTES
+            model = getattr(getattr(parent, 'Meta', None), 'model', None)
+            label = model._meta.label_lower if model else None
+            self.max_bytes = limits.get(label, limits['default'])
+
+    def to_internal_value(self, data):
+        # Checks the file name and emptiness before looking at the content
+        data = serializers.FileField.to_internal_value(self, data)
+
+        if data.size > self.max_bytes:
+            self.fail('too_large', max_bytes=self.max_bytes)
+
+        try:
+            image = _open_upload(data)
+        except Image.DecompressionBombError:
+            self.fail('too_many_pixels')
+        except (OSError, SyntaxError):
+            self.fail('invalid_image')
+        try:
+            self._check_image(image)
+            max_dimension = settings.IMAGE_UPLOAD_MAX_DIMENSION
+            animated = getattr(image, 'is_animated', False)
+            if max(image.size) > max_dimension and not animated:
+                try:
+                    return _downscale(image, data, max_dimension)
+                except (OSError, SyntaxError):
+                    self.fail('invalid_image')
+        finally:
+            # Closing an image opened on the upload itself would close
+            # the upload as well
+            if hasattr(data, 'temporary_file_path'):
+                image.close()
+
+        # Small enough to keep, let Django verify the whole file
+        data.seek(0)
+        return super().to_internal_value(data)
+
+    def _check_image(self, image):
+        if image.format not in ALLOWED_FORMATS:
+            self.fail('unsupported_format')
+        width, height = image.size
+        if width * height > settings.IMAGE_UPLOAD_MAX_PIXELS:
+            self.fail('too_many_pixels')
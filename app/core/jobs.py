@@ -0,0 +1,133 @@
+import json
+import traceback
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.models import Job
+from core.worker import execute
+
+
+DEFAULT_VISIBILITY_TIMEOUT = 300
+DEFAULT_RETRY_DELAY = 30
+
+
+def task_name(task):
+    # Return the dotted import path of a task callable or string
+    if isinstance(task, str):
+        return task
+    return f'{task.__module__}.{task.__qualname__}'
+
+
+def enqueue(task, args=None, kwargs=None, priority=0, delay=None,
+            run_at=None, max_attempts=3):
+    # Queue a task for the background worker. Higher priority runs first,
+    # delay (seconds) or run_at postpone the job until that moment.
+    if run_at is None:
+        run_at = timezone.now()
+    if delay:
+        run_at += timedelta(seconds=delay)
+
+    return Job.objects.create(
+        task=task_name(task),
+        args=json.dumps(list(args or [])),
+        kwargs=json.dumps(kwargs or {}),
+        priority=priority,
+        run_at=run_at,
+        max_attempts=max_attempts
+    )
+
+
+def claim(limit, visibility_timeout=DEFAULT_VISIBILITY_TIMEOUT):
+    # Lease up to `limit` runnable jobs. Rows locked by other workers are
+    # skipped, and jobs whose lease expired (crashed worker) are reclaimed
+    # while they have attempts left. Those without any are failed, a job
+    # that keeps killing its worker isn't retried forever.
+    now = timezone.now()
+    expired = Q(status=Job.STATUS_RUNNING, locked_until__lt=now)
+    exhausted = Q(attempts__gte=F('max_attempts'))
+    runnable = Q(status=Job.STATUS_QUEUED, run_at__lte=now) | \
+        (expired & ~exhausted)
+
+    with transaction.atomic():
+        Job.objects.filter(expired & exhausted).update(
+            status=Job.STATUS_FAILED,
+            locked_until=None,
+            finished=now,
+            last_error='Lease expired on the last attempt'
+        )
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(runnable)
+            .order_by('-priority', 'run_at', 'id')[:limit]
+        )
+        if not jobs:
+            return []
+
+        locked_until = now + timedelta(seconds=visibility_timeout)
+        for job in jobs:
+            job.status = Job.STATUS_RUNNING
+            job.locked_until = locked_until
+            job.attempts += 1
+        Job.objects.filter(id__in=[job.id for job in jobs]).update(
+            status=Job.STATUS_RUNNING,
+            locked_until=locked_until,
+            attempts=F('attempts') + 1
+        )
+
+    return jobs
+
+
+def _leased(job):
+    # The job row while this claim still owns it. A lease that expired and
+    # was reclaimed has a higher attempts count, the late worker's outcome
+    # is dropped.
+    return Job.objects.filter(
+        id=job.id, status=Job.STATUS_RUNNING, attempts=job.attempts)
+
+
+def complete(job):
+    # Mark a leased job as done
+    _leased(job).update(
+        status=Job.STATUS_DONE,
+        locked_until=None,
+        finished=timezone.now(),
+        last_error=''
+    )
+
+
+def fail(job, error, retry_delay=DEFAULT_RETRY_DELAY):
+    # Record a failure and schedule a retry with exponential backoff,
+    # or give up once max_attempts has been reached
+    now = timezone.now()
+    if job.attempts < job.max_attempts:
+        delay = retry_delay * 2 ** (job.attempts - 1)
+        changes = {
+            'status': Job.STATUS_QUEUED,
+            'run_at': now + timedelta(seconds=delay),
+        }
+    else:
+        changes = {
+            'status': Job.STATUS_FAILED,
+            'finished': now,
+        }
+
+    _leased(job).update(
+        locked_until=None,
+        last_error=error,
+        **changes
+    )
+
+
+def run_inline(job, retry_delay=DEFAULT_RETRY_DELAY):
+    # Execute a claimed job in the current process
+    try:
+        execute(job.task, job.args, job.kwargs)
+    except Exception:
+        fail(job, traceback.format_exc(), retry_delay)
+        return False
+
+    complete(job)
+    return True
@@ -0,0 +1,154 @@
+import http.client
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+SERVERS = {
+    'runserver': [
+        sys.executable, 'manage.py', 'runserver', '--noreload',
+        '127.0.0.1:{port}'
+    ],
+    # Own pidfile so a running production master's file is left alone
+    'gunicorn': [
+        'gunicorn', '-c', 'python:app.gunicorn_conf',
+        '--bind', '127.0.0.1:{port}', '--access-logfile', '/dev/null',
+        '--pidfile', '{pidfile}', 'app.wsgi'
+    ],
+}
+
+
+def bench_host():
+    # Host header the servers accept, the first concrete ALLOWED_HOSTS entry
+    for host in settings.ALLOWED_HOSTS:
+        host = host.lstrip('.')
+        if host and host != '*':
+            return host
+    return 'localhost'
+
+
+class Command(BaseCommand):
+    # Django command to compare server throughput on the same container
+    help = 'Smoke benchmark runserver against the gunicorn profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default='/api/page/pages/',
+            help='URL path to request'
+        )
+        parser.add_argument(
+            '--requests', type=int, default=500,
+            help='Number of requests per server'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=16,
+            help='Number of concurrent client threads'
+        )
+        parser.add_argument(
+            '--port', type=int, default=8765,
+            help='Port used for the servers under test'
+        )
+        parser.add_argument(
+            '--server', action='append', choices=sorted(SERVERS),
+            help='Only benchmark this server, may be repeated'
+        )
+
+    def handle(self, *args, **options):
+        results = []
+        for name in options['server'] or ['runserver', 'gunicorn']:
+            self.stdout.write(f'Benchmarking {name}...')
+            results.append((name, self._bench(name, options)))
+
+        self.stdout.write('')
+        self.stdout.write(
+            f'{"server":<10} {"req/s":>9} {"p50 ms":>9} {"p95 ms":>9} '
+            f'{"errors":>7}'
+        )
+        for name, (rate, p50, p95, errors) in results:
+            self.stdout.write(
+                f'{name:<10} {rate:>9.1f} {p50:>9.1f} {p95:>9.1f} '
+                f'{errors:>7}'
+            )
+
+    def _bench(self, name, options):
+        port = options['port']
+        workdir = tempfile.mkdtemp(prefix='bench-server-')
+        command = [
+            part.format(
+                port=port, pidfile=os.path.join(workdir, 'gunicorn.pid'))
+            for part in SERVERS[name]
+        ]
+        server = subprocess.Popen(
+            command,
+            cwd=settings.BASE_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        try:
+            self._wait_for_port(port)
+            # Warm up imports and connections before measuring
+            for _ in range(options['concurrency']):
+                self._request(port, options['path'])
+            return self._measure(port, options)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def _wait_for_port(self, port, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(('127.0.0.1', port), 1).close()
+                return
+            except OSError:
+                time.sleep(0.1)
+        raise CommandError(f'Server did not listen on port {port}')
+
+    def _request(self, port, path):
+        # Return the request latency in seconds, None on failure
+        started = time.perf_counter()
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        try:
+            connection.request('GET', path, headers={'Host': bench_host()})
+            response = connection.getresponse()
+            response.read()
+            # A rejected host or missing page is as much a failure as a
+            # server error, neither measures the view
+            if response.status >= 400:
+                return None
+        except (OSError, http.client.HTTPException):
+            return None
+        finally:
+            connection.close()
+        return time.perf_counter() - started
+
+    def _measure(self, port, options):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            latencies = list(pool.map(
+                lambda _: self._request(port, options['path']),
+                range(options['requests'])
+            ))
+        elapsed = time.perf_counter() - started
+
+        ok = sorted(latency for latency in latencies if latency is not None)
+        errors = len(latencies) - len(ok)
+        if not ok:
+            return 0.0, 0.0, 0.0, errors
+        p95 = ok[min(len(ok) - 1, int(len(ok) * 0.95))]
+        return (
+            len(ok) / elapsed,
+            statistics.median(ok) * 1000,
+            p95 * 1000,
+            errors
+        )
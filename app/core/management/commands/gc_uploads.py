@@ -0,0 +1,141 @@
+import os
+from collections import Counter
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from core.models import StoredFile
+from core.signals import IMAGE_FIELDS, file_digest, file_size
+from core.storage import TEMP_PREFIX
+
+
+class Command(BaseCommand):
+    # Django command to remove uploads no object references anymore
+    help = 'Delete unreferenced uploaded files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours', type=float, default=24,
+            help='Only delete files unreferenced for at least this long'
+        )
+        parser.add_argument(
+            '--recount', action='store_true',
+            help='Recompute reference counts from the image columns first'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report what would be deleted without deleting it'
+        )
+
+    def handle(self, *args, **options):
+        if not hasattr(default_storage, 'purge'):
+            raise CommandError(
+                'DEFAULT_FILE_STORAGE does not support reference counting')
+
+        self.dry_run = options['dry_run']
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        references = self._references()
+        if options['recount']:
+            self._recount(references)
+
+        removed = self._remove_unreferenced(cutoff)
+        removed += self._remove_untracked(cutoff, references)
+        verb = 'Would delete' if self.dry_run else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {removed} files'))
+
+    def _references(self):
+        # Count how many rows point at every file, one grouped query
+        # per image column
+        references = Counter()
+        for model, field_name in IMAGE_FIELDS:
+            rows = model.objects.exclude(**{f'{field_name}__isnull': True}) \
+                .exclude(**{field_name: ''}) \
+                .values_list(field_name) \
+                .annotate(count=Count('pk')) \
+                .order_by()
+            for name, count in rows:
+                references[name] += count
+        return references
+
+    def _recount(self, references):
+        changed = 0
+        with transaction.atomic():
+            stored = dict(StoredFile.objects.select_for_update()
+                          .values_list('name', 'ref_count'))
+            for name, ref_count in stored.items():
+                if references.get(name, 0) != ref_count:
+                    changed += 1
+                    if not self.dry_run:
+                        StoredFile.objects.filter(name=name).update(
+                            ref_count=references.get(name, 0),
+                            updated=timezone.now()
+                        )
+            missing = [
+                StoredFile(
+                    name=name, digest=file_digest(name), ref_count=count,
+                    size=file_size(name)
+                )
+                for name, count in references.items() if name not in stored
+            ]
+            if missing and not self.dry_run:
+                StoredFile.objects.bulk_create(missing)
+        self.stdout.write(
+            f'Recounted references: {changed} corrected, '
+            f'{len(missing)} files added'
+        )
+
+    def _remove_unreferenced(self, cutoff):
+        removed = 0
+        orphans = StoredFile.objects.filter(
+            ref_count__lte=0, updated__lt=cutoff
+        ).values_list('pk', 'name')
+        for pk, name in orphans:
+            # Deduplicated uploads touch the file, it may be about to be
+            # referenced again
+            if not self._older_than(name, cutoff):
+                continue
+            removed += 1
+            if self.dry_run:
+                self.stdout.write(f'  {name}')
+                continue
+            deleted, _ = StoredFile.objects.filter(
+                pk=pk, ref_count__lte=0).delete()
+            if deleted:
+                default_storage.purge(name)
+        return removed
+
+    def _remove_untracked(self, cutoff, references):
+        # Files on disk without a StoredFile row: interrupted uploads,
+        # uploads whose object was never saved and leftover temp files
+        removed = 0
+        root = default_storage.path(default_storage.directory)
+        tracked = set(StoredFile.objects.values_list('name', flat=True))
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(
+                    path, default_storage.location).replace(os.sep, '/')
+                if name in tracked or name in references:
+                    continue
+                if filename.startswith('.') and \
+                        not filename.startswith(TEMP_PREFIX):
+                    continue
+                if not self._older_than(name, cutoff):
+                    continue
+                removed += 1
+                if self.dry_run:
+                    self.stdout.write(f'  {name}')
+                else:
+                    default_storage.purge(name)
+        return removed
+
+    def _older_than(self, name, cutoff):
+        try:
+            mtime = os.stat(default_storage.path(name)).st_mtime
+        except FileNotFoundError:
+            return True
+        return mtime < cutoff.timestamp()
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from core.models import ValidationToken
+
+
+class Command(BaseCommand):
+    # Django command to clear the legacy email confirmation tokens. New
+    # links are signed and need no rows, old links stop working once
+    # their rows are gone.
+    help = 'Delete stored email validation tokens in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows deleted per statement'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        deleted = 0
+        while True:
+            # Short statements keep the table usable while purging
+            ids = list(ValidationToken.objects.order_by('id').values_list(
+                'id', flat=True)[:batch_size])
+            if not ids:
+                break
+            deleted += ValidationToken.objects.filter(id__in=ids).delete()[0]
+        self.stdout.write(
+            self.style.SUCCESS(f'Deleted {deleted} validation tokens'))
@@ -0,0 +1,64 @@
+import os
+import signal
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    # Django command to gracefully roll gunicorn over to new code
+    help = 'Start a new gunicorn master with fresh code, then stop the old one'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--pidfile',
+            default=os.environ.get('GUNICORN_PIDFILE', '/tmp/gunicorn.pid'),
+            help='Pidfile of the running gunicorn master'
+        )
+        parser.add_argument(
+            '--timeout', type=float, default=60.0,
+            help='Seconds to wait for the new master to come up'
+        )
+        parser.add_argument(
+            '--warmup', type=float, default=5.0,
+            help='Seconds to let the new workers boot before stopping the '
+                 'old ones'
+        )
+
+    def handle(self, *args, **options):
+        pidfile = options['pidfile']
+        old_pid = self._read_pid(pidfile)
+        if old_pid is None:
+            raise CommandError(f'No gunicorn master found in {pidfile}')
+        if old_pid == 1:
+            # Stopping PID 1 ends the container, new master included
+            raise CommandError(
+                'The gunicorn master is PID 1, run it under serve.sh')
+
+        started = time.monotonic()
+        self.stdout.write(f'Starting new master next to {old_pid}...')
+        os.kill(old_pid, signal.SIGUSR2)
+
+        # The new master writes <pidfile>.2 until the old one has exited
+        deadline = started + options['timeout']
+        new_pid = None
+        while new_pid is None:
+            if time.monotonic() > deadline:
+                raise CommandError('New gunicorn master did not start')
+            time.sleep(0.2)
+            new_pid = self._read_pid(f'{pidfile}.2')
+
+        time.sleep(options['warmup'])
+        self.stdout.write(f'Stopping old master {old_pid}...')
+        os.kill(old_pid, signal.SIGTERM)
+        self.stdout.write(self.style.SUCCESS(
+            f'Reloaded, new master {new_pid} '
+            f'({time.monotonic() - started:.2f}s)'
+        ))
+
+    def _read_pid(self, path):
+        try:
+            with open(path) as pidfile:
+                return int(pidfile.read().strip())
+        except (FileNotFoundError, ValueError):
+            return None
@@ -0,0 +1,124 @@
+import multiprocessing
+import signal
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from django.core.management.base import BaseCommand
+
+from core import jobs, worker
+
+
+class Command(BaseCommand):
+    # Django command to run queued background jobs
+    help = 'Run queued background jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=multiprocessing.cpu_count(),
+            help='Size of the process pool, 0 runs jobs inline'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=1.0,
+            help='Seconds to wait when the queue is empty'
+        )
+        parser.add_argument(
+            '--visibility-timeout', type=int,
+            default=jobs.DEFAULT_VISIBILITY_TIMEOUT,
+            help='Seconds a claimed job stays invisible to other workers'
+        )
+        parser.add_argument(
+            '--retry-delay', type=int, default=jobs.DEFAULT_RETRY_DELAY,
+            help='Base delay in seconds before a failed job is retried'
+        )
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Exit once the queue has been drained'
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        self.options = options
+        processes = options['processes']
+        self.stdout.write(f'Worker started with {processes} processes')
+        if processes:
+            processed = self._run_pool(processes)
+        else:
+            processed = self._run_inline()
+        self.stdout.write(self.style.SUCCESS(
+            f'Worker stopped, {processed} jobs processed'))
+
+    def _stop(self, signum, frame):
+        # Finish the jobs in flight, then exit
+        self.stopping = True
+
+    def _claim(self, limit):
+        return jobs.claim(limit, self.options['visibility_timeout'])
+
+    def _idle(self):
+        # Return True when the worker should exit instead of polling
+        if self.options['burst']:
+            return True
+        time.sleep(self.options['poll_interval'])
+        return False
+
+    def _run_inline(self):
+        processed = 0
+        while not self.stopping:
+            claimed = self._claim(1)
+            if not claimed:
+                if self._idle():
+                    break
+                continue
+            jobs.run_inline(claimed[0], self.options['retry_delay'])
+            processed += 1
+        return processed
+
+    def _run_pool(self, processes):
+        processed = 0
+        inflight = {}
+        # Pool processes are spawned, not forked, so they never share the
+        # parent's database connection
+        pool = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=worker.init_pool_process
+        )
+        with pool:
+            while True:
+                free = processes - len(inflight)
+                if free and not self.stopping:
+                    for job in self._claim(free):
+                        future = pool.submit(
+                            worker.execute_in_pool,
+                            job.task, job.args, job.kwargs
+                        )
+                        inflight[future] = job
+
+                if not inflight:
+                    if self.stopping or self._idle():
+                        break
+                    continue
+
+                done, _ = wait(
+                    inflight,
+                    timeout=self.options['poll_interval'],
+                    return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    job = inflight.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        jobs.complete(job)
+                    else:
+                        jobs.fail(
+                            job,
+                            ''.join(traceback.format_exception(
+                                type(error), error, error.__traceback__)),
+                            self.options['retry_delay']
+                        )
+                    processed += 1
+        return processed
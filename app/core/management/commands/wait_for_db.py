@@ -1,21 +1,95 @@
 import time
 
-from django.db import connections
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
 from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
 
 
 class Command (BaseCommand):
     # Django command to pause execution until database is available
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='Database alias to wait for'
+        )
+        parser.add_argument(
+            '--timeout', type=float, default=60.0,
+            help='Give up after this many seconds'
+        )
+        parser.add_argument(
+            '--initial-delay', type=float, default=0.1,
+            help='First retry delay, doubled after every failed attempt'
+        )
+        parser.add_argument(
+            '--max-delay', type=float, default=5.0,
+            help='Upper bound for the retry delay'
+        )
+        parser.add_argument(
+            '--migrate', action='store_true',
+            help='Run migrate afterwards, but only if migrations are pending'
+        )
+
     def handle(self, *args, **options):
+        alias = options['database']
+        started = time.monotonic()
+        deadline = started + options['timeout']
+        delay = options['initial_delay']
+        attempts = 0
+
         self.stdout.write('Waiting for database...')
-        db_conn = None
-        while not db_conn:
+        while True:
+            attempts += 1
             try:
-                db_conn = connections['default']
-            except OperationalError:
-                self.stdout.write('Database unavailable, waiting 1 second...')
-                time.sleep(1)
+                self._probe(alias)
+                break
+            except OperationalError as exc:
+                connections[alias].close()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise CommandError(
+                        f'Database unavailable after '
+                        f'{time.monotonic() - started:.2f}s: {exc}'
+                    )
+                wait = min(delay, options['max_delay'], remaining)
+                self.stdout.write(
+                    f'Database unavailable, waiting {wait:.2f} seconds...')
+                time.sleep(wait)
+                delay *= 2
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Database available! ({time.monotonic() - started:.2f}s, '
+            f'{attempts} attempts)'
+        ))
+
+        if options['migrate']:
+            self._migrate(alias)
+
+    def _probe(self, alias):
+        # Run a real round trip, opening the connection object alone
+        # never touches the network
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+
+    def _pending_migrations(self, alias):
+        executor = MigrationExecutor(connections[alias])
+        targets = executor.loader.graph.leaf_nodes()
+        return executor.migration_plan(targets)
+
+    def _migrate(self, alias):
+        started = time.monotonic()
+        pending = self._pending_migrations(alias)
+        if not pending:
+            self.stdout.write(self.style.SUCCESS(
+                f'No pending migrations, skipping migrate '
+                f'({time.monotonic() - started:.2f}s)'
+            ))
+            return
 
-        self.stdout.write(self.style.SUCCESS('Database available!'))
+        self.stdout.write(f'Applying {len(pending)} pending migrations...')
+        call_command('migrate', database=alias, interactive=False)
+        self.stdout.write(self.style.SUCCESS(
+            f'Migrations applied ({time.monotonic() - started:.2f}s)'))
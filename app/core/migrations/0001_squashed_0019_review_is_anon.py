@@ -0,0 +1,220 @@
+# Generated by Django 2.1.15 on 2026-10-19 12:17
+#
+# Squashed and hand-optimised replacement for 0001-0019. Fields that were
+# added, altered or removed across several migrations (0006-0010,
+# 0013-0015, 0018) are created in their final form.
+
+import core.models
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    replaces = [
+        ('core', '0001_initial'),
+        ('core', '0002_user_is_company'),
+        ('core', '0003_auto_20190314_1340'),
+        ('core', '0004_page_image'),
+        ('core', '0005_provider_providerservice'),
+        ('core', '0006_auto_20190321_2119'),
+        ('core', '0007_auto_20190404_1427'),
+        ('core', '0008_auto_20190404_1432'),
+        ('core', '0009_auto_20190404_1441'),
+        ('core', '0010_auto_20190405_1950'),
+        ('core', '0011_user_provider_id'),
+        ('core', '0012_provider_admin_user'),
+        ('core', '0013_auto_20190406_0934'),
+        ('core', '0014_auto_20190406_1642'),
+        ('core', '0015_auto_20190407_2055'),
+        ('core', '0016_user_is_confirmed'),
+        ('core', '0017_validationtoken'),
+        ('core', '0018_auto_20190408_2033'),
+        ('core', '0019_review_is_anon'),
+    ]
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0009_alter_user_last_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('email', models.EmailField(max_length=255, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('is_active', models.BooleanField(default=True)),
+                ('is_staff', models.BooleanField(default=False)),
+                ('is_company', models.BooleanField(default=False)),
+                ('is_confirmed', models.BooleanField(default=False)),
+                ('groups', models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.Group', verbose_name='groups')),
+                ('user_permissions', models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.Permission', verbose_name='user permissions')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ValidationToken',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_email', models.CharField(max_length=255)),
+                ('token', models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PageCategory',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Page',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('text', models.TextField()),
+                ('slug', models.CharField(blank=True, max_length=255)),
+                ('date', models.DateField(auto_now=True)),
+                ('categories', models.ManyToManyField(to='core.PageCategory')),
+                ('image', models.ImageField(null=True, upload_to=core.models.page_image_file_path)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Provider',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('is_active', models.BooleanField(default=True)),
+                ('is_confirmed', models.BooleanField(default=False)),
+                ('image', models.ImageField(null=True, upload_to=core.models.provider_image_file_path)),
+                ('admin_user', models.ForeignKey(on_delete=django.db.models.deletion.DO_NOTHING, related_name='provider_admin', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='provider_id',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='users', to='core.Provider'),
+        ),
+        migrations.CreateModel(
+            name='ProviderService',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('provider', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='services', to='core.Provider')),
+                ('image', models.ImageField(null=True, upload_to=core.models.provider_service_image_file_path)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProviderLog',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(auto_now=True)),
+                ('ip', models.CharField(max_length=255)),
+                ('country', models.CharField(blank=True, max_length=255)),
+                ('provider', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.Provider')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ServiceLog',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(auto_now=True)),
+                ('ip', models.CharField(max_length=255)),
+                ('country', models.CharField(blank=True, max_length=255)),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.ProviderService')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Ticket',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('date', models.DateField(auto_now=True)),
+                ('object_type', models.IntegerField(null=True)),
+                ('object_id', models.IntegerField(null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReviewCategory',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='HashTag',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Review',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('rating', models.IntegerField(default=0)),
+                ('date', models.DateField(auto_now=True)),
+                ('categories', models.ManyToManyField(to='core.ReviewCategory')),
+                ('tags', models.ManyToManyField(to='core.HashTag')),
+                ('is_auto_confirmed', models.BooleanField(default=False)),
+                ('confirmation_text', models.TextField(blank=True)),
+                ('is_confirmed', models.BooleanField(default=False)),
+                ('is_anon', models.BooleanField(default=False)),
+                ('image', models.ImageField(null=True, upload_to=core.models.provider_image_file_path)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('service', models.ForeignKey(null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='reviews', to='core.ProviderService')),
+                ('provider', models.ForeignKey(null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='reviews', to='core.Provider')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReviewLog',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(auto_now=True)),
+                ('ip', models.CharField(max_length=255)),
+                ('country', models.CharField(blank=True, max_length=255)),
+                ('review', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.Review')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RatingLog',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.Review')),
+                ('date', models.DateField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Comment',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content', models.TextField()),
+                ('parent', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reply_set', to='core.Comment')),
+                ('review', models.ForeignKey(default=1, on_delete=django.db.models.deletion.CASCADE, to='core.Review')),
+                ('date', models.DateField(auto_now=True)),
+                ('rating', models.IntegerField(default=0)),
+                ('is_auto_confirmed', models.BooleanField(default=False)),
+                ('confirmation_text', models.TextField(blank=True)),
+                ('is_confirmed', models.BooleanField(default=False)),
+                ('is_provider', models.BooleanField(default=False)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 2.1.15 on 2026-10-19 12:33
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_storedfile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModerationItem',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('review', 'Review'), ('comment', 'Comment')], max_length=16)),
+                ('object_id', models.IntegerField()),
+                ('status', models.CharField(choices=[('new', 'New'), ('pending', 'Pending'), ('confirmed', 'Confirmed'), ('rejected', 'Rejected')], default='new', max_length=16)),
+                ('score', models.FloatField(blank=True, null=True)),
+                ('reasons', models.TextField(blank=True)),
+                ('fingerprint', models.CharField(blank=True, db_index=True, max_length=16)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='moderationitem',
+            index=models.Index(fields=['status', 'id'], name='core_moderation_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='moderationitem',
+            index=models.Index(fields=['user', 'created'], name='core_moderation_user_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='moderationitem',
+            unique_together={('kind', 'object_id')},
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 2.1.15 on 2026-10-19 12:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_moderationitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LshBucket',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.SmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReviewSignature',
+            fields=[
+                ('review', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='core.Review')),
+                ('signature', models.BinaryField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='moderationitem',
+            name='duplicate_of',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='lshbucket',
+            name='review',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='core.Review'),
+        ),
+        migrations.AddIndex(
+            model_name='lshbucket',
+            index=models.Index(fields=['band', 'bucket'], name='core_lsh_band_bucket_idx'),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 2.1.15 on 2026-10-19 12:36
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Max
+
+
+def dedupe_rating_logs(apps, schema_editor):
+    # Keep the latest log of every (review, user) pair so the unique
+    # constraint can be added, then count the logs as helpful votes
+    RatingLog = apps.get_model('core', 'RatingLog')
+    Review = apps.get_model('core', 'Review')
+
+    duplicates = RatingLog.objects.values('review', 'user') \
+        .annotate(count=Count('id'), keep=Max('id')) \
+        .filter(count__gt=1)
+    for row in duplicates:
+        RatingLog.objects.filter(
+            review=row['review'], user=row['user']
+        ).exclude(id=row['keep']).delete()
+
+    counts = RatingLog.objects.values_list('review') \
+        .annotate(count=Count('id')).order_by()
+    for review_id, count in counts:
+        Review.objects.filter(id=review_id).update(helpful_count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_review_minhash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentRatingLog',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(auto_now=True)),
+                ('is_helpful', models.BooleanField(default=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='helpful_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='unhelpful_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ratinglog',
+            name='is_helpful',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='helpful_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='unhelpful_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='commentratinglog',
+            name='comment',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.Comment'),
+        ),
+        migrations.AddField(
+            model_name='commentratinglog',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterUniqueTogether(
+            name='commentratinglog',
+            unique_together={('comment', 'user')},
+        ),
+        migrations.RunPython(
+            dedupe_rating_logs, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='ratinglog',
+            unique_together={('review', 'user')},
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 2.1.15 on 2026-10-19 12:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_helpful_votes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['object_type', 'object_id', 'id'], name='core_ticket_object_idx'),
+        ),
+    ]
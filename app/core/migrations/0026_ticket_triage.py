@@ -0,0 +1,46 @@
+# Generated by Django 2.1.15 on 2026-10-19 12:38
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def count_tickets(apps, schema_editor):
+    # Seed the status counters from the existing tickets
+    Ticket = apps.get_model('core', 'Ticket')
+    TicketCounter = apps.get_model('core', 'TicketCounter')
+    for key, is_active in (('active', True), ('closed', False)):
+        TicketCounter.objects.update_or_create(
+            key=key,
+            defaults={
+                'value': Ticket.objects.filter(is_active=is_active).count()
+            }
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_ticket_object_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketCounter',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=32, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='assigned_to',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assigned_tickets', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['is_active', 'id'], name='core_ticket_active_idx'),
+        ),
+        migrations.RunPython(count_tickets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+
+# Django matches icontains and istartswith on Postgres with
+# UPPER("column"::text) LIKE UPPER(...), so the trigram indexes are built
+# on that expression. Other databases keep plain scans.
+COLUMNS = ('email', 'name')
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS core_user_{column}_trgm_idx '
+            f'ON core_user USING gin '
+            f'((UPPER("{column}"::text)) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in COLUMNS:
+        schema_editor.execute(
+            f'DROP INDEX IF EXISTS core_user_{column}_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_ticket_triage'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations, models
+
+
+def fill_keys(apps, schema_editor):
+    # Normalize the names, then merge tags sharing a key into the oldest
+    # one so the key can be unique. Reviews keep every tag they had.
+    HashTag = apps.get_model('core', 'HashTag')
+    Review = apps.get_model('core', 'Review')
+    ReviewTag = Review.tags.through
+
+    keep = {}
+    for tag in HashTag.objects.order_by('id'):
+        name = ' '.join(tag.name.lstrip('#').split())
+        key = name.casefold()
+        if key not in keep:
+            keep[key] = tag.id
+            HashTag.objects.filter(id=tag.id).update(name=name, key=key)
+            continue
+        survivor = keep[key]
+        tagged = ReviewTag.objects.filter(hashtag_id=survivor) \
+            .values_list('review_id', flat=True)
+        ReviewTag.objects.filter(hashtag_id=tag.id) \
+            .exclude(review_id__in=list(tagged)) \
+            .update(hashtag_id=survivor)
+        ReviewTag.objects.filter(hashtag_id=tag.id).delete()
+        HashTag.objects.filter(id=tag.id).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0028_refreshtoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hashtag',
+            name='key',
+            field=models.CharField(max_length=255, null=True),
+        ),
+        migrations.RunPython(fill_keys, migrations.RunPython.noop),
+    ]
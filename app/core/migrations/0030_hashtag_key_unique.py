@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Separate from 0029 so the merged rows are committed before Postgres
+    # alters the table
+
+    dependencies = [
+        ('core', '0029_hashtag_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='hashtag',
+            name='key',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
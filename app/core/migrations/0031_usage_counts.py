@@ -0,0 +1,50 @@
+# Generated by Django 2.1.15 on 2026-10-19 12:48
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+# (model, m2m field) -> the counted model is the field's target
+USAGE_RELATIONS = (
+    ('Review', 'tags'),
+    ('Review', 'categories'),
+    ('Page', 'categories'),
+)
+
+
+def count_usage(apps, schema_editor):
+    for model_name, field_name in USAGE_RELATIONS:
+        field = apps.get_model('core', model_name)._meta.get_field(field_name)
+        through = field.remote_field.through
+        target = field.m2m_reverse_name()
+        counts = through.objects.values_list(target) \
+            .annotate(count=Count('id')).order_by()
+        for target_id, count in counts:
+            field.related_model.objects.filter(id=target_id) \
+                .update(usage_count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0030_hashtag_key_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hashtag',
+            name='usage_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='pagecategory',
+            name='usage_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='reviewcategory',
+            name='usage_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(count_usage, migrations.RunPython.noop),
+    ]
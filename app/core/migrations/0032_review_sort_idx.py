@@ -0,0 +1,37 @@
+# Generated by Django 2.1.15 on 2026-10-19 12:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0031_usage_counts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['provider', 'id'], name='core_review_prov_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['provider', 'rating', 'id'], name='core_review_prov_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['provider', 'helpful_count', 'id'], name='core_review_prov_helpful_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['service', 'id'], name='core_review_serv_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['service', 'rating', 'id'], name='core_review_serv_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['service', 'helpful_count', 'id'], name='core_review_serv_helpful_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 2.1.15 on 2026-10-19 13:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+
+def map_sessions(apps, schema_editor):
+    # Seed the mapping from the live database sessions, decoded once here
+    # so bulk logouts never have to
+    if settings.SESSION_ENGINE != 'django.contrib.sessions.backends.db':
+        return
+    from django.contrib.sessions.backends.db import SessionStore
+
+    Session = apps.get_model('sessions', 'Session')
+    UserSession = apps.get_model('core', 'UserSession')
+    User = apps.get_model('core', 'User')
+    store = SessionStore()
+    user_ids = set(User.objects.values_list('id', flat=True))
+    rows = []
+    sessions = Session.objects.filter(expire_date__gt=timezone.now())
+    for key, data, expire_date in sessions.values_list(
+            'session_key', 'session_data', 'expire_date').iterator():
+        user_id = store.decode(data).get('_auth_user_id')
+        if user_id is not None and int(user_id) in user_ids:
+            rows.append(UserSession(
+                user_id=int(user_id), session_key=key,
+                expire_date=expire_date))
+    UserSession.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0032_review_sort_idx'),
+        ('sessions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSession',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('session_key', models.CharField(max_length=40, unique=True)),
+                ('expire_date', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(map_sessions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 2.1.15 on 2026-10-19 13:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0033_usersession'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheGeneration',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('namespace', models.CharField(max_length=255, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -1,6 +1,7 @@
 import uuid
 import os
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, \
     PermissionsMixin
 
@@ -80,6 +81,8 @@ class ValidationToken(models.Model):
 class PageCategory(models.Model):
     # Page category
     name = models.CharField(max_length=255)
+    # Pages in the category, kept by core.signals.count_usage
+    usage_count = models.PositiveIntegerField(default=0, db_index=True)
 
     def __str__(self):
         return self.name
@@ -165,6 +168,24 @@ class Ticket(models.Model):
         on_delete=models.CASCADE,
         null=True
     )
+    assigned_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='assigned_tickets',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        # Tickets of one object, newest first, see ticket.references, and
+        # the admin triage queue filtered on status
+        indexes = [
+            models.Index(
+                fields=['object_type', 'object_id', 'id'],
+                name='core_ticket_object_idx'),
+            models.Index(
+                fields=['is_active', 'id'], name='core_ticket_active_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -182,6 +203,8 @@ class Review(models.Model):
     confirmation_text = models.TextField(blank=True)
     is_confirmed = models.BooleanField(default=False)
     is_anon = models.BooleanField(default=False)
+    helpful_count = models.PositiveIntegerField(default=0)
+    unhelpful_count = models.PositiveIntegerField(default=0)
     image = models.ImageField(null=True, upload_to=provider_image_file_path)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -192,6 +215,28 @@ class Review(models.Model):
     provider = models.ForeignKey(
         'Provider', related_name='reviews', null=True, on_delete=models.DO_NOTHING)
 
+    class Meta:
+        # Reviews of one provider or service in every sort of
+        # review.mixins.REVIEW_SORTS, each one a range scan in index order
+        indexes = [
+            models.Index(
+                fields=['provider', 'id'], name='core_review_prov_idx'),
+            models.Index(
+                fields=['provider', 'rating', 'id'],
+                name='core_review_prov_rating_idx'),
+            models.Index(
+                fields=['provider', 'helpful_count', 'id'],
+                name='core_review_prov_helpful_idx'),
+            models.Index(
+                fields=['service', 'id'], name='core_review_serv_idx'),
+            models.Index(
+                fields=['service', 'rating', 'id'],
+                name='core_review_serv_rating_idx'),
+            models.Index(
+                fields=['service', 'helpful_count', 'id'],
+                name='core_review_serv_helpful_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -204,26 +249,67 @@ class RatingLog(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE
     )
+    is_helpful = models.BooleanField(default=True)
+
+    class Meta:
+        unique_together = (('review', 'user'),)
+
+    def __str__(self):
+        return str(self.review)
+
+
+class CommentRatingLog(models.Model):
+    # One helpful or unhelpful vote per user and comment
+    comment = models.ForeignKey('Comment', on_delete=models.CASCADE)
+    date = models.DateField(auto_now=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE
+    )
+    is_helpful = models.BooleanField(default=True)
+
+    class Meta:
+        unique_together = (('comment', 'user'),)
 
     def __str__(self):
-        return self.review
+        return str(self.comment)
 
 
 class ReviewCategory(models.Model):
     # Review category object
     name = models.CharField(max_length=255)
+    # Reviews in the category, kept by core.signals.count_usage
+    usage_count = models.PositiveIntegerField(default=0, db_index=True)
 
     def __str__(self):
         return self.name
 
 
+def normalize_tag(name):
+    # Display form of a tag name: no leading "#", single spaces
+    return ' '.join(name.lstrip('#').split())
+
+
+def tag_key(name):
+    # Case insensitive lookup key of a tag name, unique per tag
+    return normalize_tag(name).casefold()
+
+
 class HashTag(models.Model):
     # Review tag object
     name = models.CharField(max_length=255)
+    key = models.CharField(max_length=255, unique=True)
+    # Reviews with the tag, kept by core.signals.count_usage
+    usage_count = models.PositiveIntegerField(default=0, db_index=True)
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        self.name = normalize_tag(self.name)
+        self.key = tag_key(self.name)
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     # Review comment object
@@ -237,11 +323,187 @@ class Comment(models.Model):
     confirmation_text = models.TextField(blank=True)
     is_confirmed = models.BooleanField(default=False)
     is_provider = models.BooleanField(default=False)
+    helpful_count = models.PositiveIntegerField(default=0)
+    unhelpful_count = models.PositiveIntegerField(default=0)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE
     )
 
     def __str__(self):
-        content = str(self.content).rstrip(40)
+        content = str(self.content)[:40]
         return content
+
+
+class Job(models.Model):
+    # Background job executed by the run_worker command
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = (
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    )
+
+    task = models.CharField(max_length=255)
+    args = models.TextField(default='[]')
+    kwargs = models.TextField(default='{}')
+    priority = models.IntegerField(default=0)
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    last_error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['status', 'run_at'], name='core_job_status_run_idx'),
+            models.Index(
+                fields=['status', 'locked_until'],
+                name='core_job_status_lock_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.task} ({self.status})'
+
+
+class StoredFile(models.Model):
+    # Uploaded file and the number of objects referencing it
+    name = models.CharField(max_length=255, unique=True)
+    digest = models.CharField(max_length=64, blank=True, db_index=True)
+    size = models.BigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0)
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f'{self.name} ({self.ref_count})'
+
+
+class ModerationItem(models.Model):
+    # Review or comment waiting for, or done with, moderation
+    KIND_REVIEW = 'review'
+    KIND_COMMENT = 'comment'
+    KIND_CHOICES = (
+        (KIND_REVIEW, 'Review'),
+        (KIND_COMMENT, 'Comment'),
+    )
+    STATUS_NEW = 'new'
+    STATUS_PENDING = 'pending'
+    STATUS_CONFIRMED = 'confirmed'
+    STATUS_REJECTED = 'rejected'
+    STATUS_CHOICES = (
+        (STATUS_NEW, 'New'),
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_CONFIRMED, 'Confirmed'),
+        (STATUS_REJECTED, 'Rejected'),
+    )
+
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES)
+    object_id = models.IntegerField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE
+    )
+    status = models.CharField(
+        max_length=16, choices=STATUS_CHOICES, default=STATUS_NEW)
+    score = models.FloatField(null=True, blank=True)
+    reasons = models.TextField(blank=True)
+    fingerprint = models.CharField(max_length=16, blank=True, db_index=True)
+    duplicate_of = models.IntegerField(null=True, blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = (('kind', 'object_id'),)
+        indexes = [
+            models.Index(
+                fields=['status', 'id'], name='core_moderation_status_idx'),
+            models.Index(
+                fields=['user', 'created'], name='core_moderation_user_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} {self.object_id} ({self.status})'
+
+
+class ReviewSignature(models.Model):
+    # MinHash signature of a review description, see review.minhash
+    review = models.OneToOneField(
+        'Review',
+        primary_key=True,
+        related_name='signature',
+        on_delete=models.CASCADE
+    )
+    signature = models.BinaryField()
+
+
+class LshBucket(models.Model):
+    # One band of a review signature, reviews sharing a bucket in any band
+    # are candidate near duplicates
+    review = models.ForeignKey(
+        'Review',
+        related_name='lsh_buckets',
+        on_delete=models.CASCADE
+    )
+    band = models.SmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['band', 'bucket'], name='core_lsh_band_bucket_idx'),
+        ]
+
+
+class TicketCounter(models.Model):
+    # Number of tickets per status, kept up to date by ticket.counters
+    key = models.CharField(max_length=32, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.key}: {self.value}'
+
+
+class RefreshToken(models.Model):
+    # Refresh token of the signed token scheme, stored as a SHA-256 digest
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='refresh_tokens',
+        on_delete=models.CASCADE
+    )
+    digest = models.CharField(max_length=64, unique=True)
+    expires = models.DateTimeField(db_index=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+
+class UserSession(models.Model):
+    # Session opened by a user login, so a user's sessions can be found
+    # without decoding every session, see user.signals
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='sessions',
+        on_delete=models.CASCADE
+    )
+    session_key = models.CharField(max_length=40, unique=True)
+    expire_date = models.DateTimeField()
+
+    def __str__(self):
+        return f'{self.user_id}: {self.session_key}'
+
+
+class CacheGeneration(models.Model):
+    # Version of a core.cache namespace, kept in the database so every
+    # worker sees a bump as soon as it commits
+    namespace = models.CharField(max_length=255, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.namespace}: {self.value}'
@@ -0,0 +1,222 @@
+import hashlib
+import re
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from core import jobs
+from core.models import Comment, Job, ModerationItem, Review
+
+
+SHINGLE_SIZE = 4
+SCORE_BATCH_SIZE = 500
+
+BLOCKLIST_WEIGHT = 0.5
+DUPLICATE_WEIGHT = 0.4
+RATE_WEIGHT = 0.3
+LINK_WEIGHT = 0.2
+
+WORD = re.compile(r'\w+')
+LINK = re.compile(r'https?://|www\.', re.IGNORECASE)
+
+MODELS = {
+    ModerationItem.KIND_REVIEW: Review,
+    ModerationItem.KIND_COMMENT: Comment,
+}
+
+
+def item_text(kind, obj):
+    if kind == ModerationItem.KIND_REVIEW:
+        return f'{obj.title}\n{obj.description}'
+    return obj.content
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    # Hash every run of `size` consecutive words of the normalized text
+    words = WORD.findall(text.lower())
+    if len(words) < size:
+        words = words + [''] * (size - len(words))
+    return {
+        int.from_bytes(hashlib.blake2b(
+            ' '.join(words[i:i + size]).encode(), digest_size=8
+        ).digest(), 'big')
+        for i in range(len(words) - size + 1)
+    }
+
+
+def fingerprint(text):
+    # Smallest shingle hash of the text. Two texts share it with a
+    # probability equal to the Jaccard similarity of their shingle sets,
+    # so near duplicates are found with one lookup on an indexed column.
+    return f'{min(shingles(text)):016x}'
+
+
+def blocklist_pattern():
+    words = [re.escape(word) for word in settings.MODERATION_BLOCKLIST]
+    if not words:
+        return None
+    return re.compile(r'\b(?:%s)\b' % '|'.join(words), re.IGNORECASE)
+
+
+def load_objects(items):
+    # Fetch the reviews and comments of the items, one query per kind
+    objects = {}
+    for kind, model in MODELS.items():
+        ids = [item.object_id for item in items if item.kind == kind]
+        if ids:
+            for pk, obj in model.objects.in_bulk(ids).items():
+                objects[(kind, pk)] = obj
+    return objects
+
+
+def _ensure_scoring_job():
+    task = jobs.task_name(score_pending)
+    if not Job.objects.filter(task=task, status=Job.STATUS_QUEUED).exists():
+        jobs.enqueue(task)
+
+
+def queue_item(kind, obj):
+    # Put a new review or comment on the moderation queue. The item is
+    # part of the caller's transaction, the scoring job is only queued once
+    # that commits so a worker never scores an item whose object is still
+    # being written.
+    ModerationItem.objects.create(
+        kind=kind, object_id=obj.pk, user_id=obj.user_id)
+    transaction.on_commit(_ensure_scoring_job)
+
+
+def requeue_item(kind, obj, **fields):
+    # Send an edited review or comment back to be scored again, with the
+    # given item fields, queueing a scoring job once the edit commits
+    fields['status'] = ModerationItem.STATUS_NEW
+    updated = ModerationItem.objects.filter(
+        kind=kind, object_id=obj.pk).update(**fields)
+    if not updated:
+        ModerationItem.objects.create(
+            kind=kind, object_id=obj.pk, user_id=obj.user_id, **fields)
+    transaction.on_commit(_ensure_scoring_job)
+
+
+def score_pending(limit=SCORE_BATCH_SIZE):
+    # Score a batch of new items. Items under the auto confirm threshold
+    # are confirmed, the others go to the pending queue for the admins.
+    # Returns the number of items scored.
+    with transaction.atomic():
+        items = list(
+            ModerationItem.objects.select_for_update(skip_locked=True)
+            .filter(status=ModerationItem.STATUS_NEW)
+            .order_by('id')[:limit]
+        )
+        if not items:
+            return 0
+
+        objects = load_objects(items)
+        texts = {}
+        for item in items:
+            obj = objects.get((item.kind, item.object_id))
+            if obj is not None:
+                texts[item.pk] = item_text(item.kind, obj)
+                item.fingerprint = fingerprint(texts[item.pk])
+
+        duplicates = _duplicate_fingerprints(items)
+        recent = _recent_counts(items)
+        blocklist = blocklist_pattern()
+
+        updates = defaultdict(list)
+        for item in items:
+            if item.pk not in texts:
+                # The review or comment was deleted in the meantime
+                item.delete()
+                continue
+            item.score, reasons = _score(
+                texts[item.pk], item, duplicates, recent, blocklist)
+            item.reasons = '\n'.join(reasons)
+            if item.score < settings.MODERATION_AUTO_CONFIRM_SCORE:
+                item.status = ModerationItem.STATUS_CONFIRMED
+            else:
+                item.status = ModerationItem.STATUS_PENDING
+            ModerationItem.objects.filter(pk=item.pk).update(
+                status=item.status, score=item.score, reasons=item.reasons,
+                fingerprint=item.fingerprint
+            )
+            updates[(item.kind, item.status, item.reasons)].append(
+                item.object_id)
+
+        # Objects that ended up with the same outcome share one UPDATE
+        for (kind, status, reasons), object_ids in updates.items():
+            confirmed = status == ModerationItem.STATUS_CONFIRMED
+            MODELS[kind].objects.filter(pk__in=object_ids).update(
+                is_auto_confirmed=confirmed,
+                is_confirmed=confirmed,
+                confirmation_text=reasons
+            )
+
+    if len(items) == limit:
+        # More may be waiting, continue in a fresh job
+        jobs.enqueue(score_pending, kwargs={'limit': limit})
+    return len(items)
+
+
+def resolve(item, confirmed):
+    # Apply an admin decision to a pending item and its object
+    item.status = ModerationItem.STATUS_CONFIRMED if confirmed \
+        else ModerationItem.STATUS_REJECTED
+    with transaction.atomic():
+        ModerationItem.objects.filter(pk=item.pk).update(status=item.status)
+        MODELS[item.kind].objects.filter(pk=item.object_id).update(
+            is_auto_confirmed=False, is_confirmed=confirmed)
+    return item
+
+
+def _duplicate_fingerprints(items):
+    # Fingerprints seen more than once across the queue, this batch
+    # included, in one grouped query
+    seen = defaultdict(int)
+    for item in items:
+        if item.fingerprint:
+            seen[item.fingerprint] += 1
+    # The batch itself isn't saved yet, its rows don't count twice
+    rows = ModerationItem.objects.filter(fingerprint__in=list(seen)) \
+        .values_list('fingerprint') \
+        .annotate(count=Count('id')) \
+        .order_by()
+    for value, count in rows:
+        seen[value] += count
+    return {value for value, count in seen.items() if count > 1}
+
+
+def _recent_counts(items):
+    # Items every author created within the rate window
+    since = timezone.now() - timedelta(
+        seconds=settings.MODERATION_RATE_WINDOW)
+    rows = ModerationItem.objects.filter(
+        user_id__in={item.user_id for item in items}, created__gte=since
+    ).values_list('user_id').annotate(count=Count('id')).order_by()
+    return dict(rows)
+
+
+def _score(text, item, duplicates, recent, blocklist):
+    score = 0.0
+    reasons = []
+    if blocklist is not None:
+        hits = len(blocklist.findall(text))
+        if hits:
+            score += BLOCKLIST_WEIGHT * hits
+            reasons.append(f'Blocked words: {hits}')
+    if item.duplicate_of:
+        score += DUPLICATE_WEIGHT
+        reasons.append(f'Near duplicate of review {item.duplicate_of}')
+    elif item.fingerprint in duplicates:
+        score += DUPLICATE_WEIGHT
+        reasons.append('Duplicate text')
+    if recent.get(item.user_id, 0) > settings.MODERATION_RATE_LIMIT:
+        score += RATE_WEIGHT
+        reasons.append('Posting rate exceeded')
+    if LINK.search(text):
+        score += LINK_WEIGHT
+        reasons.append('Contains links')
+    return round(score, 3), reasons
@@ -0,0 +1,101 @@
+import json
+from base64 import b64decode, b64encode
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class IdCursorPagination(CursorPagination):
+    # Keyset pagination on the primary key. Every page is a range scan on
+    # an index starting at the cursor, however deep the client pages.
+    ordering = 'id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class NewestFirstCursorPagination(IdCursorPagination):
+    # Keyset pagination on the primary key, newest rows first
+    ordering = '-id'
+
+
+class KeysetPagination(IdCursorPagination):
+    # Keyset pagination on several columns, for sorts on a column with ties
+    # such as a rating. CursorPagination keys on the first column only and
+    # skips the ties with an offset, here the cursor holds every ordering
+    # value of the last row and the next page starts right after it, so a
+    # page is a range scan on an index over the ordering columns. The last
+    # column must be unique and every column sorts the same way. Forward
+    # only, there is no previous link.
+
+    def __init__(self, ordering):
+        self.ordering = ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.fields = self._ordering_fields(queryset.model)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self._after(position))
+        results = list(queryset.order_by(*self.ordering)[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def _ordering_fields(self, model):
+        return [
+            model._meta.get_field(name.lstrip('-')) for name in self.ordering
+        ]
+
+    def _after(self, position):
+        # Rows after (x, y) in the ordering, for an ascending one
+        # a >= x AND (a > x OR (a = x AND b > y)). The first condition
+        # alone bounds the index range.
+        descending = self.ordering[0].startswith('-')
+        after = 'lt' if descending else 'gt'
+        names = [field.attname for field in self.fields]
+        condition = Q(**{f'{names[-1]}__{after}': position[-1]})
+        for name, value in reversed(list(zip(names, position))[:-1]):
+            condition = Q(**{f'{name}__{after}': value}) | \
+                (Q(**{name: value}) & condition)
+        return Q(**{f'{names[0]}__{after}e': position[0]}) & condition
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            values = json.loads(b64decode(encoded.encode('ascii')).decode())
+            if not isinstance(values, list) or \
+                    len(values) != len(self.fields):
+                raise ValueError
+            return [
+                field.to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def cursor_for(self, row):
+        # ?cursor= value of the page following the row
+        values = [
+            field.value_to_string(row)
+            for field in self._ordering_fields(type(row))
+        ]
+        return b64encode(json.dumps(values).encode()).decode('ascii')
+
+    def encode_cursor(self, row):
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, self.cursor_for(row))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_previous_link(self):
+        return None
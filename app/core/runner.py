@@ -0,0 +1,269 @@
+import glob
+import hashlib
+import json
+import os
+import shutil
+import statistics
+import time
+import unittest
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.test.runner import DiscoverRunner, ParallelTestSuite, \
+    RemoteTestResult, RemoteTestRunner
+from django.test.utils import get_unique_databases_and_mirrors
+
+
+DEFAULT_SCHEMA_CACHE = os.path.join(settings.BASE_DIR, '.test_cache')
+DEFAULT_DURATIONS_FILE = os.path.join(DEFAULT_SCHEMA_CACHE, 'durations.json')
+DEFAULT_TEST_DURATION = 0.1
+
+
+def migrations_fingerprint():
+    # Hash every migration file of the installed apps, the cached schema
+    # is only valid while this value stays the same
+    digest = hashlib.sha1()
+    for app_config in apps.get_app_configs():
+        pattern = os.path.join(app_config.path, 'migrations', '*.py')
+        for path in sorted(glob.glob(pattern)):
+            digest.update(os.path.relpath(path, app_config.path).encode())
+            with open(path, 'rb') as migration:
+                digest.update(migration.read())
+    return digest.hexdigest()[:16]
+
+
+def load_durations(path):
+    # Return the persisted {test id: seconds} map, empty if there is none
+    try:
+        with open(path) as durations:
+            return json.load(durations)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_durations(path, durations):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as output:
+        json.dump(
+            {test_id: round(elapsed, 4)
+             for test_id, elapsed in durations.items()},
+            output, indent=1, sort_keys=True
+        )
+
+
+class TimedTextTestResult(unittest.TextTestResult):
+    # Text result that records how long every test took
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.durations = {}
+        self._started = None
+
+    def startTest(self, test):
+        self._started = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        self.durations[test.id()] = time.perf_counter() - self._started
+
+    def addDuration(self, test, elapsed):
+        # Replayed from a parallel worker, replaces the replay timing
+        self.durations[test.id()] = elapsed
+
+
+class TimedRemoteTestResult(RemoteTestResult):
+    # Remote result that sends test durations back to the parent process
+
+    def startTest(self, test):
+        self._started = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        self.events.append((
+            'addDuration', self.test_index,
+            time.perf_counter() - self._started
+        ))
+
+
+class TimedRemoteTestRunner(RemoteTestRunner):
+    resultclass = TimedRemoteTestResult
+
+
+class BalancedParallelTestSuite(ParallelTestSuite):
+    # Parallel suite that hands out the slowest test cases first.
+    #
+    # Test cases are dispatched to whichever worker is free, so starting
+    # with the longest ones (by their last recorded duration) keeps a big
+    # case from being picked up last and leaving the other workers idle.
+
+    runner_class = TimedRemoteTestRunner
+
+    def __init__(self, suite, processes, failfast=False, durations=None):
+        super().__init__(suite, processes, failfast)
+        durations = durations or {}
+        default = statistics.median(durations.values()) \
+            if durations else DEFAULT_TEST_DURATION
+
+        def cost(subsuite):
+            return sum(durations.get(test.id(), default) for test in subsuite)
+
+        self.subsuites.sort(key=cost, reverse=True)
+
+
+class FastTestRunner(DiscoverRunner):
+    # Test runner that can build the test schema once and reuse it.
+    #
+    # With --schema-cache the migrated test database is kept between runs:
+    # SQLite databases are restored from a template file keyed by the
+    # migrations fingerprint, other backends reuse the kept database while
+    # the fingerprint matches. With --parallel every process gets a clone
+    # of that database instead of migrating its own.
+    #
+    # Test durations are persisted to --durations-file. Parallel runs use
+    # them to schedule the slowest test cases first, and the slowest tests
+    # of every run are listed at the end.
+
+    def __init__(self, schema_cache=False,
+                 schema_cache_dir=DEFAULT_SCHEMA_CACHE, durations_file=None,
+                 slowest=10, **kwargs):
+        super().__init__(**kwargs)
+        self.schema_cache = schema_cache_dir if schema_cache else None
+        self.durations_file = durations_file
+        self.slowest = slowest
+        self.durations = load_durations(durations_file) \
+            if durations_file else {}
+
+    def parallel_test_suite(self, suite, processes, failfast=False):
+        return BalancedParallelTestSuite(
+            suite, processes, failfast, self.durations)
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--schema-cache', action='store_true',
+            default=bool(os.environ.get('TEST_SCHEMA_CACHE')),
+            help='Reuse the migrated test schema between runs'
+        )
+        parser.add_argument(
+            '--schema-cache-dir', default=DEFAULT_SCHEMA_CACHE,
+            help='Directory holding the cached test schema'
+        )
+        parser.add_argument(
+            '--durations-file', default=DEFAULT_DURATIONS_FILE,
+            help='JSON file with recorded test durations, empty to disable'
+        )
+        parser.add_argument(
+            '--slowest', type=int, default=10,
+            help='Number of slowest tests to list after the run'
+        )
+
+    def get_resultclass(self):
+        return super().get_resultclass() or TimedTextTestResult
+
+    def run_suite(self, suite, **kwargs):
+        result = super().run_suite(suite, **kwargs)
+        durations = getattr(result, 'durations', None)
+        if durations:
+            if self.durations_file:
+                self.durations.update(durations)
+                save_durations(self.durations_file, self.durations)
+            if self.slowest:
+                self._report_slowest(durations)
+        return result
+
+    def _report_slowest(self, durations):
+        slowest = sorted(
+            durations.items(), key=lambda item: item[1], reverse=True
+        )[:self.slowest]
+        print(f'\nSlowest {len(slowest)} tests '
+              f'({sum(durations.values()):.2f}s total test time):')
+        for test_id, elapsed in slowest:
+            print(f'  {elapsed:8.3f}s  {test_id}')
+
+    def setup_databases(self, **kwargs):
+        if not self.schema_cache:
+            return super().setup_databases(**kwargs)
+
+        os.makedirs(self.schema_cache, exist_ok=True)
+        fingerprint = migrations_fingerprint()
+        test_databases, _ = get_unique_databases_and_mirrors()
+        aliases = [
+            alias for _, group in test_databases.values() for alias in group
+        ]
+        reuse = all(
+            self._restore_schema(connections[alias], fingerprint)
+            for alias in aliases
+        )
+        if self.verbosity >= 1:
+            state = 'reusing' if reuse else 'building'
+            print(f'Schema cache {fingerprint}: {state} test databases')
+
+        # The cache owns these databases, stale ones are replaced without
+        # prompting and all of them are kept on teardown for the next run
+        self.keepdb = reuse
+        self.interactive = False
+        try:
+            old_config = super().setup_databases(**kwargs)
+        finally:
+            self.keepdb = True
+
+        if not reuse:
+            for alias in aliases:
+                self._store_schema(connections[alias], fingerprint)
+        return old_config
+
+    def _stamp_path(self, alias):
+        return os.path.join(self.schema_cache, f'{alias}.fingerprint')
+
+    def _template_path(self, alias, fingerprint):
+        return os.path.join(
+            self.schema_cache, f'template_{alias}_{fingerprint}.sqlite3')
+
+    def _restore_schema(self, connection, fingerprint):
+        # Prepare the test database, return True if the cached schema
+        # can be used as is
+        alias = connection.alias
+        if connection.vendor != 'sqlite':
+            try:
+                with open(self._stamp_path(alias)) as stamp:
+                    return stamp.read().strip() == fingerprint
+            except FileNotFoundError:
+                return False
+
+        test_settings = connection.settings_dict.setdefault('TEST', {})
+        test_name = test_settings.get('NAME')
+        if not test_name or connection.creation.is_in_memory_db(test_name):
+            test_name = os.path.join(
+                self.schema_cache, f'test_{alias}.sqlite3')
+            test_settings['NAME'] = test_name
+
+        # Clones from an earlier run may carry a different schema
+        root, ext = os.path.splitext(test_name)
+        for clone in glob.glob(f'{root}_*{ext}'):
+            os.remove(clone)
+
+        template = self._template_path(alias, fingerprint)
+        if not os.path.exists(template):
+            if os.path.exists(test_name):
+                os.remove(test_name)
+            return False
+        shutil.copyfile(template, test_name)
+        return True
+
+    def _store_schema(self, connection, fingerprint):
+        alias = connection.alias
+        if connection.vendor != 'sqlite':
+            with open(self._stamp_path(alias), 'w') as stamp:
+                stamp.write(fingerprint)
+            return
+
+        for stale in glob.glob(self._template_path(alias, '*')):
+            os.remove(stale)
+        shutil.copyfile(
+            connection.settings_dict['NAME'],
+            self._template_path(alias, fingerprint)
+        )
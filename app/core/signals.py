@@ -0,0 +1,220 @@
+import os
+
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_init, \
+    post_save, pre_delete
+from django.dispatch import Signal
+from django.utils import timezone
+
+from core.models import Comment, ModerationItem, Page, Provider, \
+    ProviderService, Review, StoredFile
+from core.moderation import queue_item
+
+
+# Many to many fields whose targets keep a usage_count of their sources
+USAGE_RELATIONS = (
+    (Review, 'tags'),
+    (Review, 'categories'),
+    (Page, 'categories'),
+)
+
+# Sent with {target id: delta} whenever usage_count of a target model
+# moves, for caches that follow the counts
+usage_changed = Signal(providing_args=['deltas'])
+
+# Models whose images are reference counted in StoredFile
+IMAGE_FIELDS = (
+    (Page, 'image'),
+    (Provider, 'image'),
+    (ProviderService, 'image'),
+    (Review, 'image'),
+)
+
+
+def file_digest(name):
+    # Content addressed names carry their digest, legacy ones don't
+    digest = os.path.splitext(os.path.basename(name))[0]
+    return digest if len(digest) == 64 else ''
+
+
+def adjust_references(name, delta):
+    # Add delta to the reference count of a stored file with a single
+    # UPDATE, creating the row the first time a file is referenced
+    if not name:
+        return
+    updated = StoredFile.objects.filter(name=name).update(
+        ref_count=F('ref_count') + delta, updated=timezone.now())
+    if updated or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            StoredFile.objects.create(
+                name=name, digest=file_digest(name), ref_count=delta,
+                size=file_size(name)
+            )
+    except IntegrityError:
+        # Created concurrently, count on the existing row
+        StoredFile.objects.filter(name=name).update(
+            ref_count=F('ref_count') + delta, updated=timezone.now())
+
+
+def file_size(name):
+    try:
+        return default_storage.size(name)
+    except OSError:
+        return 0
+
+
+def _original_attr(field_name):
+    return f'_original_{field_name}'
+
+
+def _file_name(value):
+    return getattr(value, 'name', value) or None
+
+
+def remember_image(sender, instance, field_name, **kwargs):
+    # Read the raw value, going through the descriptor would load
+    # deferred fields one query at a time
+    if field_name in instance.__dict__:
+        setattr(
+            instance, _original_attr(field_name),
+            _file_name(instance.__dict__[field_name])
+        )
+
+
+def count_image(sender, instance, field_name, created=False, raw=False,
+                **kwargs):
+    if raw or field_name not in instance.__dict__:
+        return
+    attr = _original_attr(field_name)
+    # When the field was deferred on load the previous file is unknown, it
+    # keeps its reference until gc_uploads --recount corrects it
+    original = None if created else getattr(instance, attr, None)
+    current = _file_name(getattr(instance, field_name))
+    if current == original:
+        return
+    adjust_references(current, 1)
+    adjust_references(original, -1)
+    setattr(instance, attr, current)
+
+
+def release_image(sender, instance, field_name, **kwargs):
+    adjust_references(
+        getattr(instance, _original_attr(field_name), None), -1)
+
+
+def _bind(handler, **bound):
+    def receiver(sender, **kwargs):
+        handler(sender, **bound, **kwargs)
+    return receiver
+
+
+def connect_image_signals():
+    for model, field_name in IMAGE_FIELDS:
+        uid = f'{model._meta.label_lower}.{field_name}'
+        post_init.connect(
+            _bind(remember_image, field_name=field_name),
+            sender=model, weak=False,
+            dispatch_uid=f'remember_image:{uid}'
+        )
+        post_save.connect(
+            _bind(count_image, field_name=field_name),
+            sender=model, weak=False,
+            dispatch_uid=f'count_image:{uid}'
+        )
+        post_delete.connect(
+            _bind(release_image, field_name=field_name),
+            sender=model, weak=False,
+            dispatch_uid=f'release_image:{uid}'
+        )
+
+
+def moderate(sender, instance, kind, created=False, raw=False, **kwargs):
+    if created and not raw:
+        queue_item(kind, instance)
+
+
+def connect_moderation_signals():
+    for model, kind in ((Review, ModerationItem.KIND_REVIEW),
+                        (Comment, ModerationItem.KIND_COMMENT)):
+        post_save.connect(
+            _bind(moderate, kind=kind), sender=model, weak=False,
+            dispatch_uid=f'moderate:{model._meta.label_lower}'
+        )
+
+
+def _adjust_usage(model, deltas):
+    # Apply {target id: delta} with one F() UPDATE per distinct delta
+    by_delta = {}
+    for target_id, delta in deltas.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(target_id)
+    for delta, target_ids in by_delta.items():
+        model.objects.filter(pk__in=target_ids).update(
+            usage_count=F('usage_count') + delta)
+    if by_delta:
+        usage_changed.send(sender=model, deltas={
+            target_id: delta for target_id, delta in deltas.items() if delta})
+
+
+def count_usage(sender, instance, action, reverse, model, pk_set,
+                source, target, **kwargs):
+    # Follow m2m changes in the usage_count of the targets. From the
+    # target side pk_set holds sources, the target itself moves by one per
+    # source. Rows going away are counted in the pre_ signal: clear passes
+    # no pk_set, and remove passes every requested id, linked or not.
+    target_model = type(instance) if reverse else model
+    if action in ('pre_clear', 'pre_remove'):
+        if action == 'pre_remove' and not pk_set:
+            return
+        lookups = {target if reverse else source: instance.pk}
+        if pk_set:
+            lookups[f'{source if reverse else target}__in'] = pk_set
+        rows = sender.objects.filter(**lookups)
+        if reverse:
+            removed = {instance.pk: rows.count()}
+        else:
+            removed = dict.fromkeys(rows.values_list(target, flat=True), 1)
+        instance.__dict__.setdefault('_usage_removed', {})[sender] = removed
+    elif action in ('post_clear', 'post_remove'):
+        removed = getattr(instance, '_usage_removed', {}).pop(sender, {})
+        _adjust_usage(target_model, {
+            target_id: -count for target_id, count in removed.items()})
+    elif action == 'post_add' and pk_set:
+        # Django only passes the ids it actually linked to post_add
+        if reverse:
+            _adjust_usage(target_model, {instance.pk: len(pk_set)})
+        else:
+            _adjust_usage(target_model, dict.fromkeys(pk_set, 1))
+
+
+def release_usage(sender, instance, through, source, target, target_model,
+                  **kwargs):
+    # Deleting a source removes its rows without m2m_changed
+    target_ids = through.objects.filter(
+        **{source: instance.pk}).values_list(target, flat=True)
+    _adjust_usage(target_model, dict.fromkeys(target_ids, -1))
+
+
+def connect_usage_signals():
+    for model, field_name in USAGE_RELATIONS:
+        field = model._meta.get_field(field_name)
+        through = field.remote_field.through
+        names = {
+            'source': field.m2m_column_name(),
+            'target': field.m2m_reverse_name(),
+        }
+        uid = f'{model._meta.label_lower}.{field_name}'
+        m2m_changed.connect(
+            _bind(count_usage, **names), sender=through, weak=False,
+            dispatch_uid=f'count_usage:{uid}'
+        )
+        pre_delete.connect(
+            _bind(release_usage, through=through,
+                  target_model=field.related_model, **names),
+            sender=model, weak=False,
+            dispatch_uid=f'release_usage:{uid}'
+        )
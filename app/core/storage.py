@@ -0,0 +1,76 @@
+import hashlib
+import os
+import posixpath
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+TEMP_PREFIX = '.upload-'
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    # File storage that keeps every distinct upload exactly once.
+    #
+    # The content is hashed while it is written to a temporary file next
+    # to its destination and then moved to <directory>/ab/<sha256>.<ext>,
+    # so the same logo uploaded twice ends up as a single file with a
+    # stable, cacheable URL. Only the extension of the requested name is
+    # kept.
+    #
+    # Files can be shared by several objects, delete() therefore leaves
+    # them alone. Unreferenced files are removed by the gc_uploads command
+    # through purge().
+
+    directory = 'uploads'
+    hash_algorithm = 'sha256'
+
+    def digest_name(self, digest, ext):
+        return posixpath.join(self.directory, digest[:2], digest + ext)
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is only known once the content is hashed and an
+        # existing file with that name already holds the same bytes
+        return name
+
+    def _save(self, name, content):
+        ext = os.path.splitext(name)[1].lower()
+        tmp_dir = self.path(self.directory)
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        digest = hashlib.new(self.hash_algorithm)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir, prefix=TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    tmp.write(chunk)
+
+            name = self.digest_name(digest.hexdigest(), ext)
+            full_path = self.path(name)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            try:
+                # link() never replaces an existing file, so concurrent
+                # uploads of the same content can't clobber each other
+                os.link(tmp_path, full_path)
+            except FileExistsError:
+                # Refresh the mtime so gc_uploads keeps a deduplicated
+                # file through its grace period
+                os.utime(full_path)
+            else:
+                if self.file_permissions_mode is not None:
+                    os.chmod(full_path, self.file_permissions_mode)
+        finally:
+            os.remove(tmp_path)
+        return name
+
+    def delete(self, name):
+        pass
+
+    def purge(self, name):
+        # Really remove a file, only call once nothing references it
+        super().delete(name)
@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core.authentication import SignedTokenAuthentication, access_token
+from core.models import Provider, RefreshToken
+from core.permissions import IsCompany
+
+
+TOKEN_URL = reverse('user:token-signed')
+REFRESH_URL = reverse('user:token-refresh')
+ME_URL = reverse('user:me')
+OWN_SERVICES_URL = reverse('provider:ownservices-list')
+
+
+class SignedTokenTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass', name='Test', is_company=True)
+        self.user.provider_id = Provider.objects.create(
+            title='Provider', description='Text', admin_user=self.user)
+        self.user.save()
+        self.client = APIClient()
+
+    def login(self):
+        res = self.client.post(
+            TOKEN_URL, {'email': 'test@gmail.com', 'password': 'testpass'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.data
+
+    def test_claims_checked_without_queries(self):
+        # Test that authentication and flag permissions skip the database
+        request = APIRequestFactory().get(
+            '/', HTTP_AUTHORIZATION=f'Bearer {access_token(self.user)}')
+
+        with self.assertNumQueries(0):
+            user, claims = SignedTokenAuthentication().authenticate(request)
+            request.user = user
+            self.assertTrue(IsCompany().has_permission(request, None))
+
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(claims['prv'], self.user.provider_id_id)
+
+    def test_access_token_authenticates(self):
+        # Test that views accept the signed token next to DRF tokens
+        tokens = self.login()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.data['email'], 'test@gmail.com')
+        res = self.client.get(OWN_SERVICES_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_invalid_tokens_rejected(self):
+        # Test that tampered and expired tokens are refused
+        token = access_token(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}x')
+        self.assertEqual(
+            self.client.get(ME_URL).status_code,
+            status.HTTP_401_UNAUTHORIZED
+        )
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        with override_settings(ACCESS_TOKEN_LIFETIME=-1):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_refresh_rotates(self):
+        # Test that a refresh token can be used once
+        tokens = self.login()
+
+        res = self.client.post(REFRESH_URL, {'refresh': tokens['refresh']})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res.data['refresh'], tokens['refresh'])
+
+        res = self.client.post(REFRESH_URL, {'refresh': tokens['refresh']})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(RefreshToken.objects.count(), 1)
+
+    def test_refresh_refused_for_inactive_user(self):
+        # Test that the refresh checks the user in the database
+        tokens = self.login()
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.post(REFRESH_URL, {'refresh': tokens['refresh']})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
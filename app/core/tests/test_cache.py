@@ -0,0 +1,46 @@
+from unittest.mock import patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.test import TransactionTestCase
+
+from core import cache
+
+
+class CacheGenerationTests(TransactionTestCase):
+
+    def test_invalidation_seen_by_other_processes(self):
+        # Test that a bump made in one process drops the results another
+        # process keeps in its own cache
+        other = LocMemCache('other-process', {})
+        with patch('core.cache.cache', other):
+            self.assertEqual(
+                cache.get_or_compute('things', {}, lambda: 1, 60), 1)
+            self.assertEqual(
+                cache.get_or_compute('things', {}, lambda: 2, 60), 1)
+
+        cache.invalidate('things')
+
+        with patch('core.cache.cache', other):
+            self.assertEqual(
+                cache.get_or_compute('things', {}, lambda: 2, 60), 2)
+
+    def test_bump_on_commit(self):
+        # Test that a bump waits for the caller's transaction to commit
+        with transaction.atomic():
+            cache.invalidate('things')
+            cache.invalidate('things')
+            self.assertEqual(cache.generation('things'), 0)
+
+        self.assertEqual(cache.generation('things'), 2)
+
+    def test_rolled_back_invalidation(self):
+        # Test that a rolled back transaction doesn't bump
+        cache.invalidate('things')
+
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                cache.invalidate('things')
+                raise ValueError
+
+        self.assertEqual(cache.generation('things'), 1)
@@ -0,0 +1,158 @@
+import os
+import signal
+import tempfile
+from io import StringIO
+from unittest.mock import call, patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.utils import OperationalError
+from django.test import TestCase, override_settings
+
+from core.management.commands.bench_server import bench_host
+from core.models import ValidationToken
+
+
+PROBE = 'core.management.commands.wait_for_db.Command._probe'
+
+
+class WaitForDbCommandTests(TestCase):
+
+    def test_wait_for_db_ready(self):
+        # Test waiting for db when db is available
+        with patch(PROBE) as probe:
+            call_command('wait_for_db', stdout=StringIO())
+
+        self.assertEqual(probe.call_count, 1)
+
+    @patch('time.sleep', return_value=None)
+    def test_wait_for_db_backoff(self, sleep):
+        # Test that the retry delay doubles after each failed probe
+        with patch(PROBE) as probe:
+            probe.side_effect = [OperationalError] * 3 + [None]
+            call_command(
+                'wait_for_db', initial_delay=0.5, max_delay=1.5,
+                stdout=StringIO()
+            )
+
+        self.assertEqual(probe.call_count, 4)
+        delays = [call[0][0] for call in sleep.call_args_list]
+        self.assertEqual(delays, [0.5, 1.0, 1.5])
+
+    @patch('time.sleep', return_value=None)
+    def test_wait_for_db_timeout(self, sleep):
+        # Test that the command gives up once the timeout is reached
+        with patch(PROBE, side_effect=OperationalError):
+            with self.assertRaises(CommandError):
+                call_command('wait_for_db', timeout=0, stdout=StringIO())
+
+    def test_migrate_skipped_when_up_to_date(self):
+        # Test that migrate is not run when nothing is pending
+        out = StringIO()
+        with patch('core.management.commands.wait_for_db.call_command') \
+                as migrate:
+            call_command('wait_for_db', migrate=True, stdout=out)
+
+        migrate.assert_not_called()
+        self.assertIn('skipping migrate', out.getvalue())
+
+    def test_migrate_runs_when_pending(self):
+        # Test that pending migrations are applied
+        pending = 'core.management.commands.wait_for_db.' \
+            'Command._pending_migrations'
+        with patch(pending, return_value=[('core', False)]), \
+                patch('core.management.commands.wait_for_db.call_command') \
+                as migrate:
+            call_command('wait_for_db', migrate=True, stdout=StringIO())
+
+        migrate.assert_called_once_with(
+            'migrate', database='default', interactive=False)
+
+
+class PurgeValidationTokensCommandTests(TestCase):
+
+    def test_purge_in_batches(self):
+        # Test that every legacy row is deleted, a batch at a time
+        for i in range(5):
+            ValidationToken.objects.create(user_email='a@b.lt', token=str(i))
+        out = StringIO()
+
+        call_command('purge_validation_tokens', batch_size=2, stdout=out)
+
+        self.assertFalse(ValidationToken.objects.exists())
+        self.assertIn('Deleted 5', out.getvalue())
+
+
+RELOAD = 'core.management.commands.reload_server'
+
+
+@patch(f'{RELOAD}.time.sleep', return_value=None)
+@patch(f'{RELOAD}.os.kill')
+class ReloadServerCommandTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.pidfile = os.path.join(directory.name, 'gunicorn.pid')
+
+    def write_pid(self, path, pid):
+        with open(path, 'w') as pidfile:
+            pidfile.write(f'{pid}\n')
+
+    def test_reload(self, kill, sleep):
+        # Test that the old master is stopped once the new one is up
+        self.write_pid(self.pidfile, 100)
+        self.write_pid(f'{self.pidfile}.2', 200)
+        out = StringIO()
+
+        call_command('reload_server', pidfile=self.pidfile, stdout=out)
+
+        self.assertEqual(kill.call_args_list, [
+            call(100, signal.SIGUSR2), call(100, signal.SIGTERM)])
+        self.assertIn('new master 200', out.getvalue())
+
+    def test_missing_or_invalid_pidfile(self, kill, sleep):
+        # Test that nothing is signalled without a readable master pid
+        with self.assertRaises(CommandError):
+            call_command('reload_server', pidfile=self.pidfile,
+                         stdout=StringIO())
+        self.write_pid(self.pidfile, 'junk')
+        with self.assertRaises(CommandError):
+            call_command('reload_server', pidfile=self.pidfile,
+                         stdout=StringIO())
+
+        kill.assert_not_called()
+
+    def test_refuses_pid_one(self, kill, sleep):
+        # Test that a master running as PID 1 is not reloaded
+        self.write_pid(self.pidfile, 1)
+
+        with self.assertRaises(CommandError):
+            call_command('reload_server', pidfile=self.pidfile,
+                         stdout=StringIO())
+
+        kill.assert_not_called()
+
+    def test_timeout_keeps_old_master(self, kill, sleep):
+        # Test that the old master keeps running when no new one starts
+        self.write_pid(self.pidfile, 100)
+
+        with patch(f'{RELOAD}.time.monotonic', side_effect=[0, 1, 2, 3]):
+            with self.assertRaises(CommandError):
+                call_command('reload_server', pidfile=self.pidfile,
+                             timeout=1.5, stdout=StringIO())
+
+        self.assertEqual(kill.call_args_list, [call(100, signal.SIGUSR2)])
+
+
+class BenchServerCommandTests(TestCase):
+
+    @override_settings(ALLOWED_HOSTS=['*', '.example.com', 'api'])
+    def test_bench_host_from_allowed_hosts(self):
+        # Test that the benchmark sends the first concrete allowed host
+        self.assertEqual(bench_host(), 'example.com')
+
+    @override_settings(ALLOWED_HOSTS=[])
+    def test_bench_host_default(self):
+        # Test that the benchmark falls back to localhost
+        self.assertEqual(bench_host(), 'localhost')
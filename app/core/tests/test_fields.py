@@ -0,0 +1,55 @@
+from django.test import TestCase
+from rest_framework import serializers
+
+from core.fields import BulkPrimaryKeyRelatedField
+from core.models import HashTag
+
+
+class TagsSerializer(serializers.Serializer):
+    tags = BulkPrimaryKeyRelatedField(
+        many=True, queryset=HashTag.objects.all())
+
+
+class BulkPrimaryKeyRelatedFieldTests(TestCase):
+
+    def setUp(self):
+        self.tags = [
+            HashTag.objects.create(name=f'tag{i}') for i in range(30)]
+
+    def test_one_query_for_all_ids(self):
+        # Test that every id is fetched with a single query, in order
+        ids = [tag.id for tag in reversed(self.tags)]
+        serializer = TagsSerializer(data={'tags': ids + [str(ids[0])]})
+
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid())
+
+        self.assertEqual(
+            serializer.validated_data['tags'],
+            list(reversed(self.tags)) + [self.tags[-1]]
+        )
+
+    def test_missing_ids_reported_together(self):
+        # Test that the error lists every unknown id
+        serializer = TagsSerializer(
+            data={'tags': [self.tags[0].id, 9998, 9999]})
+
+        self.assertFalse(serializer.is_valid())
+        message = str(serializer.errors['tags'][0])
+        self.assertIn('9998', message)
+        self.assertIn('9999', message)
+
+    def test_invalid_values(self):
+        # Test that non pk values and non lists are refused
+        for data in ({'tags': ['abc']}, {'tags': [True]}, {'tags': '1'}):
+            serializer = TagsSerializer(data=data)
+
+            self.assertFalse(serializer.is_valid())
+            self.assertIn('tags', serializer.errors)
+
+    def test_empty_list(self):
+        # Test that an empty list needs no query
+        serializer = TagsSerializer(data={'tags': []})
+
+        with self.assertNumQueries(0):
+            self.assertTrue(serializer.is_valid())
@@ -0,0 +1,103 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import HashTag, Provider, ProviderService, Review, \
+    ReviewCategory
+
+
+REVIEWS_URL = '/api/review/reviews/'
+PROVIDERS_URL = '/api/provider/providers/'
+
+
+class FilterTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass')
+        self.client = APIClient()
+        self.tags = [HashTag.objects.create(name=f'tag{i}') for i in range(3)]
+
+    def sample_review(self, tags=(), **params):
+        review = Review.objects.create(
+            title='Review', description='Text', user=self.user, **params)
+        review.tags.add(*tags)
+        return review
+
+    def ids(self, url, params):
+        res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return sorted(item['id'] for item in res.data)
+
+    def test_match_any_and_all(self):
+        # Test OR and AND semantics without duplicate rows
+        both = self.sample_review(self.tags[:2])
+        first = self.sample_review(self.tags[:1])
+        self.sample_review(self.tags[2:])
+        tag_ids = f'{self.tags[0].id},{self.tags[1].id}'
+
+        self.assertEqual(
+            self.ids(REVIEWS_URL, {'tags': tag_ids}), [both.id, first.id])
+        self.assertEqual(
+            self.ids(REVIEWS_URL, {'tags': tag_ids, 'match': 'all'}),
+            [both.id]
+        )
+
+    def test_tags_and_categories_combined(self):
+        # Test that related filters on two tables are ANDed
+        category = ReviewCategory.objects.create(name='Category')
+        review = self.sample_review(self.tags[:1])
+        review.categories.add(category)
+        self.sample_review(self.tags[:1])
+
+        self.assertEqual(self.ids(REVIEWS_URL, {
+            'tags': self.tags[0].id, 'categories': category.id
+        }), [review.id])
+
+    def test_rating_provider_and_service(self):
+        # Test range and exact filters
+        provider = Provider.objects.create(
+            title='Provider', description='Text', admin_user=self.user)
+        service = ProviderService.objects.create(
+            title='Service', description='Text', provider=provider)
+        good = self.sample_review(rating=5, provider=provider)
+        self.sample_review(rating=2, provider=provider)
+        serviced = self.sample_review(rating=4, service=service)
+
+        self.assertEqual(self.ids(REVIEWS_URL, {'rating_min': 4}),
+                         [good.id, serviced.id])
+        self.assertEqual(self.ids(REVIEWS_URL, {
+            'rating_min': 4, 'provider': provider.id}), [good.id])
+        self.assertEqual(
+            self.ids(REVIEWS_URL, {'service': service.id}), [serviced.id])
+        self.assertEqual(
+            self.ids(REVIEWS_URL, {'date_to': date.today().isoformat()}),
+            sorted(Review.objects.values_list('id', flat=True))
+        )
+
+    def test_providers_by_services(self):
+        # Test that providers with several matching services appear once
+        provider = Provider.objects.create(
+            title='Provider', description='Text', admin_user=self.user)
+        services = [
+            ProviderService.objects.create(
+                title=f'Service {i}', description='Text', provider=provider)
+            for i in range(2)
+        ]
+        Provider.objects.create(
+            title='Other', description='Text', admin_user=self.user)
+
+        self.assertEqual(self.ids(PROVIDERS_URL, {
+            'services': ','.join(str(service.id) for service in services)
+        }), [provider.id])
+
+    def test_invalid_values(self):
+        # Test that malformed filters are a client error
+        for params in ({'tags': 'a'}, {'match': 'some'},
+                       {'date_to': 'soon'}, {'rating_max': 'x'}):
+            res = self.client.get(REVIEWS_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
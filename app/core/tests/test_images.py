@@ -0,0 +1,87 @@
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Page
+from page.serializers import PageImageSerializer
+from provider.serializers import ProviderImageSerializer
+
+
+def sample_image(size, image_format='PNG', suffix='.png'):
+    with tempfile.TemporaryFile() as tmp:
+        Image.new('RGB', size).save(tmp, format=image_format)
+        tmp.seek(0)
+        return SimpleUploadedFile(f'upload{suffix}', tmp.read())
+
+
+class ImageUploadFieldTests(TestCase):
+
+    def validate(self, upload, serializer_class=PageImageSerializer):
+        serializer = serializer_class(data={'image': upload})
+        return serializer.is_valid(), serializer
+
+    def test_small_image_kept(self):
+        # Test that images within the limits pass unchanged
+        upload = sample_image((20, 10))
+        valid, serializer = self.validate(upload)
+
+        self.assertTrue(valid)
+        self.assertIs(serializer.validated_data['image'], upload)
+
+    @override_settings(IMAGE_UPLOAD_MAX_DIMENSION=50)
+    def test_large_image_downscaled(self):
+        # Test that images over the maximum dimension are shrunk
+        valid, serializer = self.validate(
+            sample_image((200, 100), 'JPEG', '.jpg'))
+
+        self.assertTrue(valid)
+        image = Image.open(serializer.validated_data['image'])
+        self.assertEqual(image.size, (50, 25))
+        self.assertEqual(image.format, 'JPEG')
+
+    @override_settings(IMAGE_UPLOAD_MAX_PIXELS=100 * 100)
+    def test_too_many_pixels_rejected(self):
+        # Test that dimensions from the header are checked
+        valid, serializer = self.validate(sample_image((101, 100)))
+
+        self.assertFalse(valid)
+        self.assertIn('image', serializer.errors)
+
+    @override_settings(IMAGE_UPLOAD_MAX_BYTES={
+        'default': 10 ** 6, 'core.provider': 10})
+    def test_per_model_byte_limit(self):
+        # Test that the byte limit is looked up for the serializer model
+        self.assertTrue(self.validate(sample_image((10, 10)))[0])
+        valid, serializer = self.validate(
+            sample_image((10, 10)), ProviderImageSerializer)
+
+        self.assertFalse(valid)
+        self.assertIn('too large', str(serializer.errors['image'][0]))
+
+    def test_non_image_rejected(self):
+        # Test that files Pillow can't identify are refused
+        valid, _ = self.validate(
+            SimpleUploadedFile('upload.png', b'not an image'))
+
+        self.assertFalse(valid)
+
+    @override_settings(UPLOAD_MAX_BYTES=100)
+    def test_upload_handler_stops_large_files(self):
+        # Test that the upload is cut off before it is fully read
+        user = get_user_model().objects.create_user(
+            'admin@gmail.com', 'testpass', is_staff=True)
+        page = Page.objects.create(title='Page', text='Text')
+        client = APIClient()
+        client.force_authenticate(user)
+
+        res = client.post(
+            f'/api/page/pages/{page.id}/upload-image/',
+            {'image': sample_image((100, 100))}, format='multipart'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from core import jobs
+from core.models import Job
+
+
+CALLS = []
+
+
+def sample_task(value):
+    # Task used by the tests below
+    CALLS.append(value)
+
+
+def failing_task():
+    raise ValueError('Broken task')
+
+
+class JobQueueTests(TestCase):
+
+    def setUp(self):
+        CALLS.clear()
+
+    def test_enqueue_stores_dotted_task_name(self):
+        # Test that callables are stored by their import path
+        job = jobs.enqueue(sample_task, args=[1])
+
+        self.assertEqual(job.task, 'core.tests.test_jobs.sample_task')
+        self.assertEqual(job.status, Job.STATUS_QUEUED)
+
+    def test_claim_orders_by_priority(self):
+        # Test that higher priority jobs are claimed first
+        low = jobs.enqueue(sample_task, args=[1])
+        high = jobs.enqueue(sample_task, args=[2], priority=5)
+
+        claimed = jobs.claim(2)
+
+        self.assertEqual([job.id for job in claimed], [high.id, low.id])
+        low.refresh_from_db()
+        self.assertEqual(low.status, Job.STATUS_RUNNING)
+        self.assertEqual(low.attempts, 1)
+        self.assertIsNotNone(low.locked_until)
+
+    def test_delayed_job_not_claimed(self):
+        # Test that jobs scheduled in the future are not claimed yet
+        jobs.enqueue(sample_task, args=[1], delay=60)
+
+        self.assertEqual(jobs.claim(1), [])
+
+    def test_expired_lease_is_reclaimed(self):
+        # Test that a job whose visibility timeout passed is claimed again
+        job = jobs.enqueue(sample_task, args=[1])
+        jobs.claim(1)
+        Job.objects.filter(id=job.id).update(
+            locked_until=timezone.now() - timedelta(seconds=1))
+
+        claimed = jobs.claim(1)
+
+        self.assertEqual(claimed[0].id, job.id)
+        self.assertEqual(claimed[0].attempts, 2)
+
+    def test_expired_last_attempt_fails(self):
+        # Test that a job whose worker died on the last attempt is failed
+        # instead of being reclaimed
+        job = jobs.enqueue(sample_task, max_attempts=1)
+        jobs.claim(1)
+        Job.objects.filter(id=job.id).update(
+            locked_until=timezone.now() - timedelta(seconds=1))
+
+        self.assertEqual(jobs.claim(1), [])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertIsNotNone(job.finished)
+
+    def test_stale_lease_cannot_finish(self):
+        # Test that a worker whose lease was reclaimed can't complete or
+        # fail the new owner's run
+        job = jobs.enqueue(sample_task)
+        stale = jobs.claim(1)[0]
+        Job.objects.filter(id=job.id).update(
+            locked_until=timezone.now() - timedelta(seconds=1))
+        jobs.claim(1)
+
+        jobs.complete(stale)
+        jobs.fail(stale, 'Late error')
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_RUNNING)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(job.last_error, '')
+
+    def test_failed_job_is_retried_then_failed(self):
+        # Test that failures are retried until max_attempts is reached
+        job = jobs.enqueue(failing_task, max_attempts=2)
+
+        jobs.run_inline(jobs.claim(1)[0], retry_delay=0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_QUEUED)
+        self.assertIn('Broken task', job.last_error)
+
+        jobs.run_inline(jobs.claim(1)[0], retry_delay=0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+
+    def test_run_worker_inline_burst(self):
+        # Test that the worker drains the queue and exits
+        jobs.enqueue(sample_task, args=['a'])
+        jobs.enqueue(sample_task, args=['b'], priority=1)
+
+        call_command(
+            'run_worker', processes=0, burst=True, stdout=StringIO())
+
+        self.assertEqual(CALLS, ['b', 'a'])
+        self.assertEqual(
+            Job.objects.filter(status=Job.STATUS_DONE).count(), 2)
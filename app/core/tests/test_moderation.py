@@ -0,0 +1,108 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from core import jobs, moderation
+from core.models import Job, ModerationItem, Review
+
+
+def sample_review(user, description='Great service, quick and friendly'):
+    return Review.objects.create(
+        title='Review', description=description, user=user)
+
+
+class ModerationQueueTests(TransactionTestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass')
+
+    def scoring_jobs(self):
+        return Job.objects.filter(
+            task=jobs.task_name(moderation.score_pending)).count()
+
+    def test_new_review_queued_once(self):
+        # Test that reviews are queued with a single scoring job
+        sample_review(self.user)
+        sample_review(self.user, 'Another text')
+
+        self.assertEqual(ModerationItem.objects.count(), 2)
+        self.assertEqual(self.scoring_jobs(), 1)
+
+    def test_job_queued_on_commit(self):
+        # Test that the scoring job waits for the review's transaction and
+        # is not queued when it rolls back
+        with transaction.atomic():
+            sample_review(self.user)
+            self.assertEqual(self.scoring_jobs(), 0)
+        self.assertEqual(self.scoring_jobs(), 1)
+        Job.objects.all().delete()
+
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                sample_review(self.user)
+                raise ValueError
+        self.assertEqual(self.scoring_jobs(), 0)
+
+
+@override_settings(MODERATION_BLOCKLIST=['scam'])
+class ModerationTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass')
+
+    def test_clean_review_auto_confirmed(self):
+        # Test that low risk reviews are confirmed without an admin
+        review = sample_review(self.user)
+
+        self.assertEqual(moderation.score_pending(), 1)
+
+        review.refresh_from_db()
+        self.assertTrue(review.is_confirmed)
+        self.assertTrue(review.is_auto_confirmed)
+        item = ModerationItem.objects.get(object_id=review.id)
+        self.assertEqual(item.status, ModerationItem.STATUS_CONFIRMED)
+
+    def test_blocked_words_pending(self):
+        # Test that blocklisted words send the review to the queue
+        review = sample_review(self.user, 'This is a SCAM, avoid')
+        moderation.score_pending()
+
+        review.refresh_from_db()
+        self.assertFalse(review.is_confirmed)
+        self.assertIn('Blocked words', review.confirmation_text)
+        item = ModerationItem.objects.get(object_id=review.id)
+        self.assertEqual(item.status, ModerationItem.STATUS_PENDING)
+
+    def test_duplicates_detected(self):
+        # Test that the same text posted twice is flagged
+        first = sample_review(self.user, 'Copied text about the provider')
+        moderation.score_pending()
+        second = sample_review(self.user, 'Copied text about the provider!')
+        moderation.score_pending()
+
+        second.refresh_from_db()
+        self.assertIn('Duplicate text', second.confirmation_text)
+        first.refresh_from_db()
+        self.assertTrue(first.is_confirmed)
+
+    @override_settings(MODERATION_RATE_LIMIT=2)
+    def test_posting_rate(self):
+        # Test that authors over the rate limit are flagged
+        for number in range(3):
+            sample_review(self.user, f'Review number {number} text')
+        moderation.score_pending()
+
+        self.assertEqual(
+            ModerationItem.objects.filter(
+                status=ModerationItem.STATUS_PENDING).count(),
+            3
+        )
+
+    def test_fingerprint_ignores_case_and_punctuation(self):
+        # Test that shingles are built from normalized words
+        self.assertEqual(
+            moderation.fingerprint('Hello, World! Nice place here'),
+            moderation.fingerprint('hello world nice place here')
+        )
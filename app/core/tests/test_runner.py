@@ -0,0 +1,45 @@
+import unittest
+
+from django.test import SimpleTestCase
+
+from core.runner import BalancedParallelTestSuite
+
+
+def sample_suite():
+    # Build a suite of two test cases without exposing them to discovery
+    class FastCase(unittest.TestCase):
+        def test_one(self):
+            pass
+
+    class SlowCase(unittest.TestCase):
+        def test_one(self):
+            pass
+
+        def test_two(self):
+            pass
+
+    loader = unittest.TestLoader()
+    return unittest.TestSuite([
+        loader.loadTestsFromTestCase(FastCase),
+        loader.loadTestsFromTestCase(SlowCase),
+    ])
+
+
+class BalancedParallelTestSuiteTests(SimpleTestCase):
+
+    def test_slowest_cases_dispatched_first(self):
+        # Test that test cases are ordered by recorded duration
+        suite = sample_suite()
+        slow_id = list(suite)[1]._tests[0].id()
+        suite = BalancedParallelTestSuite(
+            suite, processes=2, durations={slow_id: 5.0})
+
+        first = [test.id() for test in suite.subsuites[0]]
+
+        self.assertIn(slow_id, first)
+
+    def test_unknown_durations_use_test_count(self):
+        # Test that cases without history are weighted by their size
+        suite = BalancedParallelTestSuite(sample_suite(), processes=2)
+
+        self.assertEqual(len(list(suite.subsuites[0])), 2)
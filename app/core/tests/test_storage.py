@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core import models
+
+
+def sample_provider(**params):
+    user = get_user_model().objects.create_user('test@gmail.com', 'testpass')
+    defaults = {'title': 'Provider', 'description': 'Text', 'admin_user': user}
+    defaults.update(params)
+    return models.Provider.objects.create(**defaults)
+
+
+class ContentAddressedStorageTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings = override_settings(MEDIA_ROOT=self.media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def refs(self, name):
+        return models.StoredFile.objects.get(name=name).ref_count
+
+    def test_same_content_stored_once(self):
+        # Test that identical uploads share one digest named file
+        first = default_storage.save('logo.PNG', ContentFile(b'logo'))
+        second = default_storage.save('other.png', ContentFile(b'logo'))
+
+        self.assertEqual(first, second)
+        self.assertRegex(first, r'^uploads/[0-9a-f]{2}/[0-9a-f]{64}\.png$')
+        self.assertEqual(
+            os.listdir(os.path.dirname(default_storage.path(first))),
+            [os.path.basename(first)]
+        )
+
+    def test_reference_counting(self):
+        # Test that saving and deleting objects keeps the counts in sync
+        provider = sample_provider()
+        provider.image.save('a.jpg', ContentFile(b'image'))
+        name = provider.image.name
+        page = models.Page.objects.create(title='Page', text='Text')
+        page.image.save('b.jpg', ContentFile(b'image'))
+
+        self.assertEqual(page.image.name, name)
+        self.assertEqual(self.refs(name), 2)
+
+        provider = models.Provider.objects.get(pk=provider.pk)
+        provider.image.save('c.jpg', ContentFile(b'other image'))
+        self.assertEqual(self.refs(name), 1)
+        self.assertEqual(self.refs(provider.image.name), 1)
+
+        page.delete()
+        self.assertEqual(self.refs(name), 0)
+        self.assertTrue(default_storage.exists(name))
+
+    def test_gc_removes_orphans(self):
+        # Test that only unreferenced files are deleted
+        provider = sample_provider()
+        provider.image.save('a.jpg', ContentFile(b'kept'))
+        orphan = default_storage.save('b.jpg', ContentFile(b'orphan'))
+
+        call_command('gc_uploads', grace_hours=0, stdout=StringIO())
+
+        self.assertTrue(default_storage.exists(provider.image.name))
+        self.assertFalse(default_storage.exists(orphan))
+
+    def test_gc_recount(self):
+        # Test that recount restores counts changed behind the signals
+        provider = sample_provider()
+        provider.image.save('a.jpg', ContentFile(b'kept'))
+        name = provider.image.name
+        models.StoredFile.objects.filter(name=name).update(ref_count=0)
+
+        call_command(
+            'gc_uploads', grace_hours=0, recount=True, stdout=StringIO())
+
+        self.assertEqual(self.refs(name), 1)
+        self.assertTrue(default_storage.exists(name))
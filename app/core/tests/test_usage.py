@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import HashTag, Page, PageCategory, Review, ReviewCategory
+
+
+TAGS_URL = reverse('review:hashtag-list')
+
+
+class UsageCountTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass')
+        self.tags = [HashTag.objects.create(name=f'tag{i}') for i in range(3)]
+
+    def sample_review(self):
+        return Review.objects.create(
+            title='Review', description='Text', user=self.user)
+
+    def counts(self, model=HashTag):
+        return list(
+            model.objects.order_by('id').values_list('usage_count', flat=True))
+
+    def test_add_remove_clear(self):
+        # Test that m2m changes from the review side move the counts
+        review = self.sample_review()
+        review.tags.add(*self.tags)
+        self.sample_review().tags.add(self.tags[0])
+        self.assertEqual(self.counts(), [2, 1, 1])
+
+        review.tags.remove(self.tags[1])
+        self.assertEqual(self.counts(), [2, 0, 1])
+        review.tags.clear()
+        self.assertEqual(self.counts(), [1, 0, 0])
+
+    def test_reverse_side(self):
+        # Test that changes from the tag side count once per review
+        reviews = [self.sample_review() for _ in range(3)]
+        self.tags[0].review_set.add(*reviews)
+        self.assertEqual(self.counts(), [3, 0, 0])
+
+        self.tags[0].review_set.remove(reviews[0])
+        self.tags[1].review_set.set(reviews[1:])
+        self.assertEqual(self.counts(), [2, 2, 0])
+        self.tags[1].review_set.clear()
+        self.assertEqual(self.counts(), [2, 0, 0])
+
+    def test_remove_non_member(self):
+        # Test that removing tags a review doesn't have changes nothing
+        first, second = self.sample_review(), self.sample_review()
+        first.tags.add(self.tags[0])
+
+        second.tags.remove(self.tags[0])
+        second.tags.remove(self.tags[0], self.tags[1])
+        self.tags[0].review_set.remove(second)
+        self.assertEqual(self.counts(), [1, 0, 0])
+
+        self.tags[0].review_set.remove(first, second)
+        self.assertEqual(self.counts(), [0, 0, 0])
+
+    def test_deleted_source_released(self):
+        # Test that deleting a review or page releases its rows
+        category = ReviewCategory.objects.create(name='Category')
+        review = self.sample_review()
+        review.tags.add(self.tags[0])
+        review.categories.add(category)
+        page_category = PageCategory.objects.create(name='Category')
+        page = Page.objects.create(title='Page', text='Text')
+        page.categories.add(page_category)
+
+        review.delete()
+        page.delete()
+
+        self.assertEqual(self.counts(), [0, 0, 0])
+        self.assertEqual(self.counts(ReviewCategory), [0])
+        self.assertEqual(self.counts(PageCategory), [0])
+
+    def test_tag_list_filters_on_counts(self):
+        # Test that assigned_only and popular ordering use the counts
+        for _ in range(2):
+            self.sample_review().tags.add(self.tags[2])
+        self.sample_review().tags.add(self.tags[0])
+
+        res = self.client.get(
+            TAGS_URL, {'assigned_only': 1, 'ordering': 'popular'})
+
+        self.assertEqual(
+            [tag['name'] for tag in res.data], ['tag2', 'tag0'])
+        self.assertEqual(res.data[0]['usage_count'], 2)
@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from core.models import Provider, StoredFile
+
+
+CONTENT = b'0123456789' * 10
+IMMUTABLE_NAME = '6f1ed002-ab5d-42e0-868f-9e0e67a5bc1c.jpg'
+
+
+class ServeMediaTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings = override_settings(
+            MEDIA_ROOT=self.media_root, MEDIA_ACCEL_REDIRECT='')
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        os.makedirs(os.path.join(self.media_root, 'uploads'))
+        for name in (IMMUTABLE_NAME, 'logo.png', '.secret'):
+            with open(os.path.join(self.media_root, 'uploads', name),
+                      'wb') as upload:
+                upload.write(CONTENT)
+        for name in (IMMUTABLE_NAME, 'logo.png'):
+            StoredFile.objects.create(name=f'uploads/{name}', ref_count=1)
+
+    def test_serve_file(self):
+        # Test that an upload is streamed with validators and cache headers
+        res = self.client.get(f'/media/uploads/{IMMUTABLE_NAME}')
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(b''.join(res.streaming_content), CONTENT)
+        self.assertEqual(res['Content-Type'], 'image/jpeg')
+        self.assertIn('ETag', res)
+        self.assertIn('immutable', res['Cache-Control'])
+        self.assertIn('public', res['Cache-Control'])
+
+    def test_mutable_name_short_cache(self):
+        # Test that names not derived from uuid or digest are not immutable
+        res = self.client.get('/media/uploads/logo.png')
+
+        self.assertNotIn('immutable', res['Cache-Control'])
+
+    def test_hidden_and_escaping_paths(self):
+        # Test that hidden files and paths outside MEDIA_ROOT are refused
+        for path in ('uploads/.secret', '../etc/passwd', 'uploads/missing',
+                     'uploads'):
+            res = self.client.get(f'/media/{path}')
+            self.assertEqual(res.status_code, 404, path)
+
+    def test_unreferenced_files_hidden(self):
+        # Test that files no object references are not served, except to
+        # staff
+        for name in ('orphan.jpg', 'released.jpg', 'legacy.jpg'):
+            with open(os.path.join(self.media_root, 'uploads', name),
+                      'wb') as upload:
+                upload.write(CONTENT)
+        StoredFile.objects.create(name='uploads/released.jpg', ref_count=0)
+        user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass')
+        Provider.objects.create(
+            title='Provider', description='Lorem ipsum', admin_user=user,
+            image='uploads/legacy.jpg')
+
+        for name in ('orphan.jpg', 'released.jpg'):
+            res = self.client.get(f'/media/uploads/{name}')
+            self.assertEqual(res.status_code, 404, name)
+        res = self.client.get('/media/uploads/legacy.jpg')
+        self.assertEqual(res.status_code, 200)
+
+        user.is_staff = True
+        user.save()
+        self.client.force_login(user)
+        res = self.client.get('/media/uploads/orphan.jpg')
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('private', res['Cache-Control'])
+        self.assertNotIn('public', res['Cache-Control'])
+        res = self.client.get(
+            '/media/uploads/orphan.jpg', HTTP_IF_NONE_MATCH=res['ETag'])
+        self.assertEqual(res.status_code, 304)
+        self.assertIn('private', res['Cache-Control'])
+
+    def test_not_modified(self):
+        # Test that a matching ETag answers 304 without a body
+        url = f'/media/uploads/{IMMUTABLE_NAME}'
+        etag = self.client.get(url)['ETag']
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, 304)
+
+    def test_range_request(self):
+        # Test that a single byte range is answered with 206
+        url = f'/media/uploads/{IMMUTABLE_NAME}'
+
+        res = self.client.get(url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(res.status_code, 206)
+        self.assertEqual(b''.join(res.streaming_content), CONTENT[10:20])
+        self.assertEqual(res['Content-Range'], 'bytes 10-19/100')
+        self.assertEqual(res['Content-Length'], '10')
+
+        res = self.client.get(url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(b''.join(res.streaming_content), CONTENT[-5:])
+
+        res = self.client.get(url, HTTP_RANGE='bytes=200-')
+        self.assertEqual(res.status_code, 416)
+
+    def test_accel_redirect(self):
+        # Test that the transfer is delegated to the proxy when configured
+        with self.settings(MEDIA_ACCEL_REDIRECT='/protected-media/'):
+            res = self.client.get(f'/media/uploads/{IMMUTABLE_NAME}')
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            res['X-Accel-Redirect'],
+            f'/protected-media/uploads/{IMMUTABLE_NAME}'
+        )
+        self.assertEqual(res.content, b'')
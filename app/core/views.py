@@ -0,0 +1,203 @@
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, \
+    HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
+from core.models import StoredFile
+from core.signals import IMAGE_FIELDS
+
+
+# Uploads are stored under a uuid4 or content digest name and never
+# rewritten, browsers can keep them for as long as they like
+IMMUTABLE_NAME = re.compile(
+    r'^(?:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
+    r'|[0-9a-f]{32,64})\.[0-9A-Za-z]+$'
+)
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+DEFAULT_MAX_AGE = 60 * 60
+
+RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    # File wrapper limited to one byte range.
+    #
+    # Exposes fileno() so gunicorn's wsgi.file_wrapper still sends it with
+    # os.sendfile from the current offset, bounded by Content-Length.
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    # Return (start, end) for a single satisfiable byte range, None when
+    # the header should be ignored and ValueError when it can't be served
+    match = RANGE_HEADER.match(header.strip())
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if not first:
+        length = min(int(last), size)
+        if not length:
+            raise ValueError('Empty suffix range')
+        return size - length, size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start > end:
+        raise ValueError('Range not satisfiable')
+    return start, end
+
+
+def media_path(path):
+    # Resolve a media path, refusing anything outside MEDIA_ROOT and
+    # hidden files or directories
+    if any(part.startswith('.') for part in path.split('/')):
+        raise Http404('Not found')
+    try:
+        fullpath = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404('Not found')
+    try:
+        file_stat = os.stat(fullpath)
+    except OSError:
+        raise Http404('Not found')
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404('Not found')
+    return fullpath, file_stat
+
+
+def is_published(path):
+    # Whether an object the API exposes references the file. Content
+    # addressed uploads are found by their unique StoredFile name, legacy
+    # ones on the image columns.
+    ref_count = StoredFile.objects.filter(name=path) \
+        .values_list('ref_count', flat=True).first()
+    if ref_count is not None:
+        return ref_count > 0
+    return any(
+        model.objects.filter(**{field: path}).exists()
+        for model, field in IMAGE_FIELDS
+    )
+
+
+@require_safe
+def serve_media(request, path):
+    # Serve an uploaded file.
+    #
+    # With MEDIA_ACCEL_REDIRECT set only the headers are produced here and
+    # nginx sends the body from an internal location, for example:
+    #
+    #     location /protected-media/ {
+    #         internal;
+    #         alias /vol/web/media/;
+    #     }
+    #
+    # Without a proxy the file goes out through FileResponse, which the
+    # WSGI server can pass to os.sendfile. Single byte ranges are answered
+    # with 206 either way.
+    #
+    # Only files referenced by a page, provider, service or review are
+    # served, staff users may fetch any file. What only staff may see is
+    # kept out of shared caches.
+    fullpath, file_stat = media_path(path)
+    public = is_published(path)
+    if not public and not request.user.is_staff:
+        raise Http404('Not found')
+    size = file_stat.st_size
+    etag = f'"{file_stat.st_mtime_ns:x}-{size:x}"'
+    last_modified = http_date(file_stat.st_mtime)
+
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        not_modified = etag in if_none_match or if_none_match.strip() == '*'
+    else:
+        not_modified = not was_modified_since(
+            request.META.get('HTTP_IF_MODIFIED_SINCE'),
+            file_stat.st_mtime, size
+        )
+    if not_modified:
+        response = HttpResponseNotModified()
+        return _set_cache_headers(
+            response, path, etag, last_modified, public)
+
+    accel_prefix = settings.MEDIA_ACCEL_REDIRECT
+    byte_range = None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if 'HTTP_RANGE' in request.META and not accel_prefix and \
+            if_range in (None, etag, last_modified):
+        try:
+            byte_range = parse_range(request.META['HTTP_RANGE'], size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    content_type, encoding = mimetypes.guess_type(fullpath)
+    if encoding or not content_type:
+        # Compressed files are sent as is, not decoded by the browser
+        content_type = 'application/octet-stream'
+
+    if accel_prefix:
+        # nginx handles Range and conditional requests for the body
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + \
+            quote(path)
+    elif request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+        response['Content-Length'] = size
+        response['Accept-Ranges'] = 'bytes'
+    elif byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(
+            FileRange(open(fullpath, 'rb'), start, length),
+            status=206, content_type=content_type
+        )
+        response['Content-Length'] = length
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Accept-Ranges'] = 'bytes'
+    else:
+        response = FileResponse(
+            open(fullpath, 'rb'), content_type=content_type)
+        response['Accept-Ranges'] = 'bytes'
+
+    return _set_cache_headers(response, path, etag, last_modified, public)
+
+
+def _set_cache_headers(response, path, etag, last_modified, public):
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    if not public:
+        patch_cache_control(response, private=True, max_age=0)
+    elif IMMUTABLE_NAME.match(os.path.basename(path)):
+        patch_cache_control(
+            response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=DEFAULT_MAX_AGE)
+    return response
@@ -0,0 +1,31 @@
+import json
+
+from django.utils.module_loading import import_string
+
+
+# Entry points for the run_worker process pool. Pool processes are spawned
+# and unpickle these functions before Django is set up, so this module must
+# not import models at load time.
+
+
+def execute(task, args, kwargs):
+    # Resolve and run a task with its JSON encoded arguments
+    func = import_string(task)
+    func(*json.loads(args), **json.loads(kwargs))
+
+
+def init_pool_process():
+    # Load the app registry once per pool process
+    import django
+    django.setup()
+
+
+def execute_in_pool(task, args, kwargs):
+    # Run a task inside a pool process
+    from django.db import close_old_connections
+
+    close_old_connections()
+    try:
+        execute(task, args, kwargs)
+    finally:
+        close_old_connections()
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from core.fields import BulkPrimaryKeyRelatedField
+from core.images import ImageUploadField
 from core.models import Page, PageCategory
 
 
@@ -8,14 +10,14 @@ class PageCategorySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = PageCategory
-        fields = ('id', 'name')
-        read_only_fields = ('id',)
+        fields = ('id', 'name', 'usage_count')
+        read_only_fields = ('id', 'usage_count')
 
 
 class PageSerializer(serializers.ModelSerializer):
     # Serialize a recipe
 
-    categories = serializers.PrimaryKeyRelatedField(
+    categories = BulkPrimaryKeyRelatedField(
         many=True,
         queryset=PageCategory.objects.all()
     )
@@ -40,6 +42,7 @@ class PageDetailSerializer(PageSerializer):
 
 class PageImageSerializer(serializers.ModelSerializer):
     # Serializer for uploading image to page
+    image = ImageUploadField()
 
     class Meta:
         model = Page
@@ -154,6 +154,7 @@ class PrivateAdminCategoryApiTests(TestCase):
 
         res = self.client.get(CATEGORIES_URL, {'assigned_only': 1})
 
+        category1.refresh_from_db()
         serializer1 = PageCategorySerializer(category1)
         serializer2 = PageCategorySerializer(category2)
         self.assertIn(serializer1.data, res.data)
@@ -4,33 +4,37 @@ from rest_framework import viewsets, status
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAdminUser
 
+from core.authentication import SignedTokenAuthentication
 from core.models import Page, PageCategory
 from core.permissions import ReadOnly
 from page import serializers
+from ticket.mixins import ObjectTicketsMixin
 
 
 class CategoryViewSet(viewsets.ModelViewSet):
     # Viewset for page attributes
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, TokenAuthentication)
     permission_classes = (IsAdminUser | ReadOnly,)
     queryset = PageCategory.objects.all()
     serializer_class = serializers.PageCategorySerializer
 
     def get_queryset(self):
-        # Return objects
+        # ?assigned_only=1 and ?ordering=popular read the indexed
+        # usage_count column instead of joining the pages
         assigned_only = bool(
             int(self.request.query_params.get('assigned_only', 0))
         )
         queryset = self.queryset
         if assigned_only:
-            queryset = queryset.filter(page__isnull=False)
+            queryset = queryset.filter(usage_count__gt=0)
+        if self.request.query_params.get('ordering') == 'popular':
+            return queryset.order_by('-usage_count', 'name')
+        return queryset.order_by('-name')
 
-        return queryset.all().order_by('-name').distinct()
 
-
-class PageViewSet(viewsets.ModelViewSet):
+class PageViewSet(ObjectTicketsMixin, viewsets.ModelViewSet):
     # Manage page in the database
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, TokenAuthentication)
     permission_classes = (IsAdminUser | ReadOnly,)
     serializer_class = serializers.PageSerializer
     queryset = Page.objects.all()
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class ProviderConfig(AppConfig):
     name = 'provider'
+
+    def ready(self):
+        from provider.signals import connect_signals
+
+        connect_signals()
@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.db.models import Count
+from django.urls import reverse
+from rest_framework.utils.urls import replace_query_param
+
+from core import cache
+from core.models import ProviderService, Review
+from core.pagination import KeysetPagination
+from provider import serializers
+from review.mixins import REVIEW_SORTS
+from review.serializers import ReviewSerializer
+
+
+# Recent reviews embedded in a profile, the rest are paged from the
+# provider's reviews route
+PROFILE_REVIEWS = 10
+
+
+def profile_cache(provider_id):
+    # core.cache namespace of one provider's profile, invalidated by
+    # provider.signals when the provider, a service or a review changes
+    return f'provider-profile:{provider_id}'
+
+
+def rating_summary(provider):
+    # Review count, average and per rating counts from one grouped query
+    rows = Review.objects.filter(provider=provider).order_by() \
+        .values_list('rating').annotate(count=Count('id'))
+    ratings = dict(rows)
+    count = sum(ratings.values())
+    total = sum(rating * n for rating, n in ratings.items())
+    return {
+        'count': count,
+        'average': round(total / count, 2) if count else None,
+        'ratings': [
+            {'rating': rating, 'count': ratings[rating]}
+            for rating in sorted(ratings, reverse=True)
+        ],
+    }
+
+
+def recent_reviews(provider):
+    # First page of the newest reviews. It is the same for every request,
+    # whatever its query string, and the next link is relative so the
+    # cached document doesn't carry the host of the first caller.
+    paginator = KeysetPagination(REVIEW_SORTS['newest'])
+    rows = list(
+        Review.objects.filter(provider=provider)
+        .prefetch_related('categories', 'tags')
+        .order_by(*paginator.ordering)[:PROFILE_REVIEWS + 1]
+    )
+    next_link = None
+    if len(rows) > PROFILE_REVIEWS:
+        next_link = replace_query_param(
+            reverse('provider:providers-reviews', args=[provider.pk]),
+            paginator.cursor_query_param,
+            paginator.cursor_for(rows[PROFILE_REVIEWS - 1])
+        )
+    return {
+        'next': next_link,
+        'results': ReviewSerializer(rows[:PROFILE_REVIEWS], many=True).data,
+    }
+
+
+def build_profile(provider):
+    # The provider, its services, rating summary and recent reviews, in
+    # one query for each part whatever the number of services and reviews.
+    # Serialized without the request, images get relative URLs.
+    services = ProviderService.objects.filter(provider=provider) \
+        .order_by('title', 'id')
+    return {
+        'provider': serializers.ProviderProfileSerializer(provider).data,
+        'services': serializers.ProfileServiceSerializer(
+            services, many=True).data,
+        'rating': rating_summary(provider),
+        'reviews': recent_reviews(provider),
+    }
+
+
+def get_profile(provider_id, load):
+    # Cached profile, load() fetches the provider on a miss
+    return cache.get_or_compute(
+        profile_cache(provider_id), {},
+        lambda: build_profile(load()),
+        settings.PROVIDER_PROFILE_CACHE_TIMEOUT
+    )
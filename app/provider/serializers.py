@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from core.fields import BulkPrimaryKeyRelatedField
+from core.images import ImageUploadField
 from core.models import Provider, ProviderService
 
 
@@ -22,7 +24,7 @@ class ProviderServiceSerializer(serializers.ModelSerializer):
 class ProviderSerializer(serializers.ModelSerializer):
     # Serialize provider
 
-    services = serializers.PrimaryKeyRelatedField(
+    services = BulkPrimaryKeyRelatedField(
         many=True,
         queryset=ProviderService.objects.all()
     )
@@ -48,8 +50,35 @@ class ProviderDetailSerializer(ProviderSerializer):
     services = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
 
 
+class ProfileServiceSerializer(serializers.ModelSerializer):
+    # Service in a provider profile, without the review id list
+
+    class Meta:
+        model = ProviderService
+        fields = ('id', 'title', 'description', 'image')
+        read_only_fields = fields
+
+
+class ProviderProfileSerializer(serializers.ModelSerializer):
+    # Provider in its profile, services and reviews are listed beside it
+
+    class Meta:
+        model = Provider
+        fields = (
+            'id',
+            'title',
+            'description',
+            'is_active',
+            'is_confirmed',
+            'image',
+            'admin_user'
+        )
+        read_only_fields = fields
+
+
 class ProviderImageSerializer(serializers.ModelSerializer):
     # Serializer for uploading image to provider
+    image = ImageUploadField()
 
     class Meta:
         model = Provider
@@ -59,6 +88,7 @@ class ProviderImageSerializer(serializers.ModelSerializer):
 
 class ProviderServiceImageSerializer(serializers.ModelSerializer):
     # Serializer for uploading image to service
+    image = ImageUploadField()
 
     class Meta:
         model = ProviderService
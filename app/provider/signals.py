@@ -0,0 +1,82 @@
+from django.db.models.signals import m2m_changed, post_delete, post_init, \
+    post_save
+
+from core import cache
+from core.models import Provider, ProviderService, Review
+from provider.profile import profile_cache
+
+
+def _invalidate(provider_ids):
+    for provider_id in set(provider_ids):
+        if provider_id is not None:
+            cache.invalidate(profile_cache(provider_id))
+
+
+def invalidate_provider(sender, instance, **kwargs):
+    if not kwargs.get('raw'):
+        _invalidate([instance.pk])
+
+
+def remember_provider(sender, instance, **kwargs):
+    # Read the raw value, a deferred field isn't loaded for this
+    if 'provider_id' in instance.__dict__:
+        instance._original_provider_id = instance.__dict__['provider_id']
+
+
+def invalidate_related(sender, instance, **kwargs):
+    # A service or review changed, the profiles of the provider it belongs
+    # to and of the one it was moved from are stale
+    if kwargs.get('raw'):
+        return
+    _invalidate([
+        instance.provider_id,
+        getattr(instance, '_original_provider_id', None)
+    ])
+    instance._original_provider_id = instance.provider_id
+
+
+def invalidate_review_relations(sender, instance, action, reverse, pk_set,
+                                **kwargs):
+    # Tags or categories of reviews changed. From the tag or category side
+    # pk_set holds reviews, and a clear touches every review of the object.
+    if not reverse:
+        if action.startswith('post_'):
+            _invalidate([instance.provider_id])
+        return
+    if action == 'pre_clear':
+        reviews = instance.review_set.all()
+    elif action in ('post_add', 'post_remove') and pk_set:
+        reviews = Review.objects.filter(pk__in=pk_set)
+    else:
+        return
+    _invalidate(reviews.values_list('provider_id', flat=True).distinct())
+
+
+def connect_signals():
+    post_save.connect(
+        invalidate_provider, sender=Provider,
+        dispatch_uid='provider_profile_save'
+    )
+    post_delete.connect(
+        invalidate_provider, sender=Provider,
+        dispatch_uid='provider_profile_delete'
+    )
+    for model in (ProviderService, Review):
+        name = model._meta.model_name
+        post_init.connect(
+            remember_provider, sender=model,
+            dispatch_uid=f'provider_profile_{name}_init'
+        )
+        post_save.connect(
+            invalidate_related, sender=model,
+            dispatch_uid=f'provider_profile_{name}_save'
+        )
+        post_delete.connect(
+            invalidate_related, sender=model,
+            dispatch_uid=f'provider_profile_{name}_delete'
+        )
+    for through in (Review.tags.through, Review.categories.through):
+        m2m_changed.connect(
+            invalidate_review_relations, sender=through,
+            dispatch_uid=f'provider_profile_{through._meta.model_name}'
+        )
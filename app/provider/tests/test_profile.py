@@ -0,0 +1,169 @@
+from urllib.parse import parse_qs, urlparse
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import HashTag, Provider, ProviderService, Review
+from provider.profile import PROFILE_REVIEWS
+
+
+def profile_url(provider_id):
+    return reverse('provider:providers-profile', args=[provider_id])
+
+
+def provider_reviews_url(provider_id):
+    return reverse('provider:providers-reviews', args=[provider_id])
+
+
+class ProviderProfileTests(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass')
+        self.provider = Provider.objects.create(
+            title='Provider', description='Lorem ipsum',
+            admin_user=self.user)
+        self.service = ProviderService.objects.create(
+            title='Service', provider=self.provider)
+        self.client = APIClient()
+
+    def sample_review(self, rating, **params):
+        defaults = {'provider': self.provider, 'service': self.service}
+        defaults.update(params)
+        return Review.objects.create(
+            title='Review', description='Text', user=self.user,
+            rating=rating, **defaults)
+
+    def test_profile_document(self):
+        # Test that the profile holds the provider, services, rating
+        # summary and the newest reviews with a link to the next page
+        ProviderService.objects.create(title='Another', provider=self.provider)
+        reviews = [
+            self.sample_review(rating)
+            for rating in [5, 4, 5] * PROFILE_REVIEWS
+        ]
+        self.sample_review(1, provider=None, service=None)
+
+        res = self.client.get(profile_url(self.provider.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['provider']['title'], 'Provider')
+        self.assertEqual(
+            [s['title'] for s in res.data['services']],
+            ['Another', 'Service'])
+        self.assertEqual(res.data['rating'], {
+            'count': 3 * PROFILE_REVIEWS,
+            'average': 4.67,
+            'ratings': [
+                {'rating': 5, 'count': 2 * PROFILE_REVIEWS},
+                {'rating': 4, 'count': PROFILE_REVIEWS},
+            ],
+        })
+        self.assertEqual(
+            [r['id'] for r in res.data['reviews']['results']],
+            [r.id for r in reversed(reviews)][:PROFILE_REVIEWS])
+
+        res = self.client.get(res.data['reviews']['next'])
+        self.assertEqual(
+            res.data['results'][0]['id'],
+            reviews[-PROFILE_REVIEWS - 1].id)
+
+    def test_fixed_queries_then_cached(self):
+        # Test that the query count doesn't grow with the data and a
+        # cached profile only looks up its cache generation
+        for i in range(5):
+            ProviderService.objects.create(
+                title=f'Service {i}', provider=self.provider)
+            review = self.sample_review(i)
+            review.tags.add(HashTag.objects.create(name=f'tag{i}'))
+
+        with self.assertNumQueries(7):
+            res = self.client.get(profile_url(self.provider.id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(1):
+            cached = self.client.get(profile_url(self.provider.id))
+        self.assertEqual(cached.data, res.data)
+
+    def test_changes_invalidate(self):
+        # Test that changing the provider, a service or a review, or the
+        # tags of a review, rebuilds the profile
+        review = self.sample_review(3)
+        tag = HashTag.objects.create(name='tag')
+        url = profile_url(self.provider.id)
+
+        self.client.get(url)
+        self.provider.title = 'Renamed'
+        self.provider.save()
+        self.assertEqual(
+            self.client.get(url).data['provider']['title'], 'Renamed')
+
+        self.service.title = 'Changed'
+        self.service.save()
+        self.assertEqual(
+            self.client.get(url).data['services'][0]['title'], 'Changed')
+
+        self.sample_review(5)
+        self.assertEqual(self.client.get(url).data['rating']['count'], 2)
+
+        tag.review_set.add(review)
+        res = self.client.get(url)
+        self.assertEqual(res.data['reviews']['results'][1]['tags'], [tag.id])
+
+        review.delete()
+        self.assertEqual(self.client.get(url).data['rating']['count'], 1)
+
+    def test_moved_review_invalidates_both(self):
+        # Test that moving a review to another provider, or deleting it
+        # after the move, rebuilds the profiles of both
+        other = Provider.objects.create(
+            title='Other', description='Lorem ipsum', admin_user=self.user)
+        review = self.sample_review(3)
+
+        def counts():
+            return [
+                self.client.get(profile_url(provider.id))
+                .data['rating']['count'] for provider in (self.provider, other)
+            ]
+        self.assertEqual(counts(), [1, 0])
+
+        review = Review.objects.get(pk=review.pk)
+        review.provider = other
+        review.service = None
+        review.save()
+        self.assertEqual(counts(), [0, 1])
+
+        review.provider = self.provider
+        review.delete()
+        self.assertEqual(counts(), [0, 0])
+
+    def test_query_string_ignored(self):
+        # Test that pagination params neither change the cached profile
+        # nor break it, and that its links are relative
+        reviews = [self.sample_review(4) for _ in range(PROFILE_REVIEWS + 2)]
+        url = profile_url(self.provider.id)
+        later = self.client.get(
+            provider_reviews_url(self.provider.id), {'page_size': 2})
+        cursor = parse_qs(urlparse(later.data['next']).query)['cursor'][0]
+
+        res = self.client.get(url, {'cursor': cursor, 'page_size': 1})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.client.get(url, {'cursor': 'junk'}).status_code,
+            status.HTTP_200_OK)
+
+        res = self.client.get(url)
+        self.assertEqual(
+            [r['id'] for r in res.data['reviews']['results']],
+            [r.id for r in reversed(reviews)][:PROFILE_REVIEWS])
+        self.assertTrue(res.data['reviews']['next'].startswith('/api/'))
+
+    def test_missing_provider(self):
+        # Test that an unknown provider is a 404
+        res = self.client.get(profile_url(self.provider.id + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Provider, ProviderService, Review
+
+
+def provider_reviews_url(provider_id):
+    return reverse('provider:providers-reviews', args=[provider_id])
+
+
+def service_reviews_url(service_id):
+    return reverse('provider:services-reviews', args=[service_id])
+
+
+class ObjectReviewsTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass')
+        self.provider = Provider.objects.create(
+            title='Provider', description='Lorem ipsum',
+            admin_user=self.user)
+        self.service = ProviderService.objects.create(
+            title='Service', provider=self.provider)
+        self.client = APIClient()
+
+    def sample_review(self, rating, helpful_count=0, **params):
+        defaults = {'provider': self.provider, 'service': self.service}
+        defaults.update(params)
+        return Review.objects.create(
+            title='Review', description='Text', user=self.user,
+            rating=rating, helpful_count=helpful_count, **defaults)
+
+    def fetch_all(self, url, sort, page_size=2):
+        # Ids of every page of a listing, following the next links
+        ids = []
+        res = self.client.get(url, {'sort': sort, 'page_size': page_size})
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids.extend(review['id'] for review in res.data['results'])
+            if res.data['next'] is None:
+                return ids
+            res = self.client.get(res.data['next'])
+
+    def test_sorts_page_through_ties(self):
+        # Test that every sort pages through equal values without gaps
+        # or repeats
+        reviews = [
+            self.sample_review(rating, helpful)
+            for rating, helpful in ((5, 1), (3, 4), (5, 4), (1, 0), (5, 1))
+        ]
+        self.sample_review(5, provider=None, service=None)
+        url = provider_reviews_url(self.provider.id)
+
+        expected = {
+            'newest': sorted(reviews, key=lambda r: -r.id),
+            'rating_high': sorted(reviews, key=lambda r: (-r.rating, -r.id)),
+            'rating_low': sorted(reviews, key=lambda r: (r.rating, r.id)),
+            'helpful': sorted(
+                reviews, key=lambda r: (-r.helpful_count, -r.id)),
+        }
+        for sort, ordered in expected.items():
+            self.assertEqual(
+                self.fetch_all(url, sort), [r.id for r in ordered], sort)
+
+    def test_service_reviews(self):
+        # Test that a service lists only its own reviews
+        other = ProviderService.objects.create(
+            title='Other', provider=self.provider)
+        review = self.sample_review(4)
+        self.sample_review(5, service=other)
+
+        res = self.client.get(service_reviews_url(self.service.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [r['id'] for r in res.data['results']], [review.id])
+        self.assertIsNone(res.data['previous'])
+
+    def test_invalid_sort(self):
+        # Test that an unknown sort is rejected
+        res = self.client.get(
+            provider_reviews_url(self.provider.id), {'sort': 'oldest'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_cursor(self):
+        # Test that a malformed cursor is a 404 like CursorPagination's
+        url = provider_reviews_url(self.provider.id)
+        for cursor in ('junk', 'WzFd', 'WyJ4IiwgMV0='):
+            res = self.client.get(
+                url, {'sort': 'rating_high', 'cursor': cursor})
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -1,3 +1,4 @@
+from django.http import Http404
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import viewsets, status
@@ -5,15 +6,19 @@ from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.exceptions import PermissionDenied
 
+from core.authentication import SignedTokenAuthentication
+from core.filters import RelatedFilter, apply_filters
 from core.models import Provider, ProviderService
 from core.permissions import ReadOnly, IsCompany
 from core.request_log.mixins import RequestLogViewMixin
-from provider import serializers
+from provider import profile, serializers
+from review.mixins import ObjectReviewsMixin
+from ticket.mixins import ObjectTicketsMixin
 
 
 class ServiceOwnerViewSet(viewsets.ModelViewSet, RequestLogViewMixin):
     # Viewset for editing and creating services for provider
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, TokenAuthentication)
     permission_classes = (IsAuthenticated & IsCompany, )
     queryset = ProviderService.objects.all()
     serializer_class = serializers.ProviderServiceSerializer
@@ -33,12 +38,14 @@ class ServiceOwnerViewSet(viewsets.ModelViewSet, RequestLogViewMixin):
         raise PermissionDenied('You are not part of any provider!')
 
 
-class ServiceViewSet(viewsets.ModelViewSet):
+class ServiceViewSet(ObjectReviewsMixin, ObjectTicketsMixin,
+                     viewsets.ModelViewSet):
     # Viewset for provider service attributes
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, TokenAuthentication)
     permission_classes = (IsAdminUser | ReadOnly,)
     queryset = ProviderService.objects.all()
     serializer_class = serializers.ProviderServiceSerializer
+    review_field = 'service'
 
     def get_queryset(self):
         # Return objects
@@ -48,7 +55,7 @@ class ServiceViewSet(viewsets.ModelViewSet):
 
 class ProviderOwnerViewSet(viewsets.ModelViewSet, RequestLogViewMixin):
     # Viewset for Provider
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, TokenAuthentication)
     permission_classes = (IsAuthenticated & IsCompany,)
     serializer_class = serializers.ProviderSerializer
     queryset = Provider.objects.all()
@@ -116,28 +123,25 @@ class ProviderOwnerViewSet(viewsets.ModelViewSet, RequestLogViewMixin):
         )
 
 
-class ProviderViewSet(viewsets.ModelViewSet, RequestLogViewMixin):
+class ProviderViewSet(ObjectReviewsMixin, ObjectTicketsMixin,
+                      viewsets.ModelViewSet, RequestLogViewMixin):
     # Viewset for Provider
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, TokenAuthentication)
     permission_classes = (IsAuthenticated | ReadOnly,)
     serializer_class = serializers.ProviderSerializer
     queryset = Provider.objects.all()
+    review_field = 'provider'
 
-    def _params_to_ints(self, qs):
-        # Convert a list of string IDs to a list of integers
-        return [int(str_id) for str_id in qs.split(',')]
+    filters = (
+        RelatedFilter('services', ProviderService, 'provider', 'id'),
+    )
 
     def get_queryset(self):
-        # Retrieve pages
-        services = self.request.query_params.get('services')
-        queryset = self.queryset
-        print(self.request.META['REMOTE_ADDR'] + ' Testas3\n')
-
-        if services:
-            service_ids = self._params_to_ints(services)
-            queryset = queryset.filter(services__id__in=service_ids)
-
-        return queryset.all().distinct()
+        # Retrieve providers, ?services= keeps providers offering any (or
+        # with ?match=all every) one of the services
+        return apply_filters(
+            self.queryset, self.request.query_params, self.filters
+        ).order_by('-id')
 
     def get_serializer_class(self):
         # Return appropriate serializer class
@@ -152,6 +156,16 @@ class ProviderViewSet(viewsets.ModelViewSet, RequestLogViewMixin):
         # Create a new serializer
         serializer.save()
 
+    @action(methods=['GET'], detail=True)
+    def profile(self, request, pk=None):
+        # Provider, services, rating summary and recent reviews in one
+        # document, served from the cache after a single generation lookup
+        try:
+            provider_id = int(pk)
+        except ValueError:
+            raise Http404
+        return Response(profile.get_profile(provider_id, self.get_object))
+
     @action(methods=['POST'], detail=True, url_path='upload-image')
     def upload_image(self, request, pk=None):
         # Upload an image to a page
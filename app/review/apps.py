@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class ReviewConfig(AppConfig):
     name = 'review'
+
+    def ready(self):
+        from review.signals import connect_signals
+
+        connect_signals()
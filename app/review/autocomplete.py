@@ -0,0 +1,144 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+
+from core.models import HashTag
+
+
+# Sorts after every other character, (prefix + END,) bounds the prefix range
+END = '\U0010ffff'
+# Prefix results kept between index changes, short prefixes match many
+# tags and are the ones worth caching
+CACHE_SIZE = 1024
+
+
+class TagIndex(object):
+    # Per-process prefix index of tag names weighted by usage.
+    #
+    # Names are kept in a sorted list of (lowercase name, id) keys, a
+    # prefix lookup is two bisects and a top-k pick over the matching
+    # slice. Signals keep the index current in this process once their
+    # transaction commits, and it is rebuilt from the database every
+    # TAG_INDEX_MAX_AGE seconds to pick up changes made by other
+    # processes. At most TAG_INDEX_MAX_SIZE tags, the most used ones, are
+    # indexed.
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._building = False
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.keys = []
+            self.tags = {}
+            self.built = None
+            self._cache = {}
+
+    def _rows(self):
+        return list(
+            HashTag.objects.order_by('-usage_count', 'id')
+            .values_list('id', 'name', 'usage_count')
+            [:settings.TAG_INDEX_MAX_SIZE]
+        )
+
+    def build(self):
+        # Query and sort without the lock, other requests keep completing
+        # from the current index until the new one is swapped in. Changes
+        # signalled meanwhile are picked up by the next rebuild.
+        rows = self._rows()
+        keys = sorted((name.lower(), tag_id) for tag_id, name, _ in rows)
+        tags = {tag_id: [name, count] for tag_id, name, count in rows}
+        with self._lock:
+            self.keys, self.tags, self._cache = keys, tags, {}
+            self.built = time.monotonic()
+
+    def _refresh(self):
+        # Rebuild once the index is too old. A single thread rebuilds, the
+        # others serve the current index unless there is none yet.
+        with self._lock:
+            age = None if self.built is None \
+                else time.monotonic() - self.built
+            if age is not None and age <= settings.TAG_INDEX_MAX_AGE:
+                return
+            if self._building and self.built is not None:
+                return
+            self._building = True
+        try:
+            self.build()
+        finally:
+            with self._lock:
+                self._building = False
+
+    def complete(self, prefix, limit=10):
+        # [(id, name, count)] of the most used tags starting with prefix
+        prefix = prefix.lower()
+        self._refresh()
+        with self._lock:
+            cached = self._cache.get((prefix, limit))
+            if cached is not None:
+                return cached
+            lo = bisect_left(self.keys, (prefix,))
+            hi = bisect_left(self.keys, (prefix + END,), lo)
+            best = heapq.nsmallest(
+                limit, (key[1] for key in self.keys[lo:hi]),
+                key=lambda tag_id: (-self.tags[tag_id][1], tag_id)
+            )
+            result = [
+                (tag_id, self.tags[tag_id][0], self.tags[tag_id][1])
+                for tag_id in best
+            ]
+            if len(self._cache) >= CACHE_SIZE:
+                self._cache.clear()
+            self._cache[(prefix, limit)] = result
+            return result
+
+    def put(self, tag_id, name):
+        # Add a tag or follow a rename, keeping its count
+        with self._lock:
+            if self.built is None:
+                return
+            entry = self.tags.get(tag_id)
+            if entry is not None:
+                if entry[0] == name:
+                    return
+                self._remove_key(entry[0], tag_id)
+                entry[0] = name
+            elif len(self.tags) >= settings.TAG_INDEX_MAX_SIZE:
+                # Full, the tag shows up after the next rebuild if it's
+                # used enough
+                return
+            else:
+                self.tags[tag_id] = [name, 0]
+            insort(self.keys, (name.lower(), tag_id))
+            self._cache = {}
+
+    def remove(self, tag_id):
+        with self._lock:
+            entry = self.tags.pop(tag_id, None)
+            if entry is not None:
+                self._remove_key(entry[0], tag_id)
+                self._cache = {}
+
+    def adjust(self, deltas):
+        # Change the usage count of indexed tags by {tag id: delta}
+        with self._lock:
+            changed = False
+            for tag_id, delta in deltas.items():
+                entry = self.tags.get(tag_id)
+                if entry is not None:
+                    entry[1] = max(entry[1] + delta, 0)
+                    changed = True
+            if changed:
+                self._cache = {}
+
+    def _remove_key(self, name, tag_id):
+        i = bisect_left(self.keys, (name.lower(), tag_id))
+        if i < len(self.keys) and self.keys[i] == (name.lower(), tag_id):
+            del self.keys[i]
+
+
+tag_index = TagIndex()
@@ -0,0 +1,58 @@
+from django.db import connection
+
+from core.models import HashTag, Review, ReviewCategory
+
+
+# Values returned per facet, most frequent first
+FACET_LIMIT = 50
+# core.cache namespace of the counts, invalidated by review.signals
+FACETS_CACHE = 'review-facets'
+
+
+def _relation(field_name, target_model):
+    # SQL counting the reviews of every target of an m2m field, joined
+    # with the target for its name
+    field = Review._meta.get_field(field_name)
+    through = field.remote_field.through._meta.db_table
+    quote = connection.ops.quote_name
+    source = quote(field.m2m_column_name())
+    target = quote(field.m2m_reverse_name())
+    table = quote(target_model._meta.db_table)
+    return (
+        f"SELECT '{field_name}', t.{target}, o.{quote('name')}, COUNT(*) "
+        f"FROM {quote(through)} t "
+        f"INNER JOIN {table} o ON o.{quote('id')} = t.{target} "
+        f"WHERE t.{source} IN (SELECT {quote('id')} FROM r) "
+        f"GROUP BY t.{target}, o.{quote('name')}"
+    )
+
+
+def facet_counts(queryset):
+    # Review counts per tag, category and rating for the filtered reviews,
+    # in a single query: the filtered reviews are a CTE and every facet is
+    # one grouped branch of a UNION ALL
+    sql, params = queryset.order_by().values('id', 'rating').query \
+        .sql_with_params()
+    quote = connection.ops.quote_name
+    query = (
+        f'WITH r AS ({sql}) '
+        f'{_relation("tags", HashTag)} UNION ALL '
+        f'{_relation("categories", ReviewCategory)} UNION ALL '
+        f"SELECT 'rating', {quote('rating')}, NULL, COUNT(*) FROM r "
+        f'GROUP BY {quote("rating")}'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+
+    facets = {'tags': [], 'categories': [], 'ratings': []}
+    for facet, value, name, count in rows:
+        if facet == 'rating':
+            facets['ratings'].append({'rating': value, 'count': count})
+        else:
+            facets[facet].append({'id': value, 'name': name, 'count': count})
+    facets['ratings'].sort(key=lambda value: value['rating'], reverse=True)
+    for facet in ('tags', 'categories'):
+        facets[facet].sort(key=lambda value: (-value['count'], value['id']))
+        del facets[facet][FACET_LIMIT:]
+    return facets
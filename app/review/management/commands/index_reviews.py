@@ -0,0 +1,83 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from django.core.management.base import BaseCommand
+
+from core import worker
+from core.models import Review
+from review import minhash
+
+
+class Command(BaseCommand):
+    # Django command to back-fill the near duplicate index of reviews
+    help = 'Compute MinHash signatures and LSH buckets for reviews'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=multiprocessing.cpu_count(),
+            help='Size of the process pool, 0 computes inline'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of reviews handed to a process at once'
+        )
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Recompute reviews that are already indexed'
+        )
+
+    def handle(self, *args, **options):
+        queryset = Review.objects.order_by('id')
+        if not options['rebuild']:
+            queryset = queryset.filter(signature__isnull=True)
+        batches = self._batches(queryset, options['batch_size'])
+
+        processes = options['processes']
+        if processes:
+            indexed = self._run_pool(batches, processes)
+        else:
+            indexed = 0
+            for rows in batches:
+                indexed += self._store(minhash.signatures_for(rows))
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} reviews'))
+
+    def _batches(self, queryset, size):
+        # Walk the reviews by primary key, every batch is one range query
+        last_id = 0
+        while True:
+            rows = list(
+                queryset.filter(id__gt=last_id)
+                .values_list('id', 'description')[:size]
+            )
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield rows
+
+    def _run_pool(self, batches, processes):
+        # Signatures are pure CPU work done in the pool, the parent keeps
+        # the database writes and a bounded number of batches in flight
+        indexed = 0
+        inflight = set()
+        pool = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=worker.init_pool_process
+        )
+        with pool:
+            for rows in batches:
+                inflight.add(pool.submit(minhash.signatures_for, rows))
+                if len(inflight) >= processes * 2:
+                    done, inflight = wait(
+                        inflight, return_when=FIRST_COMPLETED)
+                    indexed += sum(
+                        self._store(future.result()) for future in done)
+            for future in inflight:
+                indexed += self._store(future.result())
+        return indexed
+
+    def _store(self, signatures):
+        minhash.store_signatures(signatures)
+        count = sum(1 for sig in signatures.values() if sig)
+        self.stdout.write(f'  {count} reviews indexed')
+        return count
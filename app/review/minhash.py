@@ -0,0 +1,130 @@
+import hashlib
+import random
+from array import array
+
+from django.db import transaction
+from django.db.models import Q
+
+from core.models import LshBucket, ModerationItem, ReviewSignature
+from core.moderation import WORD, requeue_item, shingles
+
+
+# 64 hash functions split in 16 bands of 4 rows. Two reviews share at
+# least one band bucket with probability 1 - (1 - s^4)^16 for Jaccard
+# similarity s: about 0.64 at s = 0.5 and over 0.99 at s = 0.8.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DUPLICATE_THRESHOLD = 0.7
+
+PRIME = (1 << 61) - 1
+_random = random.Random(20190408)
+PERMUTATIONS = [
+    (_random.randrange(1, PRIME), _random.randrange(0, PRIME))
+    for _ in range(NUM_PERM)
+]
+
+
+def signature(text):
+    # MinHash signature of the text shingles, None for texts without words
+    if not WORD.search(text):
+        return None
+    values = [value % PRIME for value in shingles(text)]
+    return [
+        min((a * value + b) % PRIME for value in values)
+        for a, b in PERMUTATIONS
+    ]
+
+
+def bands(sig):
+    # Bucket key of every band, a signed 64-bit int to fit a bigint column
+    return [
+        int.from_bytes(hashlib.blake2b(
+            array('Q', sig[band * ROWS:(band + 1) * ROWS]).tobytes(),
+            digest_size=8
+        ).digest(), 'big', signed=True)
+        for band in range(BANDS)
+    ]
+
+
+def similarity(first, second):
+    # Estimated Jaccard similarity of two signatures
+    return sum(a == b for a, b in zip(first, second)) / NUM_PERM
+
+
+def pack(sig):
+    return array('Q', sig).tobytes()
+
+
+def unpack(data):
+    return array('Q', bytes(data)).tolist()
+
+
+def find_duplicates(sig, exclude=None, threshold=DUPLICATE_THRESHOLD):
+    # Return [(review id, similarity)] for indexed reviews at least
+    # `threshold` similar, most similar first. Candidates come from one
+    # query joining the band buckets, only their signatures are compared.
+    if sig is None:
+        return []
+    matching = Q()
+    for band, bucket in enumerate(bands(sig)):
+        matching |= Q(band=band, bucket=bucket)
+    candidates = LshBucket.objects.filter(matching)
+    if exclude is not None:
+        candidates = candidates.exclude(review_id=exclude)
+
+    found = []
+    rows = ReviewSignature.objects.filter(
+        review_id__in=candidates.values('review_id')
+    ).values_list('review_id', 'signature')
+    for review_id, data in rows:
+        score = similarity(sig, unpack(data))
+        if score >= threshold:
+            found.append((review_id, score))
+    found.sort(key=lambda item: item[1], reverse=True)
+    return found
+
+
+def store_signatures(signatures):
+    # Save {review id: signature} and replace the review buckets
+    review_ids = [review_id for review_id, sig in signatures.items() if sig]
+    with transaction.atomic():
+        ReviewSignature.objects.filter(review_id__in=signatures).delete()
+        LshBucket.objects.filter(review_id__in=signatures).delete()
+        ReviewSignature.objects.bulk_create(
+            ReviewSignature(review_id=review_id, signature=pack(
+                signatures[review_id]))
+            for review_id in review_ids
+        )
+        LshBucket.objects.bulk_create(
+            LshBucket(review_id=review_id, band=band, bucket=bucket)
+            for review_id in review_ids
+            for band, bucket in enumerate(bands(signatures[review_id]))
+        )
+
+
+def index_review(review):
+    # Index a new review and record the closest earlier near duplicate on
+    # its moderation item. Returns the near duplicates found.
+    sig = signature(review.description)
+    duplicates = find_duplicates(sig, exclude=review.id)
+    store_signatures({review.id: sig})
+    if duplicates:
+        ModerationItem.objects.filter(
+            kind=ModerationItem.KIND_REVIEW, object_id=review.id
+        ).update(duplicate_of=duplicates[0][0])
+    return duplicates
+
+
+def reindex_review(review):
+    # Replace the index entries of an edited review and send it back to
+    # moderation, with the closest near duplicate if there is one
+    duplicates = index_review(review)
+    requeue_item(ModerationItem.KIND_REVIEW, review,
+                 duplicate_of=duplicates[0][0] if duplicates else None)
+    return duplicates
+
+
+def signatures_for(rows):
+    # Pool entry point for the back-fill: [(id, text)] -> {id: signature}
+    return {review_id: signature(text) for review_id, text in rows}
@@ -0,0 +1,38 @@
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+
+from core.models import Review
+from core.pagination import KeysetPagination
+from review.serializers import ReviewSerializer
+
+
+# ?sort= orderings of review listings, each ends on the unique id for a
+# stable cursor and has a matching index on the Review model
+REVIEW_SORTS = {
+    'newest': ('-id',),
+    'rating_high': ('-rating', '-id'),
+    'rating_low': ('rating', 'id'),
+    'helpful': ('-helpful_count', '-id'),
+}
+
+
+class ObjectReviewsMixin:
+    # Adds a {prefix}/{id}/reviews/ route listing the reviews of the object,
+    # sorted by ?sort=newest|rating_high|rating_low|helpful
+    # Review field pointing at the object
+    review_field = None
+
+    @action(methods=['GET'], detail=True)
+    def reviews(self, request, pk=None):
+        obj = self.get_object()
+        sort = request.query_params.get('sort', 'newest')
+        if sort not in REVIEW_SORTS:
+            raise ValidationError(
+                {'sort': [f'Expected one of {", ".join(REVIEW_SORTS)}.']})
+        queryset = Review.objects.filter(**{self.review_field: obj}) \
+            .prefetch_related('categories', 'tags')
+        paginator = KeysetPagination(REVIEW_SORTS[sort])
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = ReviewSerializer(
+            page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
@@ -1,6 +1,12 @@
+from django.db import transaction
 from rest_framework import serializers
 
-from core.models import Review, ReviewCategory, HashTag
+from core.fields import BulkPrimaryKeyRelatedField
+from core.images import ImageUploadField
+from core.moderation import item_text
+from core.models import Review, ReviewCategory, HashTag, ModerationItem, \
+    tag_key
+from review import tags as review_tags
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -8,8 +14,18 @@ class TagSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = HashTag
-        fields = ('id', 'name')
-        read_only_fields = ('id',)
+        fields = ('id', 'name', 'usage_count')
+        read_only_fields = ('id', 'usage_count')
+
+    def validate_name(self, value):
+        # Names differing only in case or spacing are one tag, a clash is
+        # a 400 rather than an IntegrityError on the unique key
+        tags = HashTag.objects.filter(key=tag_key(value))
+        if self.instance is not None:
+            tags = tags.exclude(pk=self.instance.pk)
+        if tags.exists():
+            raise serializers.ValidationError('A tag with this name exists.')
+        return value
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -17,20 +33,28 @@ class CategorySerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ReviewCategory
-        fields = ('id', 'name')
-        read_only_fields = ('id',)
+        fields = ('id', 'name', 'usage_count')
+        read_only_fields = ('id', 'usage_count')
 
 
 class ReviewSerializer(serializers.ModelSerializer):
     # Serialize a recipe
 
-    categories = serializers.PrimaryKeyRelatedField(
+    categories = BulkPrimaryKeyRelatedField(
         many=True,
         queryset=ReviewCategory.objects.all()
     )
-    tags = serializers.PrimaryKeyRelatedField(
+    tags = BulkPrimaryKeyRelatedField(
         many=True,
-        queryset=HashTag.objects.all()
+        queryset=HashTag.objects.all(),
+        required=False
+    )
+    # Tags by name, missing ones are created
+    tag_names = serializers.ListField(
+        child=serializers.CharField(max_length=255),
+        write_only=True,
+        required=False,
+        max_length=50
     )
 
     class Meta:
@@ -42,14 +66,46 @@ class ReviewSerializer(serializers.ModelSerializer):
             'rating',
             'categories',
             'tags',
+            'tag_names',
             'date',
             'is_auto_confirmed',
             'confirmation_text',
             'is_confirmed',
+            'helpful_count',
+            'unhelpful_count',
             'image',
             'user'
         )
-        read_only_fields = ('id',)
+        # Set by moderation and votes, not by the author
+        read_only_fields = (
+            'id', 'is_auto_confirmed', 'confirmation_text', 'is_confirmed',
+            'helpful_count', 'unhelpful_count'
+        )
+
+    def _pop_tags(self, validated_data):
+        # IDs of the tags given by id and by name, None if neither is given
+        tags = validated_data.pop('tags', None)
+        names = validated_data.pop('tag_names', None)
+        if tags is None and names is None:
+            return None
+        return [tag.pk for tag in tags or []] + \
+            [tag.pk for tag in review_tags.resolve(names or [])]
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            tag_ids = self._pop_tags(validated_data)
+            review = super().create(validated_data)
+            if tag_ids is not None:
+                review_tags.set_tags(review, tag_ids, created=True)
+        return review
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            tag_ids = self._pop_tags(validated_data)
+            review = super().update(instance, validated_data)
+            if tag_ids is not None:
+                review_tags.set_tags(review, tag_ids)
+        return review
 
 
 class ReviewDetailSerializer(ReviewSerializer):
@@ -60,8 +116,42 @@ class ReviewDetailSerializer(ReviewSerializer):
 
 class ReviewImageSerializer(serializers.ModelSerializer):
     # Serializer for uploading image to recipes
+    image = ImageUploadField()
 
     class Meta:
         model = Review
         fields = ('id', 'image')
         read_only_fields = ('id',)
+
+
+class ModerationItemSerializer(serializers.ModelSerializer):
+    # Serializer for moderation queue entries
+    text = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ModerationItem
+        fields = (
+            'id',
+            'kind',
+            'object_id',
+            'user',
+            'status',
+            'score',
+            'reasons',
+            'created',
+            'text'
+        )
+        read_only_fields = fields
+
+    def get_text(self, obj):
+        # Objects of the page are loaded in bulk by the view
+        objects = self.context.get('objects', {})
+        target = objects.get((obj.kind, obj.object_id))
+        if target is None:
+            return None
+        return item_text(obj.kind, target)
+
+
+class VoteSerializer(serializers.Serializer):
+    # Serializer for helpful / unhelpful votes
+    helpful = serializers.BooleanField()
@@ -0,0 +1,54 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from core.models import HashTag, Review
+from core import cache
+from core.signals import usage_changed
+from review.autocomplete import tag_index
+from review.facets import FACETS_CACHE
+
+
+# Index changes wait for the transaction to commit, a rolled back write
+# leaves the index as it was
+
+
+def index_tag(sender, instance, raw=False, **kwargs):
+    if not raw:
+        pk, name = instance.pk, instance.name
+        transaction.on_commit(lambda: tag_index.put(pk, name))
+
+
+def unindex_tag(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: tag_index.remove(pk))
+
+
+def count_tags(sender, deltas, **kwargs):
+    # Follow the usage counts core.signals keeps for tags
+    if tag_index.built is not None:
+        transaction.on_commit(lambda: tag_index.adjust(deltas))
+
+
+def invalidate_facets(sender, **kwargs):
+    if not kwargs.get('raw'):
+        cache.invalidate(FACETS_CACHE)
+
+
+def connect_signals():
+    post_save.connect(
+        index_tag, sender=HashTag, dispatch_uid='review_tag_index_save')
+    post_delete.connect(
+        unindex_tag, sender=HashTag, dispatch_uid='review_tag_index_delete')
+    usage_changed.connect(
+        count_tags, sender=HashTag, dispatch_uid='review_tag_index_count')
+    post_save.connect(
+        invalidate_facets, sender=Review, dispatch_uid='review_facets_save')
+    post_delete.connect(
+        invalidate_facets, sender=Review,
+        dispatch_uid='review_facets_delete'
+    )
+    for through in (Review.tags.through, Review.categories.through):
+        m2m_changed.connect(
+            invalidate_facets, sender=through,
+            dispatch_uid=f'review_facets_{through._meta.model_name}'
+        )
@@ -0,0 +1,88 @@
+from functools import partial
+
+from django.db import IntegrityError, router, transaction
+from django.db.models.signals import m2m_changed
+
+from core.models import HashTag, Review, normalize_tag, tag_key
+from review.autocomplete import tag_index
+
+
+# Rounds of lookup and insert before giving up on names other requests
+# keep creating concurrently
+CREATE_ATTEMPTS = 3
+
+
+def _lookup(keys):
+    return {tag.key: tag for tag in HashTag.objects.filter(key__in=keys)}
+
+
+def _index(tags):
+    for pk, name in tags:
+        tag_index.put(pk, name)
+
+
+def resolve(names):
+    # Tags for the names, missing ones created. One key__in query on the
+    # unique key finds the existing tags, the rest are inserted with one
+    # bulk_create. A concurrent insert of the same name fails on the
+    # unique key and the next round picks that tag up.
+    wanted = {}
+    for name in names:
+        name = normalize_tag(name)
+        if name:
+            wanted.setdefault(tag_key(name), name)
+    if not wanted:
+        return []
+
+    found = _lookup(list(wanted))
+    for _ in range(CREATE_ATTEMPTS):
+        missing = [key for key in wanted if key not in found]
+        if not missing:
+            break
+        try:
+            with transaction.atomic():
+                created = HashTag.objects.bulk_create(
+                    HashTag(name=wanted[key], key=key) for key in missing)
+        except IntegrityError:
+            found.update(_lookup(missing))
+            continue
+        if any(tag.pk is None for tag in created):
+            # Only some databases return the new primary keys
+            created = _lookup(missing).values()
+        for tag in created:
+            found[tag.key] = tag
+        transaction.on_commit(partial(
+            _index, [(tag.pk, tag.name) for tag in created]))
+
+    missing = [key for key in wanted if key not in found]
+    if missing:
+        raise IntegrityError(f'Could not create tags {missing}')
+    return [found[key] for key in wanted]
+
+
+def set_tags(review, tag_ids, created=False):
+    # Make tag_ids the tags of the review. New through rows go in with one
+    # INSERT, and m2m_changed is sent like review.tags.set() would.
+    through = Review.tags.through
+    tag_ids = set(tag_ids)
+    using = router.db_for_write(through, instance=review)
+    current = set() if created else set(
+        through.objects.filter(review=review)
+        .values_list('hashtag_id', flat=True)
+    )
+    removed = current - tag_ids
+    added = tag_ids - current
+    signal = {
+        'sender': through, 'instance': review, 'reverse': False,
+        'model': HashTag, 'using': using,
+    }
+    if removed:
+        m2m_changed.send(action='pre_remove', pk_set=removed, **signal)
+        through.objects.filter(
+            review=review, hashtag_id__in=removed).delete()
+        m2m_changed.send(action='post_remove', pk_set=removed, **signal)
+    if added:
+        m2m_changed.send(action='pre_add', pk_set=added, **signal)
+        through.objects.bulk_create(
+            through(review=review, hashtag_id=tag_id) for tag_id in added)
+        m2m_changed.send(action='post_add', pk_set=added, **signal)
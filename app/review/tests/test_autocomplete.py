@@ -0,0 +1,140 @@
+import threading
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.models import HashTag, Review
+from review import tags as review_tags
+from review.autocomplete import tag_index
+
+
+COMPLETE_URL = reverse('review:hashtag-complete')
+
+
+class TagAutocompleteTests(TransactionTestCase):
+
+    def setUp(self):
+        tag_index.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass')
+        self.client = APIClient()
+
+    def tearDown(self):
+        tag_index.clear()
+
+    def sample_review(self, *tags):
+        review = Review.objects.create(
+            title='Review', description='Text', user=self.user)
+        review.tags.add(*tags)
+        return review
+
+    def names(self, q, **params):
+        res = self.client.get(COMPLETE_URL, {'q': q, **params})
+        return [tag['name'] for tag in res.data]
+
+    def test_complete_by_usage(self):
+        # Test that prefix matches come most used first
+        spa = HashTag.objects.create(name='Spa')
+        space = HashTag.objects.create(name='space')
+        HashTag.objects.create(name='Sport')
+        self.sample_review(space)
+        self.sample_review(space, spa)
+        self.sample_review(space)
+
+        self.assertEqual(self.names('SP', limit=2), ['space', 'Spa'])
+        self.assertEqual(self.names('spo'), ['Sport'])
+        self.assertEqual(self.names('x'), [])
+
+    def test_follows_signals_without_queries(self):
+        # Test that tag and review tag changes update the built index
+        spa = HashTag.objects.create(name='Spa')
+        self.names('s')
+        space = HashTag.objects.create(name='space')
+        self.sample_review(space)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names('sp'), ['space', 'Spa'])
+
+        review = self.sample_review(spa, spa)
+        self.sample_review(spa)
+        review.tags.clear()
+        space.name = 'Blue'
+        space.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names('sp'), ['Spa'])
+            self.assertEqual(self.names('bl'), ['Blue'])
+
+        spa.delete()
+        self.assertEqual(self.names('sp'), [])
+
+    @override_settings(TAG_INDEX_MAX_SIZE=2)
+    def test_size_bounded(self):
+        # Test that only the most used tags are kept
+        tags = [HashTag.objects.create(name=f'tag{i}') for i in range(3)]
+        self.sample_review(tags[0], tags[2])
+
+        self.assertEqual(self.names('tag'), ['tag0', 'tag2'])
+        HashTag.objects.create(name='tag3')
+        self.assertEqual(self.names('tag'), ['tag0', 'tag2'])
+
+    def test_remove_non_member(self):
+        # Test that removing a tag a review doesn't have keeps its count
+        spa = HashTag.objects.create(name='Spa')
+        self.sample_review(spa)
+        other = self.sample_review()
+        self.names('s')
+
+        other.tags.remove(spa)
+        spa.review_set.remove(other)
+
+        self.assertEqual(tag_index.complete('s'), [(spa.id, 'Spa', 1)])
+
+    def test_deleted_review_released(self):
+        # Test that deleting a review lowers the counts of its tags
+        spa = HashTag.objects.create(name='Spa')
+        review = self.sample_review(spa)
+        self.names('s')
+
+        review.delete()
+
+        self.assertEqual(tag_index.complete('s'), [(spa.id, 'Spa', 0)])
+
+    def test_rolled_back_changes_not_indexed(self):
+        # Test that tags and uses from a rolled back transaction never
+        # reach the index
+        spa = HashTag.objects.create(name='Spa')
+        self.names('s')
+
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                HashTag.objects.create(name='Sauna')
+                review_tags.resolve(['Sun'])
+                self.sample_review(spa)
+                raise ValueError
+
+        self.assertEqual(tag_index.complete('s'), [(spa.id, 'Spa', 0)])
+
+    def test_rebuild_queries_without_lock(self):
+        # Test that other threads can use the index while it is rebuilt
+        free = []
+
+        def probe():
+            acquired = tag_index._lock.acquire(blocking=False)
+            if acquired:
+                tag_index._lock.release()
+            free.append(acquired)
+
+        def rows():
+            thread = threading.Thread(target=probe)
+            thread.start()
+            thread.join()
+            return []
+
+        with patch.object(tag_index, '_rows', side_effect=rows):
+            self.names('s')
+
+        self.assertEqual(free, [True])
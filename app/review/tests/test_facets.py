@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TransactionTestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import HashTag, Review, ReviewCategory
+
+
+FACETS_URL = '/api/review/reviews/facets/'
+
+
+class ReviewFacetTests(TransactionTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass')
+        self.client = APIClient()
+        self.tags = [HashTag.objects.create(name=f'tag{i}') for i in range(2)]
+        self.category = ReviewCategory.objects.create(name='Category')
+
+    def sample_review(self, rating, tags=(), categories=()):
+        review = Review.objects.create(
+            title='Review', description='Text', user=self.user, rating=rating)
+        review.tags.add(*tags)
+        review.categories.add(*categories)
+        return review
+
+    def test_counts_in_one_query(self):
+        # Test that every facet comes from a single grouped query, next to
+        # the cache generation lookup
+        self.sample_review(5, self.tags, [self.category])
+        self.sample_review(5, self.tags[:1])
+        self.sample_review(3)
+
+        with self.assertNumQueries(2):
+            res = self.client.get(FACETS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['tags'], [
+            {'id': self.tags[0].id, 'name': 'tag0', 'count': 2},
+            {'id': self.tags[1].id, 'name': 'tag1', 'count': 1},
+        ])
+        self.assertEqual(res.data['categories'], [
+            {'id': self.category.id, 'name': 'Category', 'count': 1}])
+        self.assertEqual(res.data['ratings'], [
+            {'rating': 5, 'count': 2}, {'rating': 3, 'count': 1}])
+
+    def test_counts_follow_filters(self):
+        # Test that facets count only the filtered reviews
+        self.sample_review(5, self.tags)
+        self.sample_review(2, self.tags[:1])
+
+        res = self.client.get(FACETS_URL, {
+            'tags': self.tags[1].id, 'rating_min': 4})
+
+        self.assertEqual([tag['count'] for tag in res.data['tags']], [1, 1])
+        self.assertEqual(res.data['ratings'], [{'rating': 5, 'count': 1}])
+
+    def test_cached_per_normalized_filters(self):
+        # Test that equivalent filter sets share a cache entry until a
+        # review changes
+        self.sample_review(5, self.tags)
+        ids = [tag.id for tag in self.tags]
+        self.client.get(FACETS_URL, {'tags': f'{ids[0]},{ids[1]}'})
+
+        with self.assertNumQueries(1):
+            self.client.get(
+                FACETS_URL, {'tags': f'{ids[1]},{ids[0]},{ids[1]}'})
+
+        self.sample_review(4, self.tags[:1])
+        res = self.client.get(FACETS_URL, {'tags': f'{ids[0]},{ids[1]}'})
+        self.assertEqual(len(res.data['ratings']), 2)
@@ -0,0 +1,155 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import LshBucket, ModerationItem, Review, ReviewSignature
+from review import minhash
+
+
+REVIEWS_URL = reverse('review:review-list')
+
+ORIGINAL = (
+    'The staff were friendly and the repair was done in two days. '
+    'Prices were fair and they explained every step of the work. '
+    'I would gladly come back next time my bike needs service.'
+)
+EDITED = ORIGINAL.replace('two days', 'three days')
+UNRELATED = (
+    'Terrible food, cold soup and the waiter forgot our order twice. '
+    'We left hungry after waiting for an hour.'
+)
+
+
+class MinHashTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass')
+
+    def sample_review(self, description):
+        return Review.objects.create(
+            title='Review', description=description, user=self.user)
+
+    def test_similarity_estimate(self):
+        # Test that edited copies score high and other texts low
+        original = minhash.signature(ORIGINAL)
+
+        self.assertGreater(
+            minhash.similarity(original, minhash.signature(EDITED)), 0.6)
+        self.assertLess(
+            minhash.similarity(original, minhash.signature(UNRELATED)), 0.2)
+        self.assertIsNone(minhash.signature('  '))
+
+    def test_index_review_finds_near_duplicates(self):
+        # Test that indexed reviews are found and flagged for moderation
+        original = self.sample_review(ORIGINAL)
+        self.assertEqual(minhash.index_review(original), [])
+        self.assertEqual(
+            LshBucket.objects.filter(review=original).count(), minhash.BANDS)
+
+        copy = self.sample_review(EDITED)
+        duplicates = minhash.index_review(copy)
+
+        self.assertEqual([review_id for review_id, _ in duplicates],
+                         [original.id])
+        item = ModerationItem.objects.get(object_id=copy.id)
+        self.assertEqual(item.duplicate_of, original.id)
+
+    def test_create_review_indexes(self):
+        # Test that reviews created through the API are indexed
+        client = APIClient()
+        client.force_authenticate(self.user)
+        res = client.post(REVIEWS_URL, {
+            'title': 'Review', 'description': ORIGINAL, 'rating': 5,
+            'categories': [], 'tags': [], 'user': self.user.id
+        }, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(
+            ReviewSignature.objects.filter(review_id=res.data['id']).exists())
+
+    def test_update_reindexes(self):
+        # Test that a review edited into a copy of another is indexed again
+        # and sent back to moderation
+        original = self.sample_review(ORIGINAL)
+        minhash.index_review(original)
+        review = self.sample_review(UNRELATED)
+        minhash.index_review(review)
+        ModerationItem.objects.filter(object_id=review.id).update(
+            status=ModerationItem.STATUS_CONFIRMED)
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        res = client.put(f'/api/review/reviews/{review.id}/', {
+            'title': 'Review', 'description': EDITED, 'rating': 5,
+            'categories': [], 'tags': [], 'user': self.user.id
+        }, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        item = ModerationItem.objects.get(object_id=review.id)
+        self.assertEqual(item.status, ModerationItem.STATUS_NEW)
+        self.assertEqual(item.duplicate_of, original.id)
+        self.assertEqual(
+            [r for r, _ in minhash.find_duplicates(
+                minhash.signature(UNRELATED))], [])
+
+    def test_edit_requeues(self):
+        # Test that any edit of the text is scored again, and that an edit
+        # away from a copy clears its duplicate
+        original = self.sample_review(ORIGINAL)
+        minhash.index_review(original)
+        review = self.sample_review(EDITED)
+        minhash.index_review(review)
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = f'/api/review/reviews/{review.id}/'
+        data = {
+            'title': 'Review', 'description': EDITED, 'rating': 5,
+            'categories': [], 'tags': [], 'user': self.user.id
+        }
+
+        for changes in ({'title': 'Renamed'}, {'description': UNRELATED}):
+            ModerationItem.objects.filter(object_id=review.id).update(
+                status=ModerationItem.STATUS_CONFIRMED)
+            data.update(changes)
+            res = client.put(url, data, format='json')
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            item = ModerationItem.objects.get(object_id=review.id)
+            self.assertEqual(item.status, ModerationItem.STATUS_NEW)
+        self.assertIsNone(item.duplicate_of)
+
+    def test_failed_indexing_rolls_back(self):
+        # Test that a review isn't kept, nor queued, when indexing fails
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        with patch('review.views.minhash.index_review',
+                   side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                client.post(REVIEWS_URL, {
+                    'title': 'Review', 'description': ORIGINAL, 'rating': 5,
+                    'categories': [], 'tags': [], 'user': self.user.id
+                }, format='json')
+
+        self.assertFalse(Review.objects.exists())
+        self.assertFalse(ModerationItem.objects.exists())
+
+    def test_backfill_command(self):
+        # Test that the command indexes reviews without a signature
+        reviews = [self.sample_review(text) for text in (ORIGINAL, UNRELATED)]
+
+        call_command(
+            'index_reviews', processes=0, batch_size=1, stdout=StringIO())
+
+        self.assertEqual(
+            set(ReviewSignature.objects.values_list('review_id', flat=True)),
+            {review.id for review in reviews}
+        )
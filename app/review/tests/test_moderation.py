@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import moderation
+from core.models import ModerationItem, Review
+
+
+MODERATION_URL = reverse('review:moderationitem-list')
+
+
+def sample_review(user, number):
+    return Review.objects.create(
+        title='Review', description=f'Visit http://spam.example/{number}',
+        user=user
+    )
+
+
+class ModerationApiTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass')
+        self.admin = get_user_model().objects.create_user(
+            'admin@gmail.com', 'testpass', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_admin_required(self):
+        # Test that regular users can't see the queue
+        self.client.force_authenticate(self.user)
+        res = self.client.get(MODERATION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_pending_queue_pages(self):
+        # Test paging through the pending queue with cursors
+        for number in range(3):
+            sample_review(self.user, number)
+        with self.settings(MODERATION_AUTO_CONFIRM_SCORE=0.1):
+            moderation.score_pending()
+
+        res = self.client.get(MODERATION_URL, {'page_size': 2})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 2)
+        self.assertIn('http://spam.example/0', res.data['results'][0]['text'])
+
+        res = self.client.get(res.data['next'])
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertIsNone(res.data['next'])
+
+    def test_confirm_item(self):
+        # Test that confirming publishes the review
+        review = sample_review(self.user, 1)
+        with self.settings(MODERATION_AUTO_CONFIRM_SCORE=0.1):
+            moderation.score_pending()
+        item = ModerationItem.objects.get(object_id=review.id)
+
+        url = reverse('review:moderationitem-confirm', args=[item.id])
+        res = self.client.post(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['status'], ModerationItem.STATUS_CONFIRMED)
+        review.refresh_from_db()
+        self.assertTrue(review.is_confirmed)
+        self.assertFalse(review.is_auto_confirmed)
@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Comment, CommentRatingLog, RatingLog, Review
+
+
+def vote_url(review_id):
+    return reverse('review:review-vote', args=[review_id])
+
+
+def comment_vote_url(comment_id):
+    return reverse('review:comment-vote', args=[comment_id])
+
+
+class VoteApiTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.review = Review.objects.create(
+            title='Review', description='Text', user=self.user)
+
+    def test_vote_requires_login(self):
+        # Test that anonymous users can't vote
+        res = APIClient().post(vote_url(self.review.id), {'helpful': True})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_one_vote_per_user(self):
+        # Test that voting twice counts once
+        self.client.post(vote_url(self.review.id), {'helpful': True})
+        res = self.client.post(vote_url(self.review.id), {'helpful': True})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'helpful_count': 1, 'unhelpful_count': 0})
+        self.assertEqual(RatingLog.objects.count(), 1)
+
+    def test_change_and_retract_vote(self):
+        # Test that a changed vote moves between the counters
+        other = get_user_model().objects.create_user(
+            'other@gmail.com', 'testpass')
+        RatingLog.objects.create(review=self.review, user=other)
+        Review.objects.filter(pk=self.review.pk).update(helpful_count=1)
+
+        self.client.post(vote_url(self.review.id), {'helpful': True})
+        res = self.client.post(vote_url(self.review.id), {'helpful': False})
+        self.assertEqual(res.data, {'helpful_count': 1, 'unhelpful_count': 1})
+
+        res = self.client.delete(vote_url(self.review.id))
+        self.assertEqual(res.data, {'helpful_count': 1, 'unhelpful_count': 0})
+        self.assertFalse(
+            RatingLog.objects.filter(user=self.user).exists())
+
+    def test_invalid_vote(self):
+        # Test that the helpful flag is required
+        res = self.client.post(vote_url(self.review.id), {}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_comment_vote(self):
+        # Test voting on a comment
+        comment = Comment.objects.create(
+            content='Comment', review=self.review, user=self.user)
+
+        res = self.client.post(
+            comment_vote_url(comment.id), {'helpful': False})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'helpful_count': 0, 'unhelpful_count': 1})
+        self.assertTrue(
+            CommentRatingLog.objects.filter(
+                comment=comment, user=self.user, is_helpful=False).exists())
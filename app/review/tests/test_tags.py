@@ -0,0 +1,119 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import HashTag, Review
+from review import tags
+
+
+# The anonymous review routes share the "review" base name, the reverse()
+# names point at those
+REVIEWS_URL = '/api/review/reviews/'
+TAGS_URL = reverse('review:hashtag-list')
+
+
+def detail_url(review_id):
+    return f'{REVIEWS_URL}{review_id}/'
+
+
+class TagNameTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_names_normalized_and_unique(self):
+        # Test that names differing in case or spacing are one tag
+        tag = HashTag.objects.create(name='#Day  Spa ')
+
+        self.assertEqual((tag.name, tag.key), ('Day Spa', 'day spa'))
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            HashTag.objects.create(name='day spa')
+
+    def test_api_rejects_case_variants(self):
+        # Test that creating or renaming a tag to a variant of an existing
+        # name is a validation error
+        HashTag.objects.create(name='Foo')
+        other = HashTag.objects.create(name='Bar')
+
+        res = self.client.post(TAGS_URL, {'name': 'foo'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        res = self.client.patch(
+            f'{TAGS_URL}{other.id}/', {'name': ' #FOO'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        res = self.client.patch(f'{TAGS_URL}{other.id}/', {'name': 'BAR'})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(HashTag.objects.count(), 2)
+
+    def test_resolve_existing_in_one_query(self):
+        # Test that known names cost a single lookup
+        spa = HashTag.objects.create(name='Spa')
+        sauna = HashTag.objects.create(name='Sauna')
+
+        with self.assertNumQueries(1):
+            found = tags.resolve(['SPA', 'sauna', '#spa', ' '])
+
+        self.assertEqual(found, [spa, sauna])
+
+    def test_resolve_after_concurrent_insert(self):
+        # Test that a name inserted by another request is looked up again
+        HashTag.objects.create(name='Spa')
+        lookup = tags._lookup
+        calls = []
+
+        def stale_lookup(keys):
+            calls.append(keys)
+            return {} if len(calls) == 1 else lookup(keys)
+
+        with patch('review.tags._lookup', side_effect=stale_lookup):
+            found = tags.resolve(['spa'])
+
+        self.assertEqual([tag.name for tag in found], ['Spa'])
+        self.assertEqual(HashTag.objects.count(), 1)
+
+    def test_create_review_with_tag_names(self):
+        # Test that reviews accept tag ids and names together
+        spa = HashTag.objects.create(name='Spa')
+        sauna = HashTag.objects.create(name='Sauna')
+
+        res = self.client.post(REVIEWS_URL, {
+            'title': 'Review', 'description': 'Text', 'categories': [],
+            'tags': [sauna.id], 'tag_names': ['spa', 'New tag', 'new TAG'],
+            'user': self.user.id
+        }, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        review = Review.objects.get(id=res.data['id'])
+        self.assertEqual(
+            sorted(tag.name for tag in review.tags.all()),
+            ['New tag', 'Sauna', 'Spa']
+        )
+        self.assertNotIn('tag_names', res.data)
+        self.assertEqual(HashTag.objects.count(), 3)
+        self.assertIn(spa.id, res.data['tags'])
+
+    def test_update_replaces_tags(self):
+        # Test that tag names given on update become the tag set
+        review = Review.objects.create(
+            title='Review', description='Text', user=self.user)
+        review.tags.add(HashTag.objects.create(name='Old'))
+
+        res = self.client.patch(
+            detail_url(review.id),
+            {'tag_names': ['Fresh'], 'user': self.user.id}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(review.tags.values_list('name', flat=True)), ['Fresh'])
+
+        self.client.patch(
+            detail_url(review.id),
+            {'title': 'Renamed', 'user': self.user.id}, format='json')
+        self.assertEqual(review.tags.count(), 1)
@@ -9,6 +9,8 @@ router.register('tags', views.TagViewSet)
 router.register('categories', views.CategoryViewSet)
 router.register('reviews', views.ReviewViewSet)
 router.register('anon', views.AnonReviewViewSet)
+router.register('comments', views.CommentViewSet)
+router.register('moderation', views.ModerationViewSet)
 
 app_name = 'review'
 
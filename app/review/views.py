@@ -1,30 +1,66 @@
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.http import Http404
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import viewsets, mixins, status, generics
 from rest_framework.authentication import TokenAuthentication
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.exceptions import PermissionDenied
 
-from core.models import Review, ReviewCategory, HashTag, User, ValidationToken
+from core import cache, moderation
+from core.authentication import SignedTokenAuthentication
+from core.filters import ExactFilter, RangeFilter, RelatedFilter, \
+    apply_filters, normalized_params, parse_date
+from core.models import Review, ReviewCategory, HashTag, User, \
+    ValidationToken, ModerationItem, Comment
+from core.pagination import IdCursorPagination
 from core.permissions import ReadOnly
-from review import serializers
+from review import minhash, serializers, votes
+from review.autocomplete import tag_index
+from review.facets import FACETS_CACHE, facet_counts
+from ticket.mixins import ObjectTicketsMixin
+from user import links
+
+
+MAX_COMPLETIONS = 50
+
+
+class VoteMixin:
+    # Helpful / unhelpful voting on the objects of a viewset
+
+    @action(methods=['POST', 'DELETE'], detail=True,
+            permission_classes=(IsAuthenticated,))
+    def vote(self, request, pk=None):
+        # Vote with {"helpful": true|false}, DELETE takes the vote back
+        obj = self.get_object()
+        if request.method == 'DELETE':
+            return Response(votes.retract(obj, request.user))
+
+        serializer = serializers.VoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(votes.vote(
+            obj, request.user, serializer.validated_data['helpful']))
 
 
 class BaseReviewAttrViewSet(viewsets.ModelViewSet):
     # Base viewset for review attributes
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, TokenAuthentication)
     permission_classes = (IsAuthenticated | ReadOnly,)
 
     def get_queryset(self):
-        # Return objects for the current authenticated user only
+        # ?assigned_only=1 keeps objects in use, ?ordering=popular sorts by
+        # use. Both read the indexed usage_count column, no join needed.
         assigned_only = bool(
             int(self.request.query_params.get('assigned_only', 0))
         )
         queryset = self.queryset
         if assigned_only:
-            queryset = queryset.filter(recipe__isnull=False)
-
-        return queryset.all().order_by('-name').distinct()
+            queryset = queryset.filter(usage_count__gt=0)
+        if self.request.query_params.get('ordering') == 'popular':
+            return queryset.order_by('-usage_count', 'name')
+        return queryset.order_by('-name')
 
 
 class TagViewSet(BaseReviewAttrViewSet):
@@ -32,6 +68,22 @@ class TagViewSet(BaseReviewAttrViewSet):
     queryset = HashTag.objects.all()
     serializer_class = serializers.TagSerializer
 
+    @action(methods=['GET'], detail=False)
+    def complete(self, request):
+        # Most used tags starting with ?q=, served from the in-memory index
+        prefix = request.query_params.get('q', '').strip()
+        try:
+            limit = min(int(request.query_params.get('limit', 10)),
+                        MAX_COMPLETIONS)
+        except ValueError:
+            limit = 10
+        if not prefix or limit < 1:
+            return Response([])
+        return Response([
+            {'id': tag_id, 'name': name, 'count': count}
+            for tag_id, name, count in tag_index.complete(prefix, limit)
+        ])
+
 
 class CategoryViewSet(BaseReviewAttrViewSet):
     # Manage categories in the database
@@ -39,29 +91,40 @@ class CategoryViewSet(BaseReviewAttrViewSet):
     serializer_class = serializers.CategorySerializer
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(VoteMixin, ObjectTicketsMixin, viewsets.ModelViewSet):
     # Manage reviews in the database
     serializer_class = serializers.ReviewSerializer
     queryset = Review.objects.all()
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, TokenAuthentication)
     permission_classes = (IsAuthenticated | ReadOnly,)
 
-    def _params_to_ints(self, qs):
-        # Convert a list of string IDs to a list of integers
-        return [int(str_id) for str_id in qs.split(',')]
+    filters = (
+        RelatedFilter('tags', Review.tags.through, 'review', 'hashtag_id'),
+        RelatedFilter('categories', Review.categories.through,
+                      'review', 'reviewcategory_id'),
+        RangeFilter('rating', 'rating_min', 'rating_max'),
+        RangeFilter('date', 'date_from', 'date_to', parse_date),
+        ExactFilter('provider', 'provider_id'),
+        ExactFilter('service', 'service_id'),
+    )
+
+    @action(methods=['GET'], detail=False)
+    def facets(self, request):
+        # Review counts per tag, category and rating for the current
+        # filters, cached per normalized filter set until reviews change
+        queryset = self.get_queryset()
+        params = normalized_params(request.query_params, self.filters)
+        params['user_id'] = int(request.query_params.get('user_id', 0))
+        return Response(cache.get_or_compute(
+            FACETS_CACHE, params, lambda: facet_counts(queryset),
+            settings.FACETS_CACHE_TIMEOUT
+        ))
 
     def get_queryset(self):
-        # Retrieve the reviews
-        tags = self.request.query_params.get('tags')
-        categories = self.request.query_params.get('categories')
-        queryset = self.queryset
+        # Retrieve the reviews, see the filters above
+        queryset = apply_filters(
+            self.queryset, self.request.query_params, self.filters)
         user_id = int(self.request.query_params.get('user_id', 0))
-        if tags:
-            tag_ids = self._params_to_ints(tags)
-            queryset = queryset.filter(tags__id__in=tag_ids)
-        if categories:
-            category_ids = self._params_to_ints(categories)
-            queryset = queryset.filter(categories__id__in=category_ids)
 
         if user_id == 0:
             return queryset.all()
@@ -77,13 +140,25 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return self.serializer_class
 
     def perform_create(self, serializer):
-        # Create a new serializer
-        serializer.save(user=self.request.user)
+        # Create the review and index it for near duplicates in one
+        # transaction, scoring starts once both are committed
+        with transaction.atomic():
+            review = serializer.save(user=self.request.user)
+            minhash.index_review(review)
 
     def perform_update(self, serializer):
         if serializer.validated_data['user'] != self.request.user:
             raise PermissionDenied('You cannot update this object!')
-        serializer.save()
+        title = serializer.instance.title
+        description = serializer.instance.description
+        with transaction.atomic():
+            review = serializer.save()
+            # Edited text is scored again, a new description is also
+            # checked for near duplicates
+            if review.description != description:
+                minhash.reindex_review(review)
+            elif review.title != title:
+                moderation.requeue_item(ModerationItem.KIND_REVIEW, review)
 
     def perform_destroy(self, instance):
         if instance.user_id != self.request.user.id:
@@ -113,34 +188,37 @@ class ReviewViewSet(viewsets.ModelViewSet):
 
 
 class ConfirmReviewView(generics.RetrieveAPIView):
-    def get(self, serializer):
-        email = self.request.query_params.get('email', None)
-        token = self.request.query_params.get('token', None)
-        review_id = self.request.query_params.get('review', None)
-        if email or review_id or token:
+    # Confirm an email address and publish the anonymous review of a
+    # signed confirmation link
+
+    def get(self, request):
+        params = self.request.query_params
+        token = params.get('token', '')
+        try:
+            email, review_id = links.read_review_token(token)
+        except signing.BadSignature:
+            # Links sent before signed tokens, valid until their rows are
+            # purged
+            email = params.get('email', '')
             try:
-                token_obj = ValidationToken.objects.get(token=token)
-                try:
-                    user = User.objects.get(email=str(email))
-                    user.is_confirmed = True
-                    user.save()
-                    try:
-                        review = Review.objects.get(id=int(review_id))
-                        review.is_anon = False
-                        review.save()
-                        token_obj.delete()
-                        return Response(
-                            {'Aktyvuota'},
-                            status=status.HTTP_200_OK
-                        )
-                    except Review.DoesNotExist:
-                        return Response(None, status=status.HTTP_404_NOT_FOUND)
-                except User.DoesNotExist:
-                    return Response(None, status=status.HTTP_404_NOT_FOUND)
-            except ValidationToken.DoesNotExist:
-                return Response(None, status=status.HTTP_404_NOT_FOUND)
-        else:
-            return Response(None, status=status.HTTP_404_NOT_FOUND)
+                review_id = int(params.get('review', ''))
+            except ValueError:
+                raise Http404
+            if not email or not ValidationToken.objects.filter(
+                    user_email=email, token=token).delete()[0]:
+                raise Http404
+
+        with transaction.atomic():
+            User.objects.filter(
+                email=email, is_confirmed=False
+            ).update(is_confirmed=True)
+            updated = Review.objects.filter(
+                id=review_id, is_anon=True
+            ).update(is_anon=False)
+            if not updated and not Review.objects.filter(
+                    id=review_id).exists():
+                raise Http404
+        return Response({'Aktyvuota'}, status=status.HTTP_200_OK)
 
 
 class AnonReviewViewSet(viewsets.ModelViewSet):
@@ -163,8 +241,11 @@ class AnonReviewViewSet(viewsets.ModelViewSet):
         return self.serializer_class
 
     def perform_create(self, serializer):
-        # Create a new serializer
-        serializer.save(user=self.request.user)
+        # Create the review and index it for near duplicates in one
+        # transaction, scoring starts once both are committed
+        with transaction.atomic():
+            review = serializer.save(user=self.request.user)
+            minhash.index_review(review)
 
     def perform_update(self, serializer):
         raise PermissionDenied('You cannot update this object!')
@@ -192,3 +273,58 @@ class AnonReviewViewSet(viewsets.ModelViewSet):
             serializer.errors,
             status=status.HTTP_400_BAD_REQUEST
         )
+
+
+class CommentViewSet(VoteMixin, ObjectTicketsMixin,
+                     viewsets.GenericViewSet):
+    # Votes on review comments
+    authentication_classes = (SignedTokenAuthentication, TokenAuthentication)
+    permission_classes = (IsAuthenticated,)
+    serializer_class = serializers.VoteSerializer
+    queryset = Comment.objects.all()
+
+
+class ModerationViewSet(viewsets.ReadOnlyModelViewSet):
+    # Pending moderation queue for admins, oldest first
+    authentication_classes = (SignedTokenAuthentication, TokenAuthentication)
+    permission_classes = (IsAuthenticated, IsAdminUser)
+    serializer_class = serializers.ModerationItemSerializer
+    queryset = ModerationItem.objects.all()
+    pagination_class = IdCursorPagination
+
+    def get_queryset(self):
+        # Pending items by default, ?status= and ?kind= narrow the list
+        status_filter = self.request.query_params.get(
+            'status', ModerationItem.STATUS_PENDING)
+        queryset = self.queryset.filter(status=status_filter)
+        kind = self.request.query_params.get('kind')
+        if kind:
+            queryset = queryset.filter(kind=kind)
+        return queryset
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        self.objects = moderation.load_objects(
+            page if page is not None else queryset)
+        return page
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['objects'] = getattr(self, 'objects', {})
+        return context
+
+    def _resolve(self, confirmed):
+        item = self.get_object()
+        moderation.resolve(item, confirmed)
+        self.objects = moderation.load_objects([item])
+        return Response(self.get_serializer(item).data)
+
+    @action(methods=['POST'], detail=True)
+    def confirm(self, request, pk=None):
+        # Publish the review or comment
+        return self._resolve(True)
+
+    @action(methods=['POST'], detail=True)
+    def reject(self, request, pk=None):
+        # Keep the review or comment unconfirmed
+        return self._resolve(False)
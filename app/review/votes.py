@@ -0,0 +1,65 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from core.models import Comment, CommentRatingLog, RatingLog, Review
+
+
+# Voted model -> (vote log model, name of the log foreign key)
+VOTE_LOGS = {
+    Review: (RatingLog, 'review'),
+    Comment: (CommentRatingLog, 'comment'),
+}
+
+
+def _counter(is_helpful):
+    return 'helpful_count' if is_helpful else 'unhelpful_count'
+
+
+def vote(obj, user, is_helpful):
+    # Record or change the vote of a user. The unique (object, user)
+    # constraint decides whether this is a new vote, and the counters only
+    # move through F() expressions, so concurrent votes never overwrite
+    # each other and the row lock is held for a single UPDATE.
+    model = type(obj)
+    log_model, field = VOTE_LOGS[model]
+    target = model.objects.filter(pk=obj.pk)
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                log_model.objects.create(
+                    user=user, is_helpful=is_helpful, **{field: obj})
+        except IntegrityError:
+            # Already voted, only a flipped vote moves the counters
+            changed = log_model.objects.filter(
+                user=user, is_helpful=not is_helpful, **{field: obj}
+            ).update(is_helpful=is_helpful)
+            if changed:
+                target.update(**{
+                    _counter(is_helpful): F(_counter(is_helpful)) + 1,
+                    _counter(not is_helpful):
+                        F(_counter(not is_helpful)) - 1,
+                })
+        else:
+            target.update(**{
+                _counter(is_helpful): F(_counter(is_helpful)) + 1})
+    return counts(obj)
+
+
+def retract(obj, user):
+    # Remove the vote of a user, if any
+    model = type(obj)
+    log_model, field = VOTE_LOGS[model]
+    with transaction.atomic():
+        for is_helpful in (True, False):
+            deleted, _ = log_model.objects.filter(
+                user=user, is_helpful=is_helpful, **{field: obj}
+            ).delete()
+            if deleted:
+                model.objects.filter(pk=obj.pk).update(**{
+                    _counter(is_helpful): F(_counter(is_helpful)) - 1})
+    return counts(obj)
+
+
+def counts(obj):
+    return type(obj).objects.filter(pk=obj.pk).values(
+        'helpful_count', 'unhelpful_count').get()
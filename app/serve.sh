@@ -0,0 +1,51 @@
+#!/bin/sh
+# Entry point of the production app container, run under an init (compose
+# init: true) that reaps the daemonized masters.
+#
+# gunicorn runs as a daemon so manage.py reload_server can start a new
+# master and stop the old one without ending the container. This script
+# stays up while any master listed in the pidfiles is alive and forwards
+# TERM and INT to them.
+
+PIDFILE=${GUNICORN_PIDFILE:-/tmp/gunicorn.pid}
+
+# During a reload gunicorn renames the pidfiles, so an empty read is retried
+# a few times before concluding that no master is left
+masters() {
+    for _ in 1 2 3 4 5; do
+        pids=$(cat "$PIDFILE" "$PIDFILE.2" 2>/dev/null)
+        if [ -n "$pids" ]; then
+            echo "$pids"
+            return
+        fi
+        sleep 0.2
+    done
+}
+
+stop() {
+    for pid in $(masters); do
+        kill -TERM "$pid" 2>/dev/null
+    done
+}
+
+rm -f "$PIDFILE" "$PIDFILE.2"
+gunicorn -c python:app.gunicorn_conf --daemon app.wsgi || exit 1
+
+# The daemon writes its pidfile once it has forked
+tries=0
+until [ -s "$PIDFILE" ]; do
+    tries=$((tries + 1))
+    [ "$tries" -gt 30 ] && exit 1
+    sleep 1
+done
+
+trap stop TERM INT
+while :; do
+    alive=
+    for pid in $(masters); do
+        kill -0 "$pid" 2>/dev/null && alive=1
+    done
+    [ -n "$alive" ] || exit 0
+    sleep 1 &
+    wait $!
+done
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class TicketConfig(AppConfig):
     name = 'ticket'
+
+    def ready(self):
+        from ticket.signals import connect_signals
+
+        connect_signals()
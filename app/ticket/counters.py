@@ -0,0 +1,37 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from core.models import TicketCounter
+
+
+ACTIVE = 'active'
+CLOSED = 'closed'
+
+
+def status_key(is_active):
+    return ACTIVE if is_active else CLOSED
+
+
+def adjust(**deltas):
+    # Add the deltas to the named counters with single F() updates
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        updated = TicketCounter.objects.filter(key=key).update(
+            value=F('value') + delta)
+        if updated:
+            continue
+        try:
+            with transaction.atomic():
+                TicketCounter.objects.create(key=key, value=delta)
+        except IntegrityError:
+            # Created concurrently
+            TicketCounter.objects.filter(key=key).update(
+                value=F('value') + delta)
+
+
+def summary():
+    # Ticket counts per status, read from the counter rows instead of
+    # counting the ticket table
+    values = dict(TicketCounter.objects.values_list('key', 'value'))
+    return {key: values.get(key, 0) for key in (ACTIVE, CLOSED)}
@@ -0,0 +1,26 @@
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+
+from core.models import Ticket
+from core.pagination import NewestFirstCursorPagination
+from ticket import references
+from ticket.serializers import TicketSerializer
+
+
+class ObjectTicketsMixin:
+    # Adds a {prefix}/{id}/tickets/ route listing the tickets that reference
+    # the object, newest first
+
+    @action(methods=['GET'], detail=True,
+            permission_classes=(IsAuthenticated, IsAdminUser))
+    def tickets(self, request, pk=None):
+        obj = self.get_object()
+        queryset = references.tickets_for(Ticket.objects.all(), obj)
+        paginator = NewestFirstCursorPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = TicketSerializer(
+            page, many=True,
+            context={'request': request, 'references': {
+                (references.type_code(obj), obj.pk): obj}}
+        )
+        return paginator.get_paginated_response(serializer.data)
@@ -0,0 +1,45 @@
+from core.models import Comment, Page, Provider, ProviderService, Review
+
+
+# Ticket.object_type codes. Codes are stored in the database, never
+# renumber them, only add new ones.
+OBJECT_TYPES = {
+    1: Review,
+    2: Provider,
+    3: ProviderService,
+    4: Comment,
+    5: Page,
+}
+TYPE_CODES = {model: code for code, model in OBJECT_TYPES.items()}
+
+
+def type_code(model):
+    # Return the object_type code of a model (or instance)
+    if not isinstance(model, type):
+        model = type(model)
+    return TYPE_CODES[model]
+
+
+def type_name(code):
+    return OBJECT_TYPES[code]._meta.model_name
+
+
+def tickets_for(queryset, obj):
+    # Tickets referencing obj, served by the ticket object index
+    return queryset.filter(object_type=type_code(obj), object_id=obj.pk)
+
+
+def resolve(tickets):
+    # Load the objects referenced by tickets with one query per type.
+    # Returns {(object_type, object_id): object}, missing objects are left
+    # out.
+    wanted = {}
+    for ticket in tickets:
+        if ticket.object_type in OBJECT_TYPES and ticket.object_id:
+            wanted.setdefault(ticket.object_type, set()).add(ticket.object_id)
+
+    objects = {}
+    for code, ids in wanted.items():
+        for pk, obj in OBJECT_TYPES[code].objects.in_bulk(ids).items():
+            objects[(code, pk)] = obj
+    return objects
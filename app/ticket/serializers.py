@@ -1,10 +1,12 @@
 from rest_framework import serializers
 
-from core.models import Ticket
+from core.models import Ticket, User
+from ticket import references
 
 
 class TicketSerializer(serializers.ModelSerializer):
     # Serialize a ticket
+    reference = serializers.SerializerMethodField()
 
     class Meta:
         model = Ticket
@@ -15,7 +17,64 @@ class TicketSerializer(serializers.ModelSerializer):
             'date',
             'object_type',
             'object_id',
+            'reference',
             'is_active',
-            'user'
+            'user',
+            'assigned_to'
         )
+        read_only_fields = ('id', 'assigned_to')
+
+    def validate(self, attrs):
+        # The referenced object must be of a known type and exist
+        object_type = attrs.get('object_type')
+        object_id = attrs.get('object_id')
+        if object_type is None:
+            return attrs
+        if object_type not in references.OBJECT_TYPES:
+            raise serializers.ValidationError(
+                {'object_type': 'Unknown object type.'})
+        model = references.OBJECT_TYPES[object_type]
+        if object_id is not None and \
+                not model.objects.filter(pk=object_id).exists():
+            raise serializers.ValidationError(
+                {'object_id': 'Referenced object does not exist.'})
+        return attrs
+
+    def get_reference(self, ticket):
+        # Lists resolve the objects of the whole page up front, see
+        # ticket.references.resolve
+        objects = self.context.get('references')
+        if objects is None:
+            objects = references.resolve([ticket])
+        obj = objects.get((ticket.object_type, ticket.object_id))
+        if obj is None:
+            return None
+        return {
+            'type': references.type_name(ticket.object_type),
+            'id': obj.pk,
+            'label': str(obj)
+        }
+
+
+class TicketAdminSerializer(TicketSerializer):
+    # Serialize a ticket for staff, who may assign it
+
+    class Meta(TicketSerializer.Meta):
         read_only_fields = ('id',)
+
+
+class TicketBulkSerializer(serializers.Serializer):
+    # Tickets selected for a bulk action
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000
+    )
+
+
+class TicketReassignSerializer(TicketBulkSerializer):
+    # Tickets and the staff member to assign them to, null unassigns
+    assigned_to = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.filter(is_staff=True),
+        allow_null=True
+    )
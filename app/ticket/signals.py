@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete, post_init, post_save
+
+from core.models import Ticket
+from ticket import counters
+
+
+def remember_status(sender, instance, **kwargs):
+    # Deferred loads leave is_active out, reading it would cost a query
+    if 'is_active' in instance.__dict__:
+        instance._original_is_active = instance.is_active
+
+
+def count_status(sender, instance, created=False, raw=False, **kwargs):
+    if raw or 'is_active' not in instance.__dict__:
+        return
+    original = None if created else getattr(
+        instance, '_original_is_active', None)
+    if original == instance.is_active:
+        return
+    deltas = {counters.status_key(instance.is_active): 1}
+    if original is not None:
+        deltas[counters.status_key(original)] = -1
+    counters.adjust(**deltas)
+    instance._original_is_active = instance.is_active
+
+
+def uncount_status(sender, instance, **kwargs):
+    original = getattr(instance, '_original_is_active', None)
+    if original is not None:
+        counters.adjust(**{counters.status_key(original): -1})
+
+
+def connect_signals():
+    post_init.connect(
+        remember_status, sender=Ticket, dispatch_uid='ticket_status_init')
+    post_save.connect(
+        count_status, sender=Ticket, dispatch_uid='ticket_status_save')
+    post_delete.connect(
+        uncount_status, sender=Ticket, dispatch_uid='ticket_status_delete')
@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Page, Provider, Review, Ticket
+from ticket import references
+
+
+TICKETS_URL = reverse('ticket:tickets-list')
+
+
+def provider_tickets_url(provider_id):
+    return reverse('provider:providers-tickets', args=[provider_id])
+
+
+class TicketReferenceTests(TestCase):
+
+    def setUp(self):
+        self.admin = get_user_model().objects.create_user(
+            'admin@gmail.com', 'testpass', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.provider = Provider.objects.create(
+            title='Provider', description='Text', admin_user=self.admin)
+        self.review = Review.objects.create(
+            title='Review', description='Text', user=self.admin)
+
+    def sample_ticket(self, obj, **params):
+        return Ticket.objects.create(
+            title='Ticket', description='Text', user=self.admin,
+            object_type=references.type_code(obj), object_id=obj.pk,
+            **params
+        )
+
+    def test_provider_tickets(self):
+        # Test listing the tickets of one provider, newest first
+        first = self.sample_ticket(self.provider)
+        second = self.sample_ticket(self.provider)
+        self.sample_ticket(self.review)
+
+        res = self.client.get(provider_tickets_url(self.provider.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [ticket['id'] for ticket in res.data['results']],
+            [second.id, first.id]
+        )
+        self.assertEqual(res.data['results'][0]['reference'], {
+            'type': 'provider', 'id': self.provider.id, 'label': 'Provider'
+        })
+
+    def test_object_tickets_admin_only(self):
+        # Test that regular users can't list an object's tickets
+        user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass')
+        self.client.force_authenticate(user)
+
+        res = self.client.get(provider_tickets_url(self.provider.id))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_list_resolves_one_query_per_type(self):
+        # Test that references of a ticket list are loaded in bulk
+        page = Page.objects.create(title='Page', text='Text')
+        for obj in (self.provider, self.review, page, self.provider):
+            self.sample_ticket(obj)
+
+        # Tickets, then one query each for providers, reviews and pages
+        with self.assertNumQueries(4):
+            res = self.client.get(TICKETS_URL)
+
+        self.assertEqual(
+            {ticket['reference']['type'] for ticket in res.data},
+            {'provider', 'review', 'page'}
+        )
+
+    def test_create_ticket_unknown_reference(self):
+        # Test that tickets must reference existing objects
+        res = self.client.post(TICKETS_URL, {
+            'title': 'Ticket', 'description': 'Text',
+            'object_type': 2, 'object_id': self.provider.id + 100
+        })
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.post(TICKETS_URL, {
+            'title': 'Ticket', 'description': 'Text',
+            'object_type': 99, 'object_id': 1
+        })
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
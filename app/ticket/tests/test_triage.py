@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Ticket
+from ticket import counters
+
+
+ADMIN_URL = reverse('ticket:admin-list')
+SUMMARY_URL = reverse('ticket:admin-summary')
+BULK_CLOSE_URL = reverse('ticket:admin-bulk-close')
+BULK_REASSIGN_URL = reverse('ticket:admin-bulk-reassign')
+
+
+def sample_ticket(**params):
+    defaults = {'title': 'Ticket', 'description': 'Text'}
+    defaults.update(params)
+    return Ticket.objects.create(**defaults)
+
+
+class TicketTriageTests(TestCase):
+
+    def setUp(self):
+        self.admin = get_user_model().objects.create_user(
+            'admin@gmail.com', 'testpass', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_filter_and_page(self):
+        # Test filtering on status and paging newest first
+        tickets = [sample_ticket(object_type=2) for _ in range(3)]
+        sample_ticket(is_active=False)
+
+        res = self.client.get(ADMIN_URL, {
+            'is_active': 'true', 'object_type': 2, 'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [ticket['id'] for ticket in res.data['results']],
+            [tickets[2].id, tickets[1].id]
+        )
+        res = self.client.get(res.data['next'])
+        self.assertEqual(
+            [ticket['id'] for ticket in res.data['results']], [tickets[0].id])
+
+    def test_invalid_filter(self):
+        # Test that malformed filter values are rejected
+        res = self.client.get(ADMIN_URL, {'date_from': 'yesterday'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_summary_follows_changes(self):
+        # Test that the counters follow creates, updates and deletes
+        ticket = sample_ticket()
+        sample_ticket()
+        sample_ticket(is_active=False)
+        ticket.is_active = False
+        ticket.save()
+        Ticket.objects.get(pk=ticket.pk).delete()
+
+        res = self.client.get(SUMMARY_URL)
+
+        self.assertEqual(res.data, {'active': 1, 'closed': 1})
+        self.assertEqual(
+            res.data, {
+                counters.ACTIVE: Ticket.objects.filter(is_active=True).count(),
+                counters.CLOSED: Ticket.objects.filter(
+                    is_active=False).count(),
+            }
+        )
+
+    def test_bulk_close(self):
+        # Test closing tickets in bulk keeps the counters right
+        open_tickets = [sample_ticket() for _ in range(2)]
+        closed = sample_ticket(is_active=False)
+
+        with self.assertNumQueries(5):
+            res = self.client.post(BULK_CLOSE_URL, {
+                'ids': [ticket.id for ticket in open_tickets] + [closed.id]
+            }, format='json')
+
+        self.assertEqual(res.data, {'updated': 2})
+        self.assertFalse(Ticket.objects.filter(is_active=True).exists())
+        self.assertEqual(counters.summary(), {'active': 0, 'closed': 3})
+
+    def test_bulk_reassign(self):
+        # Test assigning tickets to a staff member
+        tickets = [sample_ticket() for _ in range(2)]
+        user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass')
+
+        res = self.client.post(BULK_REASSIGN_URL, {
+            'ids': [ticket.id for ticket in tickets],
+            'assigned_to': user.id
+        }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.post(BULK_REASSIGN_URL, {
+            'ids': [ticket.id for ticket in tickets],
+            'assigned_to': self.admin.id
+        }, format='json')
+        self.assertEqual(res.data, {'updated': 2})
+        res = self.client.get(ADMIN_URL, {'assigned_to': self.admin.id})
+        self.assertEqual(len(res.data['results']), 2)
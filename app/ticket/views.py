@@ -1,22 +1,104 @@
+from datetime import date
+
+from django.db import transaction
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 
+from core.authentication import SignedTokenAuthentication
 from core.models import Ticket
-from ticket import serializers
+from core.pagination import NewestFirstCursorPagination
+from ticket import counters, references, serializers
 
 
-class TicketAdminViewSet(viewsets.ModelViewSet):
-    # Manage ticket in the database
-    authentication_classes = (TokenAuthentication,)
+TRUE_VALUES = ('1', 'true', 'yes')
+
+
+class TicketReferencesMixin(object):
+    # Resolve the objects referenced by a list of tickets in bulk
+
+    def get_serializer(self, *args, **kwargs):
+        if args and kwargs.get('many'):
+            tickets = list(args[0])
+            self.references = references.resolve(tickets)
+            args = (tickets,) + args[1:]
+        return super().get_serializer(*args, **kwargs)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['references'] = getattr(self, 'references', None)
+        return context
+
+
+class TicketAdminViewSet(TicketReferencesMixin, viewsets.ModelViewSet):
+    # Ticket triage queue for staff, newest first
+    authentication_classes = (SignedTokenAuthentication, TokenAuthentication)
     permission_classes = (IsAuthenticated, IsAdminUser, )
-    serializer_class = serializers.TicketSerializer
+    serializer_class = serializers.TicketAdminSerializer
     queryset = Ticket.objects.all()
+    pagination_class = NewestFirstCursorPagination
+
+    def get_queryset(self):
+        # Filter on ?is_active=, ?object_type=, ?assigned_to= (an id or
+        # "none") and the ?date_from= / ?date_to= range
+        params = self.request.query_params
+        queryset = self.queryset
+        try:
+            if 'is_active' in params:
+                queryset = queryset.filter(
+                    is_active=params['is_active'].lower() in TRUE_VALUES)
+            if params.get('object_type'):
+                queryset = queryset.filter(
+                    object_type=int(params['object_type']))
+            assigned_to = params.get('assigned_to')
+            if assigned_to == 'none':
+                queryset = queryset.filter(assigned_to__isnull=True)
+            elif assigned_to:
+                queryset = queryset.filter(assigned_to=int(assigned_to))
+            for param, lookup in (('date_from', 'date__gte'),
+                                  ('date_to', 'date__lte')):
+                if params.get(param):
+                    queryset = queryset.filter(
+                        **{lookup: date.fromisoformat(params[param])})
+        except ValueError:
+            raise ValidationError('Invalid filter value.')
+        return queryset
+
+    @action(methods=['GET'], detail=False)
+    def summary(self, request):
+        # Ticket counts per status
+        return Response(counters.summary())
+
+    @action(methods=['POST'], detail=False, url_path='bulk-close')
+    def bulk_close(self, request):
+        # Close the given tickets with a single UPDATE
+        serializer = serializers.TicketBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            closed = Ticket.objects.filter(
+                id__in=serializer.validated_data['ids'], is_active=True
+            ).update(is_active=False)
+            counters.adjust(
+                **{counters.ACTIVE: -closed, counters.CLOSED: closed})
+        return Response({'updated': closed})
+
+    @action(methods=['POST'], detail=False, url_path='bulk-reassign')
+    def bulk_reassign(self, request):
+        # Assign the given tickets to a staff member with a single UPDATE
+        serializer = serializers.TicketReassignSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated = Ticket.objects.filter(
+            id__in=serializer.validated_data['ids']
+        ).update(assigned_to=serializer.validated_data['assigned_to'])
+        return Response({'updated': updated})
 
 
-class TicketViewSet(viewsets.ModelViewSet):
+class TicketViewSet(TicketReferencesMixin, viewsets.ModelViewSet):
     # Manage ticket in the database
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (SignedTokenAuthentication, TokenAuthentication)
     permission_classes = (IsAuthenticated,)
     serializer_class = serializers.TicketSerializer
     queryset = Ticket.objects.all()
@@ -0,0 +1,97 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from core.models import RefreshToken, User, UserSession
+
+
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+DELETED = 'deleted'
+PROTECTED = 'protected'
+NOT_FOUND = 'not_found'
+
+DB_SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+
+
+def select(ids=None, filters=None):
+    # Users picked by an ID list or by field filters
+    if ids is not None:
+        return User.objects.filter(id__in=ids)
+    return User.objects.filter(**filters)
+
+
+def _protected(queryset, actor):
+    # The acting admin and superusers are never deactivated or deleted
+    return set(
+        queryset.filter(is_superuser=True).values_list('id', flat=True)
+    ) | ({actor.id} if actor is not None else set())
+
+
+def _outcomes(ids, found, changed, protected, done):
+    outcomes = {}
+    for user_id in ids if ids is not None else found:
+        if user_id not in found:
+            outcomes[user_id] = NOT_FOUND
+        elif user_id in protected:
+            outcomes[user_id] = PROTECTED
+        elif user_id in changed:
+            outcomes[user_id] = done
+        else:
+            outcomes[user_id] = UNCHANGED
+    return outcomes
+
+
+def logout(user_ids):
+    # Drop the auth tokens, refresh tokens and sessions of the users, one
+    # indexed DELETE per table. Sessions are found through the UserSession
+    # rows written at login instead of decoding every session.
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    Token.objects.filter(user_id__in=user_ids).delete()
+    RefreshToken.objects.filter(user_id__in=user_ids).delete()
+    sessions = UserSession.objects.filter(user_id__in=user_ids)
+    if settings.SESSION_ENGINE == DB_SESSION_ENGINE:
+        Session.objects.filter(
+            session_key__in=sessions.values('session_key')).delete()
+    else:
+        # Cache or file backed sessions, only the store can remove them
+        store = import_module(settings.SESSION_ENGINE).SessionStore()
+        for session_key in sessions.values_list('session_key', flat=True):
+            store.delete(session_key)
+    sessions.delete()
+
+
+def update(field, value, ids=None, filters=None, actor=None):
+    # Set `field` to `value` on the selected users with one UPDATE and
+    # return {user id: outcome}. Deactivated users are logged out.
+    protect = field == 'is_active' and not value
+    with transaction.atomic():
+        queryset = select(ids, filters)
+        found = set(
+            queryset.select_for_update().values_list('id', flat=True))
+        protected = _protected(queryset, actor) if protect else set()
+        targets = queryset.exclude(id__in=protected) \
+            .exclude(**{field: value})
+        changed = set(targets.values_list('id', flat=True))
+        targets.update(**{field: value})
+        if protect:
+            logout(changed)
+    return _outcomes(ids, found, changed, protected, UPDATED)
+
+
+def delete(ids=None, filters=None, actor=None):
+    # Delete the selected users and return {user id: outcome}
+    with transaction.atomic():
+        queryset = select(ids, filters)
+        found = set(
+            queryset.select_for_update().values_list('id', flat=True))
+        protected = _protected(queryset, actor)
+        changed = found - protected
+        logout(changed)
+        queryset.exclude(id__in=protected).delete()
+    return _outcomes(ids, found, changed, protected, DELETED)
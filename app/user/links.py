@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+
+
+ACTIVATION_SALT = 'user.links.activation'
+REVIEW_SALT = 'user.links.review'
+
+
+def activation_token(email):
+    return signing.dumps({'e': email}, salt=ACTIVATION_SALT)
+
+
+def review_token(email, review_id):
+    return signing.dumps({'e': email, 'r': review_id}, salt=REVIEW_SALT)
+
+
+def read_activation_token(token):
+    # Email of a valid activation token. Checked with the HMAC and the age
+    # alone, raises signing.BadSignature for bad or expired tokens.
+    return signing.loads(
+        token, salt=ACTIVATION_SALT,
+        max_age=settings.ACTIVATION_LINK_LIFETIME
+    )['e']
+
+
+def read_review_token(token):
+    # (email, review id) of a valid review confirmation token
+    data = signing.loads(
+        token, salt=REVIEW_SALT, max_age=settings.ACTIVATION_LINK_LIFETIME)
+    return data['e'], data['r']
+
+
+def link(view_name, token):
+    return f'{settings.SITE_URL}{reverse(view_name)}?token={token}'
@@ -2,54 +2,43 @@ from django.conf import settings
 from django.utils.crypto import get_random_string
 
 import smtplib
-import random
-import string
+from user import links
 from user.mail_templates import get_validation_message
-from core.models import ValidationToken
+from core.jobs import enqueue
+
+
+EMAIL_JOB_PRIORITY = 10
 
 
 def send_email(mail_address, name, msg):
-    # Send email
+    # Queue email for delivery by the background worker
+    enqueue(deliver_email, args=[mail_address, msg.as_string()],
+            priority=EMAIL_JOB_PRIORITY)
+
+
+def deliver_email(mail_address, message):
+    # Send a rendered email, runs inside the run_worker command
     server = smtplib.SMTP(settings.EMAIL_HOST, settings.EMAIL_PORT)
     server.login(settings.EMAIL_HOST_USER, settings.EMAIL_HOST_PASSWORD)
-    server.sendmail(settings.EMAIL_HOST_USER,
-                    mail_address, msg.as_string())
+    server.sendmail(settings.EMAIL_HOST_USER, mail_address, message)
     server.quit()
 
 
-def token_generator():
-    allowed_chars = ''.join((string.ascii_letters, string.digits))
-    activation_code = ''.join(random.choice(allowed_chars) for _ in range(9))
-    return activation_code
-
-
 class ValidateEmail():
 
     def send_confirmation(self, mail_address, name):
-        # Send email with confirmation token
-        account_activation_token = token_generator()
-        ValidationToken.objects.create(
-            user_email=mail_address, token=account_activation_token)
-        validation_link = 'http://localhost:8000/api/user/activate_account/?email='
-        validation_link += mail_address
-        validation_link += '&token='
-        validation_link += str(account_activation_token)
+        # Send email with a signed, expiring confirmation link
+        token = links.activation_token(mail_address)
+        validation_link = links.link('user:activate_account', token)
         send_email('emanuelisc@gmail.com', name, get_validation_message(
-            mail_address, name, validation_link, str(account_activation_token)))
+            mail_address, name, validation_link, token))
 
 
 class ConfirmAnonReview():
 
     def send_confirmation(self, mail_address, name, review_id):
-        # Send email with confirmation token
-        account_activation_token = token_generator()
-        ValidationToken.objects.create(
-            user_email=mail_address, token=account_activation_token)
-        validation_link = 'http://localhost:8000/api/review/confirm_review/?email='
-        validation_link += mail_address
-        validation_link += '&token='
-        validation_link += str(account_activation_token)
-        validation_link += '&review='
-        validation_link += str(review_id)
+        # Send email with a signed, expiring confirmation link
+        token = links.review_token(mail_address, review_id)
+        validation_link = links.link('review:confirm_review', token)
         send_email('emanuelisc@gmail.com', name, get_validation_message(
-            mail_address, name, validation_link, str(account_activation_token)))
+            mail_address, name, validation_link, token))
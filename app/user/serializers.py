@@ -54,9 +54,53 @@ class AuthTokenSerializer(serializers.Serializer):
         return attrs
 
 
+class RefreshTokenSerializer(serializers.Serializer):
+    # Refresh token of the signed token scheme
+    refresh = serializers.CharField(trim_whitespace=False)
+
+
 class AdminUsersSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = get_user_model()
         fields = ('id', 'email', 'password', 'name', 'is_staff', 'is_company')
         read_only_fields = ('id',)
+
+
+class UserBulkFilterSerializer(serializers.Serializer):
+    # Field filters selecting the users of a bulk action
+    is_active = serializers.BooleanField(required=False)
+    is_company = serializers.BooleanField(required=False)
+    is_confirmed = serializers.BooleanField(required=False)
+    is_staff = serializers.BooleanField(required=False)
+    email_domain = serializers.CharField(required=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError(_('Filter must not be empty'))
+        domain = attrs.pop('email_domain', None)
+        if domain:
+            attrs['email__iendswith'] = '@' + domain.lstrip('@')
+        return attrs
+
+
+class UserBulkSerializer(serializers.Serializer):
+    # Users selected for a bulk action, by ID list or by filter
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000,
+        required=False
+    )
+    filter = UserBulkFilterSerializer(required=False)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError(
+                _('Provide either ids or filter'))
+        return attrs
+
+
+class UserCompanySerializer(UserBulkSerializer):
+    # Users selected for a bulk action and their new company flag
+    is_company = serializers.BooleanField()
@@ -0,0 +1,29 @@
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.utils import timezone
+
+from core.models import UserSession
+
+
+def track_session(sender, request, user, **kwargs):
+    # Map the new session to the user, dropping the user's expired ones
+    session = getattr(request, 'session', None)
+    if session is None or not session.session_key:
+        return
+    UserSession.objects.filter(
+        user=user, expire_date__lte=timezone.now()).delete()
+    UserSession.objects.update_or_create(
+        session_key=session.session_key,
+        defaults={'user': user, 'expire_date': session.get_expiry_date()}
+    )
+
+
+def untrack_session(sender, request, user, **kwargs):
+    session = getattr(request, 'session', None)
+    if session is not None and session.session_key:
+        UserSession.objects.filter(session_key=session.session_key).delete()
+
+
+def connect_signals():
+    user_logged_in.connect(track_session, dispatch_uid='user_track_session')
+    user_logged_out.connect(
+        untrack_session, dispatch_uid='user_untrack_session')
@@ -72,6 +72,43 @@ class PrivateUserApiTests(TestCase):
         self.user.is_staff = True
         self.client.force_authenticate(self.user)
 
+    def test_search_users(self):
+        # Test substring and prefix search on email and name
+        jonas = create_user(
+            email='jonas@firm.lt', password='testpass', name='Jonas')
+        create_user(email='ona@gmail.com', password='testpass', name='Ona')
+
+        res = self.client.get(USERS_URL, {'search': 'FIRM'})
+        self.assertEqual(
+            [user['id'] for user in res.data['results']], [jonas.id])
+
+        res = self.client.get(USERS_URL, {'prefix': 'on'})
+        self.assertEqual(
+            [user['email'] for user in res.data['results']],
+            ['ona@gmail.com']
+        )
+
+    def test_filter_and_page_users(self):
+        # Test flag filters and keyset pages in id order
+        companies = [
+            create_user(email=f'firm{i}@gmail.com', password='testpass',
+                        is_company=True)
+            for i in range(3)
+        ]
+
+        res = self.client.get(
+            USERS_URL, {'is_company': 'true', 'page_size': 2})
+        self.assertEqual(
+            [user['id'] for user in res.data['results']],
+            [companies[0].id, companies[1].id]
+        )
+        res = self.client.get(res.data['next'])
+        self.assertEqual(
+            [user['id'] for user in res.data['results']], [companies[2].id])
+
+        res = self.client.get(USERS_URL, {'provider_id': 'x'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_retrieve_users(self):
         # Test retrieving a list of users
         payload1 = {
@@ -88,7 +125,7 @@ class PrivateUserApiTests(TestCase):
         res = self.client.get(USERS_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 3)
+        self.assertEqual(len(res.data['results']), 3)
 
     def test_view_user_detail(self):
         # Test viewing a user detail
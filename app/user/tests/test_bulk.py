@@ -0,0 +1,140 @@
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import UserSession
+from user import bulk
+
+
+def bulk_url(name):
+    return reverse(f'user:user-bulk-{name}')
+
+
+def create_user(email, **params):
+    return get_user_model().objects.create_user(email, 'testpass', **params)
+
+
+def login_session(user):
+    client = Client()
+    client.force_login(user)
+    return client.session.session_key
+
+
+class BulkUserApiTests(TestCase):
+
+    def setUp(self):
+        self.admin = create_user('admin@gmail.com', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_staff_required(self):
+        # Test that bulk actions are limited to staff
+        self.client.force_authenticate(create_user('test@gmail.com'))
+        res = self.client.post(
+            bulk_url('deactivate'), {'ids': [self.admin.id]}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_deactivate_by_ids(self):
+        # Test per ID outcomes and that deactivated users are logged out
+        spammer = create_user('spam@gmail.com')
+        inactive = create_user('old@gmail.com', is_active=False)
+        other = create_user('other@gmail.com')
+        Token.objects.create(user=spammer)
+        Token.objects.create(user=other)
+        spam_session = login_session(spammer)
+        other_session = login_session(other)
+
+        res = self.client.post(bulk_url('deactivate'), {
+            'ids': [spammer.id, inactive.id, self.admin.id, 9999]
+        }, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], {
+            spammer.id: 'updated',
+            inactive.id: 'unchanged',
+            self.admin.id: 'protected',
+            9999: 'not_found',
+        })
+        spammer.refresh_from_db()
+        self.assertFalse(spammer.is_active)
+        self.assertFalse(Token.objects.filter(user=spammer).exists())
+        self.assertTrue(Token.objects.filter(user=other).exists())
+        self.assertFalse(
+            Session.objects.filter(session_key=spam_session).exists())
+        self.assertTrue(
+            Session.objects.filter(session_key=other_session).exists())
+
+    def test_set_company_by_filter(self):
+        # Test selecting users by email domain
+        users = [create_user(f'user{i}@firm.lt') for i in range(3)]
+        create_user('user@gmail.com')
+
+        res = self.client.post(bulk_url('company'), {
+            'filter': {'email_domain': 'firm.lt'}, 'is_company': True
+        }, format='json')
+
+        self.assertEqual(
+            res.data['results'], {user.id: 'updated' for user in users})
+        self.assertEqual(
+            get_user_model().objects.filter(is_company=True).count(), 3)
+
+    def test_delete(self):
+        # Test deleting users leaves protected ones in place
+        users = [create_user(f'user{i}@gmail.com') for i in range(2)]
+
+        res = self.client.post(bulk_url('delete'), {
+            'ids': [user.id for user in users] + [self.admin.id]
+        }, format='json')
+
+        self.assertEqual(res.data['results'][users[0].id], 'deleted')
+        self.assertEqual(res.data['results'][self.admin.id], 'protected')
+        self.assertEqual(
+            list(get_user_model().objects.values_list('id', flat=True)),
+            [self.admin.id]
+        )
+
+    def test_selection_required(self):
+        # Test that exactly one of ids and filter is accepted
+        for payload in ({}, {'ids': [1], 'filter': {'is_staff': False}},
+                        {'filter': {}}):
+            res = self.client.post(
+                bulk_url('activate'), payload, format='json')
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SessionTrackingTests(TestCase):
+
+    def test_login_and_logout_tracked(self):
+        # Test that logins map the session to the user and logouts drop it
+        user = create_user('test@gmail.com')
+        client = Client()
+        client.force_login(user)
+        session_key = client.session.session_key
+
+        self.assertTrue(UserSession.objects.filter(
+            user=user, session_key=session_key).exists())
+
+        client.logout()
+        self.assertFalse(UserSession.objects.filter(user=user).exists())
+
+    def test_logout_is_indexed(self):
+        # Test that logging users out doesn't read other sessions
+        users = [create_user(f'user{i}@gmail.com') for i in range(3)]
+        keys = [login_session(user) for user in users]
+
+        with self.assertNumQueries(4):
+            bulk.logout([users[0].id, users[1].id])
+
+        self.assertEqual(
+            list(Session.objects.values_list('session_key', flat=True)),
+            keys[2:])
+        self.assertEqual(
+            list(UserSession.objects.values_list('user_id', flat=True)),
+            [users[2].id])
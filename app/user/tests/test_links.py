@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Review, ValidationToken
+from user import links
+
+
+ACTIVATE_URL = reverse('user:activate_account')
+CONFIRM_REVIEW_URL = reverse('review:confirm_review')
+
+
+class ConfirmationLinkTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            'test@gmail.com', 'testpass')
+        self.client = APIClient()
+
+    def test_activate_account(self):
+        # Test that a signed link confirms the email with one UPDATE
+        token = links.activation_token('test@gmail.com')
+
+        with self.assertNumQueries(1):
+            res = self.client.get(ACTIVATE_URL, {'token': token})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.is_confirmed)
+
+    def test_bad_links_rejected(self):
+        # Test that tampered, expired and unknown links are refused
+        token = links.activation_token('test@gmail.com')
+        res = self.client.get(ACTIVATE_URL, {'token': token[:-1]})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        with override_settings(ACTIVATION_LINK_LIFETIME=-1):
+            res = self.client.get(ACTIVATE_URL, {'token': token})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        res = self.client.get(ACTIVATE_URL, {
+            'token': links.activation_token('nobody@gmail.com')})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_confirmed)
+
+    def test_legacy_link_used_once(self):
+        # Test that links sent before signing still work until purged
+        ValidationToken.objects.create(
+            user_email='test@gmail.com', token='abc123xyz')
+        params = {'email': 'test@gmail.com', 'token': 'abc123xyz'}
+
+        res = self.client.get(ACTIVATE_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = self.client.get(ACTIVATE_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_confirm_review(self):
+        # Test that the review link publishes the review
+        review = Review.objects.create(
+            title='Review', description='Text', user=self.user, is_anon=True)
+        token = links.review_token('test@gmail.com', review.id)
+
+        res = self.client.get(CONFIRM_REVIEW_URL, {'token': token})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        review.refresh_from_db()
+        self.assertFalse(review.is_anon)
+
+        res = self.client.get(CONFIRM_REVIEW_URL, {
+            'token': links.review_token('test@gmail.com', review.id + 1)})
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -13,6 +13,10 @@ urlpatterns = [
     path('admin/', include(router.urls), name='admin'),
     path('create/', views.CreateUserView.as_view(), name='create'),
     path('token/', views.CreateTokenView.as_view(), name='token'),
+    path('token/signed/',
+         views.CreateSignedTokenView.as_view(), name='token-signed'),
+    path('token/refresh/',
+         views.RefreshSignedTokenView.as_view(), name='token-refresh'),
     path('me/', views.ManageUserView.as_view(), name='me'),
     path('activate_account/',
          views.ActivateAccountView.as_view(), name='activate_account'),
@@ -1,38 +1,50 @@
+from django.core import signing
+from django.db.models import Q
 from rest_framework.response import Response
 from rest_framework import generics, authentication, permissions, viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
 
 from user.serializers import UserSerializer, \
     AuthTokenSerializer, \
-    AdminUsersSerializer
+    AdminUsersSerializer, UserBulkSerializer, UserCompanySerializer, \
+    RefreshTokenSerializer
 
+from core.authentication import SignedTokenAuthentication, \
+    issue_tokens, refresh_tokens
 from core.models import User, ValidationToken
+from core.pagination import IdCursorPagination
+from user import bulk, links
 from user.mail import ValidateEmail
 
 
+TRUE_VALUES = ('1', 'true', 'yes')
+
+
 class ActivateAccountView(generics.RetrieveAPIView):
-    def get(self, serializer):
-        email = self.request.query_params.get('email', '')
-        token = self.request.query_params.get('token', '')
-        if email or token:
-            try:
-                token_obj = ValidationToken.objects.get(token=token)
-                try:
-                    user = User.objects.get(email=str(email))
-                    user.is_confirmed = True
-                    user.save()
-                    token_obj.delete()
-                    return Response(
-                        {'Aktyvuota'},
-                        status=status.HTTP_200_OK
-                    )
-                except User.DoesNotExist:
-                    return Response(None, status=status.HTTP_404_NOT_FOUND)
-            except ValidationToken.DoesNotExist:
+    # Confirm an email address from a signed activation link
+
+    def get(self, request):
+        params = self.request.query_params
+        token = params.get('token', '')
+        try:
+            email = links.read_activation_token(token)
+        except signing.BadSignature:
+            # Links sent before signed tokens carry the email separately,
+            # and stay valid until their rows are purged
+            email = params.get('email', '')
+            if not email or not ValidationToken.objects.filter(
+                    user_email=email, token=token).delete()[0]:
                 return Response(None, status=status.HTTP_404_NOT_FOUND)
-        else:
+
+        updated = User.objects.filter(
+            email=email, is_confirmed=False
+        ).update(is_confirmed=True)
+        if not updated and not User.objects.filter(email=email).exists():
             return Response(None, status=status.HTTP_404_NOT_FOUND)
+        return Response({'Aktyvuota'}, status=status.HTTP_200_OK)
 
 
 class CreateUserView(generics.CreateAPIView, ValidateEmail):
@@ -55,14 +67,43 @@ class CreateTokenView(ObtainAuthToken):
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
 
 
+class CreateSignedTokenView(generics.GenericAPIView):
+    # Log in for a signed access token and a refresh token
+    serializer_class = AuthTokenSerializer
+    authentication_classes = ()
+    permission_classes = ()
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(issue_tokens(serializer.validated_data['user']))
+
+
+class RefreshSignedTokenView(generics.GenericAPIView):
+    # Swap a refresh token for a new signed token pair
+    serializer_class = RefreshTokenSerializer
+    authentication_classes = ()
+    permission_classes = ()
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            refresh_tokens(serializer.validated_data['refresh']))
+
+
 class ManageUserView(generics.RetrieveUpdateAPIView):
     # Manage the authenticated user
     serializer_class = UserSerializer
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (SignedTokenAuthentication,
+                              authentication.TokenAuthentication)
     permission_classes = (permissions.IsAuthenticated,)
 
     def get_object(self):
-        # Retrieve and return authenticated user
+        # Retrieve and return authenticated user. Signed tokens only carry
+        # a few claims, the full row is loaded with one query.
+        if isinstance(self.request.auth, dict):
+            return User.objects.get(pk=self.request.user.pk)
         return self.request.user
 
 
@@ -70,13 +111,76 @@ class AdminUsersViewSet(viewsets.ModelViewSet):
     # Manage recipes in the database
     serializer_class = AdminUsersSerializer
     queryset = User.objects.all()
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (SignedTokenAuthentication,
+                              authentication.TokenAuthentication)
     permission_classes = (permissions.IsAuthenticated, permissions.IsAdminUser)
+    pagination_class = IdCursorPagination
 
     def _params_to_ints(self, qs):
         # Convert a list of string IDs to a list of integers
         return [int(str_id) for str_id in qs.split(',')]
 
     def get_queryset(self):
+        # Search email and name with ?search= (substring) or ?prefix=, and
+        # filter on ?ids=, ?is_company=, ?is_confirmed= and ?provider_id=.
+        # On Postgres both searches use the trigram indexes of the columns.
+        params = self.request.query_params
         queryset = self.queryset
+        for param, lookup in (('search', 'icontains'),
+                              ('prefix', 'istartswith')):
+            term = params.get(param, '').strip()
+            if term:
+                queryset = queryset.filter(
+                    Q(**{f'email__{lookup}': term}) |
+                    Q(**{f'name__{lookup}': term})
+                )
+        for flag in ('is_company', 'is_confirmed'):
+            if flag in params:
+                queryset = queryset.filter(
+                    **{flag: params[flag].lower() in TRUE_VALUES})
+        try:
+            if params.get('ids'):
+                queryset = queryset.filter(
+                    id__in=self._params_to_ints(params['ids']))
+            if params.get('provider_id'):
+                queryset = queryset.filter(
+                    provider_id=int(params['provider_id']))
+        except ValueError:
+            raise ValidationError('Invalid filter value.')
         return queryset.all()
+
+    def _selection(self, serializer_class=UserBulkSerializer):
+        # Validate the bulk request, return the selection and its data
+        serializer = serializer_class(data=self.request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        selection = {
+            'ids': data.get('ids'),
+            'filters': data.get('filter'),
+            'actor': self.request.user,
+        }
+        return selection, data
+
+    @action(methods=['POST'], detail=False, url_path='bulk-activate')
+    def bulk_activate(self, request):
+        selection, _ = self._selection()
+        return Response(
+            {'results': bulk.update('is_active', True, **selection)})
+
+    @action(methods=['POST'], detail=False, url_path='bulk-deactivate')
+    def bulk_deactivate(self, request):
+        # Deactivated users are logged out in the same transaction
+        selection, _ = self._selection()
+        return Response(
+            {'results': bulk.update('is_active', False, **selection)})
+
+    @action(methods=['POST'], detail=False, url_path='bulk-company')
+    def bulk_company(self, request):
+        selection, data = self._selection(UserCompanySerializer)
+        return Response({'results': bulk.update(
+            'is_company', data['is_company'], **selection)})
+
+    @action(methods=['POST'], detail=False, url_path='bulk-delete')
+    def bulk_delete(self, request):
+        selection, _ = self._selection()
+        return Response({'results': bulk.delete(**selection)})